@@ -0,0 +1,126 @@
+"""Synthetic, seeded corpora shaped like a day of CDN download traffic.
+
+A few clients and packages make up most of the rows (a Zipf-like head) while a long tail of rare values
+keeps the caches honest. Some user agents are '+' encoded as the China CDN logs them, and some package ids
+end in a number so the file name alone is ambiguous (e.g. foo.2.1.0.0.nupkg).
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+import random
+
+HEAD_USER_AGENTS = [
+    "NuGet Command Line/{v} (Microsoft Windows NT 10.0.19045.0)",
+    "NuGet VS VSIX/{v} (Microsoft Windows NT 10.0.22631.0, VS Enterprise/17.0)",
+    "NuGet .NET Core MSBuild Task/{v} (Microsoft Windows 10.0.22621)",
+    "NuGet Desktop MSBuild Task/{v} (Microsoft Windows NT 6.2.9200.0)",
+    "NuGet xplat/{v} (Linux 5.15.0-1052-azure #60-Ubuntu SMP)",
+    "NuGet+Command+Line/{v}+(Microsoft+Windows+NT+6.2.9200.0)",
+    "Paket/{v} (Microsoft Windows NT 10.0.17763.0)",
+    "curl/{v}",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{v} Safari/537.36",
+    "Go-http-client/1.1",
+    "python-requests/{v}",
+    "Wget/{v} (linux-gnu)",
+    "Bazel/release {v}",
+    "AzureArtifacts/{v} (Microsoft Azure Artifacts [Azure DevOps,; Hosted)",
+    "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+]
+
+CLIENT_NAMES = [
+    "NuGet Command Line", "NuGet VS VSIX", "NuGet .NET Core MSBuild Task", "NuGet xplat", "Paket", "curl",
+    "Chrome", "Firefox", "Go-http-client", "Python Requests", "WebMatrix", "Googlebot", "Wget", "Bazel",
+    "NuGet Package Explorer", "Other", "Mobile Safari", "Visual Studio",
+]
+
+HEAD_PACKAGE_IDS = [
+    "newtonsoft.json", "microsoft.extensions.logging", "system.text.json", "serilog", "xunit", "moq",
+    "microsoft.netcore.app.ref", "automapper", "nunit", "fluentassertions", "polly", "dapper",
+]
+
+@dataclass
+class Corpus:
+    user_agents: list[str]
+    client_names: list[str]
+    request_urls: list[str]
+    versions: list[str]
+
+class CorpusGenerator:
+    """Generates a reproducible corpus for a seed."""
+
+    def __init__(self, seed: int = 42, zipf_exponent: float = 1.2, tail_size: int = 20000,
+                 plus_encoded_ratio: float = 0.05, ambiguous_id_ratio: float = 0.05) -> None:
+        self.random = random.Random(seed)
+        self.zipf_exponent = zipf_exponent
+        self.tail_size = tail_size
+        self.plus_encoded_ratio = plus_encoded_ratio
+        self.ambiguous_id_ratio = ambiguous_id_ratio
+
+    def generate(self, rows: int) -> Corpus:
+        return Corpus(
+            self._sample(self._user_agents(), rows),
+            self._sample(self._client_names(), rows),
+            self._sample(self._request_urls(), rows),
+            self._sample(self._versions(), rows))
+
+    def _sample(self, population: list[str], rows: int) -> list[str]:
+        # Zipf-like weights: the value at rank r is drawn proportionally to 1 / r^s
+        weights = [1 / (rank ** self.zipf_exponent) for rank in range(1, len(population) + 1)]
+        return self.random.choices(population, weights=weights, k=rows)
+
+    def _version(self) -> str:
+        r = self.random
+        version = f"{r.randint(0, 17)}.{r.randint(0, 12)}.{r.randint(0, 40)}"
+        roll = r.random()
+        if roll < 0.05:
+            version += f".{r.randint(1, 9)}"
+        elif roll < 0.15:
+            version += f"-{r.choice(['beta', 'preview', 'rc', 'alpha'])}.{r.randint(1, 9)}"
+        elif roll < 0.17:
+            version += f"+{r.getrandbits(32):08x}"
+        return version
+
+    def _user_agents(self) -> list[str]:
+        head = [template.format(v=self._version()) for template in HEAD_USER_AGENTS for _ in range(4)]
+        tail = [self._tail_user_agent(index) for index in range(self.tail_size)]
+        return head + tail
+
+    def _tail_user_agent(self, index: int) -> str:
+        r = self.random
+        roll = r.random()
+        if roll < 0.4:
+            user_agent = f"NuGet Command Line/{self._version()} (Microsoft Windows NT 10.0.{r.randint(10000, 22631)}.0)"
+        elif roll < 0.6:
+            user_agent = f"Mozilla/5.0 (X11; Linux x86_64; rv:{r.randint(60, 130)}.0) Gecko/20100101 Firefox/{r.randint(60, 130)}.0"
+        else:
+            user_agent = f"tool-{index}/{self._version()} (build {r.getrandbits(24):06x})"
+
+        if r.random() < self.plus_encoded_ratio:
+            user_agent = user_agent.replace(" ", "+")
+        return user_agent
+
+    def _client_names(self) -> list[str]:
+        return CLIENT_NAMES + [f"Client {index}" for index in range(self.tail_size)]
+
+    def _request_urls(self) -> list[str]:
+        package_ids = HEAD_PACKAGE_IDS + [f"contoso.package{index}" for index in range(self.tail_size)]
+        urls = []
+        for package_id in package_ids:
+            r = self.random
+            if r.random() < self.ambiguous_id_ratio:
+                package_id = f"{package_id}.{r.randint(1, 9)}"
+
+            version = self._version().split("+", 1)[0]
+            file_name = f"{package_id}.{version}.nupkg"
+            roll = r.random()
+            if roll < 0.6:
+                urls.append(f"https://api.nuget.org/v3-flatcontainer/{package_id}/{version}/{file_name}")
+            elif roll < 0.9:
+                urls.append(f"https://globalcdn.nuget.org/packages/{file_name}")
+            elif roll < 0.95:
+                urls.append(f"https://globalcdn.nuget.org/packages/{file_name}?packageVersion={version}")
+            else:
+                urls.append(f"https://dist.nuget.org/win-x86-commandline/v{version}/nuget.exe")
+        return urls
+
+    def _versions(self) -> list[str]:
+        return [self._version() for _ in range(self.tail_size)]
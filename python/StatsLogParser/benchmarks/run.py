@@ -0,0 +1,203 @@
+"""Benchmarks the loginterpretation hot paths on a synthetic corpus and compares them with a stored baseline.
+
+Run from python/StatsLogParser:
+
+    poetry run python -m benchmarks.run                  # compare against benchmarks/baseline.json
+    poetry run python -m benchmarks.run --save-baseline  # record a new baseline on this machine
+
+Each pass starts with cold caches. Throughput and latency come from the fastest of a few timed passes, and
+memory from a separate pass under tracemalloc so its overhead doesn't skew the timings. A baseline is only
+compared with a run of the same rows, seed and Python version, and a run only fails on a regression when the
+baseline was recorded on the same machine: run-to-run noise is already as large as the default tolerance, and
+differences between machines are larger.
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from loginterpretation.clientnametranslation import ClientNameTranslation
+from loginterpretation.lrucache import CacheInfo
+from loginterpretation.nugetversion import NuGetVersion
+from loginterpretation.packagedefinition import PackageDefinition
+from loginterpretation.useragentparser import UserAgentParser
+from .corpus import Corpus, CorpusGenerator
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+@dataclass
+class Benchmark:
+    name: str
+    function: Callable[[str], object]
+    inputs: Callable[[Corpus], list[str]]
+    reset: Callable[[], None] = lambda: None
+    cache_info: Optional[Callable[[], CacheInfo]] = None
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    rows: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    cache_hit_ratio: Optional[float]
+    peak_bytes_per_1m_rows: int
+
+BENCHMARKS = [
+    Benchmark("UserAgentParser.parse", UserAgentParser.parse, lambda corpus: corpus.user_agents,
+              UserAgentParser._PARSE_CACHE.clear, UserAgentParser.cache_info),
+    Benchmark("ClientNameTranslation.get_client_category", ClientNameTranslation.get_client_category,
+              lambda corpus: corpus.client_names, ClientNameTranslation._CATEGORY_CACHE.clear, ClientNameTranslation.cache_info),
+    Benchmark("PackageDefinition.from_request_url", PackageDefinition.from_request_url, lambda corpus: corpus.request_urls,
+              PackageDefinition.clear_caches, PackageDefinition.cache_info),
+    Benchmark("NuGetVersion.parse", NuGetVersion.parse, lambda corpus: corpus.versions),
+]
+
+def run_benchmark(benchmark: Benchmark, corpus: Corpus, repeat: int = 3) -> BenchmarkResult:
+    """Times the benchmark repeat times from cold caches and keeps the fastest pass, as timeit does."""
+    inputs = benchmark.inputs(corpus)
+    elapsed, latencies = min((_timed_pass(benchmark, inputs) for _ in range(repeat)), key=lambda timed: timed[0])
+
+    cache_hit_ratio = None
+    if benchmark.cache_info is not None:
+        info = benchmark.cache_info()
+        lookups = info.hits + info.misses
+        cache_hit_ratio = info.hits / lookups if lookups else None
+
+    benchmark.reset()
+    tracemalloc.start()
+    for value in inputs:
+        benchmark.function(value)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return BenchmarkResult(
+        benchmark.name,
+        len(inputs),
+        len(inputs) / (elapsed / 1e9),
+        _percentile(latencies, 0.50) / 1e3,
+        _percentile(latencies, 0.99) / 1e3,
+        cache_hit_ratio,
+        int(peak * 1_000_000 / len(inputs)))
+
+def _timed_pass(benchmark: Benchmark, inputs: list[str]) -> tuple[int, list[int]]:
+    function = benchmark.function
+    clock = time.perf_counter_ns
+    latencies = [0] * len(inputs)
+
+    benchmark.reset()
+    start = clock()
+    for index, value in enumerate(inputs):
+        call_start = clock()
+        function(value)
+        latencies[index] = clock() - call_start
+    return clock() - start, latencies
+
+def run_parameters(rows: int, seed: int) -> dict:
+    """Returns what a baseline has to share with a run to be compared with it."""
+    return {"rows": rows, "seed": seed, "python": platform.python_version()}
+
+def machine() -> dict:
+    """Returns what identifies the machine a baseline was recorded on, with the host name hashed."""
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "host": hashlib.sha256(platform.node().encode("utf-8")).hexdigest()[:16]}
+
+def differences(baseline: dict, expected: dict) -> list[str]:
+    """Returns a message for every value of expected the baseline has another value for."""
+    return [f"{name} is {baseline.get(name)!r} in the baseline and {value!r} here"
+            for name, value in expected.items() if baseline.get(name) != value]
+
+def compare(results: list[BenchmarkResult], baseline: dict, tolerance: float, parameters: dict) -> list[str]:
+    """Returns a message for every benchmark whose throughput fell more than tolerance below the baseline.
+
+    Raises ValueError when the baseline was recorded with other run parameters.
+    """
+    mismatches = differences(baseline, parameters)
+    if mismatches:
+        raise ValueError("The baseline was recorded with other parameters: " + "; ".join(mismatches))
+
+    regressions = []
+    for result in results:
+        expected = baseline.get("results", {}).get(result.name)
+        if expected is None:
+            continue
+        floor = expected["ops_per_sec"] * (1 - tolerance)
+        if result.ops_per_sec < floor:
+            regressions.append(f"{result.name}: {result.ops_per_sec:,.0f} ops/sec, baseline {expected['ops_per_sec']:,.0f}")
+    return regressions
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="rows per benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per benchmark, the fastest is kept")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed throughput drop, as a fraction")
+    args = parser.parse_args(argv)
+
+    corpus = CorpusGenerator(args.seed).generate(args.rows)
+    # build the rule matchers up front so the first parse isn't counted
+    UserAgentParser._ensure_initialized()
+
+    results = [run_benchmark(benchmark, corpus, args.repeat) for benchmark in BENCHMARKS]
+    parameters = run_parameters(args.rows, args.seed)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    comparable = baseline is not None and not differences(baseline, parameters)
+
+    print(f"{'benchmark':<44}{'ops/sec':>12}{'p50 us':>10}{'p99 us':>10}{'hit ratio':>11}{'MB/1M rows':>12}{'vs base':>9}")
+    for result in results:
+        hit_ratio = f"{result.cache_hit_ratio:.1%}" if result.cache_hit_ratio is not None else "-"
+        change = "-"
+        if comparable and result.name in baseline.get("results", {}):
+            change = f"{result.ops_per_sec / baseline['results'][result.name]['ops_per_sec'] - 1:+.0%}"
+        print(f"{result.name:<44}{result.ops_per_sec:>12,.0f}{result.p50_us:>10.1f}{result.p99_us:>10.1f}"
+              f"{hit_ratio:>11}{result.peak_bytes_per_1m_rows / 2**20:>12.1f}{change:>9}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump({
+                **parameters,
+                **machine(),
+                "results": {result.name: asdict(result) for result in results}}, file, indent=2)
+            file.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        return 0
+
+    try:
+        regressions = compare(results, baseline, args.tolerance, parameters)
+    except ValueError as e:
+        print(f"{args.baseline}: {e}", file=sys.stderr)
+        return 2
+
+    other_machine = differences(baseline, machine())
+    for regression in regressions:
+        print(f"{'SLOWER' if other_machine else 'REGRESSION'} {regression}")
+    if other_machine:
+        print(f"{args.baseline} was recorded on another machine, so regressions don't fail the run; record a baseline here "
+              "with --save-baseline before making a change", file=sys.stderr)
+        return 0
+    return 1 if regressions else 0
+
+def _percentile(sorted_values: list[int], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, IO, Iterable, Optional
+import asyncio
+import csv
+import os
+from .cdnlogparser import CdnLogParser, DownloadRecord
+from .downloadaggregator import DownloadAggregator
+from .logprocessor import FileResult, LogProcessor, ProcessingSummary
+from .useragentparser import UserAgentParser
+
+class AsyncLogPipeline:
+    """Processes CDN log files in three stages joined by bounded queues, so reading, parsing and writing overlap.
+
+    - read: lines are read in batches in a thread, decompressing gzipped files on the way;
+    - parse: each batch is parsed into download records on an executor, a pool of worker processes by default;
+    - write: the records are written to one partition per file, in order, and counted, in a thread.
+    A stage waits when the queue to the next one is full, so at most about (2 * queue_size + 3) batches are
+    in memory whatever the size of the files. Partitions are the same as LogProcessor writes, each written
+    under a temporary name until its file is done, so a failed run leaves no partial partition behind.
+
+        summary = AsyncLogPipeline(workers=4).run(paths, output_dir)
+    """
+
+    def __init__(self, batch_size: int = 10000, queue_size: int = 4, workers: Optional[int] = None,
+                 executor: Optional[Executor] = None, opener: Callable[[str], IO[str]] = CdnLogParser.open_log_file) -> None:
+        """workers defaults to the number of CPUs, ignored when an executor is given; opener opens a log as text,
+        e.g. from a local stand-in for blob storage."""
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor
+        self.opener = opener
+
+    def run(self, paths: Iterable[str], output_dir: str) -> ProcessingSummary:
+        return asyncio.run(self.process_files(paths, output_dir))
+
+    async def process_files(self, paths: Iterable[str], output_dir: str) -> ProcessingSummary:
+        """Processes the log files, writing one partition per file to output_dir, and returns the merged counts."""
+        paths = list(paths)
+        os.makedirs(output_dir, exist_ok=True)
+        output_paths = [os.path.join(output_dir, LogProcessor.PARTITION_NAME_FORMAT.format(index)) for index in range(len(paths))]
+
+        executor = self.executor
+        if executor is None:
+            executor = self._create_executor()
+        parsing: set[Future] = set()
+        try:
+            parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+            write_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+            results = [FileResult(path, output_path, 0, 0, DownloadAggregator()) for path, output_path in zip(paths, output_paths)]
+            stages = [
+                asyncio.ensure_future(self._read(paths, parse_queue)),
+                asyncio.ensure_future(self._parse(parse_queue, write_queue, executor, parsing)),
+                asyncio.ensure_future(self._write(write_queue, results))]
+            await AsyncLogPipeline._gather(stages)
+        except BaseException:
+            # batches still queued on the executor are dropped, and the ones being parsed waited for, so none
+            # outlives the call on an executor that was passed in
+            outstanding = list(parsing)
+            for future in outstanding:
+                future.cancel()
+            await asyncio.to_thread(wait, outstanding)
+            raise
+        finally:
+            if self.executor is None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return LogProcessor.merge_results(results)
+
+    @staticmethod
+    def parse_batch(lines: list[str], first_line_number: int) -> tuple[list[DownloadRecord], int]:
+        """Parses a batch of log lines into download records, returning them with the number of malformed lines."""
+        errors = []
+        entries = CdnLogParser.parse_log_entries(lines, lambda e, line_number: errors.append(line_number), first_line_number)
+        return list(CdnLogParser.to_download_records(entries)), len(errors)
+
+    async def _read(self, paths: list[str], parse_queue: asyncio.Queue) -> None:
+        for index, path in enumerate(paths):
+            lines = await asyncio.to_thread(self.opener, path)
+            try:
+                line_number = 1
+                while batch := await asyncio.to_thread(AsyncLogPipeline._read_batch, lines, self.batch_size):
+                    await parse_queue.put((index, batch, line_number))
+                    line_number += len(batch)
+            finally:
+                await asyncio.to_thread(lines.close)
+            # an empty batch marks the end of a file, so the writer closes its partition even when it has no lines
+            await parse_queue.put((index, None, line_number))
+        await parse_queue.put(None)
+
+    async def _parse(self, parse_queue: asyncio.Queue, write_queue: asyncio.Queue, executor: Executor, parsing: set[Future]) -> None:
+        while (item := await parse_queue.get()) is not None:
+            index, batch, line_number = item
+            parsed = None
+            if batch is not None:
+                future = executor.submit(AsyncLogPipeline.parse_batch, batch, line_number)
+                parsing.add(future)
+                future.add_done_callback(parsing.discard)
+                parsed = asyncio.wrap_future(future)
+            # the write queue holds the batches being parsed, in order, which bounds the work in flight
+            await write_queue.put((index, parsed))
+        await write_queue.put(None)
+
+    async def _write(self, write_queue: asyncio.Queue, results: list[FileResult]) -> None:
+        output = writer = None
+        try:
+            while (item := await write_queue.get()) is not None:
+                index, parsed = item
+                result = results[index]
+                if parsed is None:
+                    if output is not None:
+                        await asyncio.to_thread(output.close)
+                        output = None
+                        await asyncio.to_thread(os.replace, result.output_path + ".tmp", result.output_path)
+                    else:
+                        # a file without a single line still gets its partition
+                        await asyncio.to_thread(AsyncLogPipeline._write_header, result.output_path)
+                    continue
+
+                records, errors = await parsed
+                if output is None:
+                    output = await asyncio.to_thread(open, result.output_path + ".tmp", "w", encoding="utf-8", newline="")
+                    writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+                    await asyncio.to_thread(writer.writerow, LogProcessor.OUTPUT_COLUMNS)
+                await asyncio.to_thread(AsyncLogPipeline._write_records, writer, records, result.downloads)
+                results[index] = result._replace(records=result.records + len(records), errors=result.errors + errors)
+        finally:
+            # only a failure leaves a partition open
+            if output is not None:
+                output.close()
+                os.remove(output.name)
+
+    def _create_executor(self) -> Executor:
+        # a single parser thread still overlaps with reading and writing
+        executor_type = ThreadPoolExecutor if self.workers == 1 else ProcessPoolExecutor
+        return executor_type(
+            max_workers=self.workers,
+            initializer=LogProcessor.initialize_worker,
+            initargs=(UserAgentParser.DECODE_PLUS_SIGNS,))
+
+    @staticmethod
+    def _read_batch(lines: IO[str], size: int) -> list[str]:
+        return list(islice(lines, size))
+
+    @staticmethod
+    def _write_header(output_path: str) -> None:
+        LogProcessor.write_partition((), output_path)
+
+    @staticmethod
+    def _write_records(writer, records: list[DownloadRecord], downloads: DownloadAggregator) -> None:
+        writer.writerows(records)
+        for record in records:
+            downloads.add(record)
+
+    @staticmethod
+    async def _gather(tasks: list[asyncio.Future]) -> None:
+        # a failing stage cancels the others, which would otherwise wait on their queues forever
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
@@ -0,0 +1,212 @@
+from __future__ import annotations
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Callable, IO, Iterable, Iterator, Optional
+import gzip
+import io
+import re
+from .requestclassifier import RequestClassifier
+from .useragentclassifier import UserAgentClassifier
+
+CdnLogEntry = namedtuple('CdnLogEntry', [
+    'edge_server_time_delivered',
+    'edge_server_time_taken',
+    'client_ip_address',
+    'file_size',
+    'edge_server_ip_address',
+    'edge_server_port',
+    'cache_status_code',
+    'edge_server_bytes_sent',
+    'http_method',
+    'request_url',
+    'remote_server_time_taken',
+    'remote_server_bytes_sent',
+    'referrer',
+    'user_agent',
+    'customer_id',
+    'custom_field'])
+
+DownloadRecord = namedtuple('DownloadRecord', [
+    'timestamp',
+    'package_id',
+    'package_version',
+    'user_agent',
+    'client_family',
+    'client_major',
+    'client_minor',
+    'client_patch',
+    'client_category',
+    'request_url'])
+
+class CdnLogParser:
+    """Streams Azure/China CDN log files, in the W3C format Stats.AzureCdnLogs.Common parses, line by line.
+
+    Files are read lazily, gzip or plain text, so memory stays bounded regardless of the file size.
+    """
+
+    GZIP_MAGIC = b"\x1f\x8b"
+    NOT_FOUND_STATUS = "TCP_MISS/404"
+    _SEPARATORS_RE = re.compile(r'[ "]')
+
+    @staticmethod
+    def open_log_file(path: str) -> IO[str]:
+        """Opens a log file as text, decompressing it on the fly when it is gzipped."""
+        with open(path, "rb") as file:
+            magic = file.read(len(CdnLogParser.GZIP_MAGIC))
+
+        if magic == CdnLogParser.GZIP_MAGIC:
+            return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", errors="replace")
+        return open(path, "r", encoding="utf-8", errors="replace")
+
+    @staticmethod
+    def read_log_entries(path: str, on_error: Callable[[Exception, int], None] = None) -> Iterator[CdnLogEntry]:
+        """Yields the entries of a log file, skipping comments, 404s and non-2xx responses."""
+        with CdnLogParser.open_log_file(path) as lines:
+            yield from CdnLogParser.parse_log_entries(lines, on_error)
+
+    @staticmethod
+    def parse_log_entries(lines, on_error: Callable[[Exception, int], None] = None, first_line_number: int = 1) -> Iterator[CdnLogEntry]:
+        """Yields the entries of lines; first_line_number numbers the lines of a file read from part way through."""
+        for line_number, line in enumerate(lines, start=first_line_number):
+            entry = CdnLogParser.parse_log_entry(line_number, line.rstrip("\r\n"), on_error)
+            if entry is not None:
+                yield entry
+
+    @staticmethod
+    def read_download_records(path: str, on_error: Callable[[Exception, int], None] = None) -> Iterator[DownloadRecord]:
+        """Yields the package and nuget.exe downloads of a log file, resolved and with their client classified."""
+        yield from CdnLogParser.to_download_records(CdnLogParser.read_log_entries(path, on_error))
+
+    @staticmethod
+    def to_download_records(entries: Iterable[CdnLogEntry]) -> Iterator[DownloadRecord]:
+        for entry in entries:
+            record = CdnLogParser.to_download_record(entry)
+            if record is not None:
+                yield record
+
+    @staticmethod
+    def to_download_record(entry: CdnLogEntry) -> Optional[DownloadRecord]:
+        """Resolves the package a log entry downloaded, or returns None when it isn't a download."""
+        package = RequestClassifier.resolve(entry.request_url)
+        if package is None:
+            return None
+
+        user_agent = CdnLogParser.unquote(entry.user_agent)
+        client = UserAgentClassifier.classify(user_agent)
+        return DownloadRecord(
+            entry.edge_server_time_delivered,
+            package.package_id,
+            package.package_version,
+            user_agent,
+            client.family,
+            client.major,
+            client.minor,
+            client.patch,
+            client.category,
+            entry.request_url)
+
+    @staticmethod
+    def parse_log_entry(line_number: int, line: str, on_error: Callable[[Exception, int], None] = None) -> Optional[CdnLogEntry]:
+        """Parses one log line, mirroring CdnLogEntryParser.ParseLogEntryFromLine."""
+        if not line or line.isspace():
+            return None
+
+        # ignore comment rows (i.e., first row listing the column headers
+        if line.startswith("#"):
+            return None
+
+        # disregard 404's
+        if CdnLogParser.NOT_FOUND_STATUS in line:
+            return None
+
+        # columns are space-separated
+        columns = CdnLogParser.get_log_line_records(line)
+
+        try:
+            entry = CdnLogEntry(
+                CdnLogParser.from_unix_timestamp(columns[0]),
+                CdnLogParser._to_int(columns[1]),
+                CdnLogParser._to_string(columns[2]),
+                CdnLogParser._to_int(columns[3]),
+                CdnLogParser._to_string(columns[4]),
+                CdnLogParser._to_int(columns[5]),
+                CdnLogParser._to_string(columns[6]),
+                CdnLogParser._to_int(columns[7]),
+                CdnLogParser._to_string(columns[8]),
+                CdnLogParser._to_string(columns[9]),
+                # skip column 10, it just contains the '-' character
+                CdnLogParser._to_int(columns[11]),
+                CdnLogParser._to_int(columns[12]),
+                CdnLogParser._to_string(columns[13]),
+                CdnLogParser._to_string(columns[14]),
+                CdnLogParser._to_string(columns[15]),
+                CdnLogParser._to_string(columns[16]))
+        except (ValueError, IndexError, OverflowError, OSError) as e:
+            # skip this line but report the error; timestamps out of datetime's range raise OverflowError or OSError
+            if on_error is None:
+                raise
+            on_error(e, line_number)
+            return None
+
+        # Exclude non-200 level HTTP status codes. Global CDN logs "TCP_MISS/504", China CDN logs just "504";
+        # if the format is unexpected, the entry is processed as usual.
+        status = entry.cache_status_code
+        if status:
+            http_status = status[status.rfind("/") + 1:]
+            if http_status.isdigit() and http_status.isascii() and not 200 <= int(http_status) < 300:
+                return None
+
+        return entry
+
+    @staticmethod
+    def get_log_line_records(line: str) -> list[str]:
+        """Splits a log line on spaces outside double quotes, mirroring W3CParseUtils.GetLogLineRecords.
+
+        Quoted records keep their quotes, and the last character always ends the last record.
+        """
+        records = []
+        start_index = 0
+        between_quotes = False
+        last_index = len(line) - 1
+
+        # only spaces and quotes change state, so jump between them instead of visiting every character
+        for separator in CdnLogParser._SEPARATORS_RE.finditer(line):
+            i = separator.start()
+            if i == last_index:
+                break
+            if line[i] == '"':
+                between_quotes = not between_quotes
+                if between_quotes:
+                    start_index = i
+            elif not between_quotes:
+                records.append(line[start_index:i])
+                start_index = i + 1
+
+        if line:
+            # reached end of the line
+            records.append(line[start_index:])
+
+        return records
+
+    @staticmethod
+    def record_contains_data(record: str) -> bool:
+        return bool(record) and not record.isspace() and record != "-" and record != '"-"'
+
+    @staticmethod
+    def unquote(record: str) -> str:
+        if len(record) >= 2 and record.startswith('"') and record.endswith('"'):
+            return record[1:-1]
+        return record
+
+    @staticmethod
+    def from_unix_timestamp(record: str) -> datetime:
+        # Unix timestamp is seconds past epoch
+        return datetime.fromtimestamp(float(record), tz=timezone.utc)
+
+    @staticmethod
+    def _to_int(record: str) -> Optional[int]:
+        return int(record) if CdnLogParser.record_contains_data(record) else None
+
+    @staticmethod
+    def _to_string(record: str) -> str:
+        return record if CdnLogParser.record_contains_data(record) else ""
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from collections import namedtuple
+from typing import Iterable, Optional
+import sqlite3
+
+FileCheckpoint = namedtuple('FileCheckpoint', ['path', 'file_id', 'size', 'mtime_ns', 'offset', 'lines', 'sha256', 'rules_version'])
+Partition = namedtuple('Partition', ['file_id', 'segment', 'output_path', 'start_offset', 'end_offset', 'records', 'errors'])
+
+class CheckpointStore:
+    """A sqlite database of how far each log file has been ingested, and the partitions written for it.
+
+    A file's checkpoint holds its size and modification time when last seen, the byte offset and line count
+    ingested so far, a fingerprint of the bytes before that offset and the version of the rules they were
+    ingested with. Each run over a file appends a partition; reprocessing a file from the start replaces all
+    of its partitions in the same transaction that saves its new checkpoint.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            file_id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            size INTEGER NOT NULL DEFAULT -1,
+            mtime_ns INTEGER NOT NULL DEFAULT -1,
+            offset INTEGER NOT NULL DEFAULT 0,
+            lines INTEGER NOT NULL DEFAULT 0,
+            sha256 TEXT,
+            rules_version TEXT);
+        CREATE TABLE IF NOT EXISTS partitions (
+            file_id INTEGER NOT NULL REFERENCES files(file_id),
+            segment INTEGER NOT NULL,
+            output_path TEXT NOT NULL,
+            start_offset INTEGER NOT NULL,
+            end_offset INTEGER NOT NULL,
+            records INTEGER NOT NULL,
+            errors INTEGER NOT NULL,
+            PRIMARY KEY (file_id, segment));
+        """
+    _FILE_COLUMNS = "path, file_id, size, mtime_ns, offset, lines, sha256, rules_version"
+    _PARTITION_COLUMNS = "file_id, segment, output_path, start_offset, end_offset, records, errors"
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.executescript(CheckpointStore._SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> CheckpointStore:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, path: str) -> Optional[FileCheckpoint]:
+        row = self._connection.execute(f"SELECT {CheckpointStore._FILE_COLUMNS} FROM files WHERE path = ?", (path,)).fetchone()
+        return FileCheckpoint(*row) if row is not None else None
+
+    def register(self, path: str) -> FileCheckpoint:
+        """Returns the checkpoint of a file, adding an empty one when the file hasn't been seen before."""
+        with self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO files (path) VALUES (?)", (path,))
+        return self.get(path)
+
+    def checkpoints(self) -> list[FileCheckpoint]:
+        return [FileCheckpoint(*row) for row in self._connection.execute(f"SELECT {CheckpointStore._FILE_COLUMNS} FROM files ORDER BY file_id")]
+
+    def partitions(self, file_id: Optional[int] = None) -> list[Partition]:
+        """Returns the current partitions, of every file or of one, in the order they were written."""
+        query = f"SELECT {CheckpointStore._PARTITION_COLUMNS} FROM partitions"
+        parameters: tuple = ()
+        if file_id is not None:
+            query += " WHERE file_id = ?"
+            parameters = (file_id,)
+        return [Partition(*row) for row in self._connection.execute(query + " ORDER BY file_id, segment", parameters)]
+
+    def next_segment(self, file_id: int) -> int:
+        row = self._connection.execute("SELECT MAX(segment) FROM partitions WHERE file_id = ?", (file_id,)).fetchone()
+        return row[0] + 1 if row[0] is not None else 0
+
+    def save(self, checkpoint: FileCheckpoint, partition: Optional[Partition] = None, replace: bool = False) -> list[Partition]:
+        """Saves a file's checkpoint along with the partition written up to it, atomically.
+
+        With replace, the file's earlier partitions are dropped, and returned so their outputs can be deleted.
+        """
+        replaced = self.partitions(checkpoint.file_id) if replace else []
+        with self._connection:
+            if replace:
+                self._connection.execute("DELETE FROM partitions WHERE file_id = ?", (checkpoint.file_id,))
+            if partition is not None:
+                self._connection.execute(f"INSERT INTO partitions ({CheckpointStore._PARTITION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", partition)
+            self._connection.execute(
+                "UPDATE files SET size = ?, mtime_ns = ?, offset = ?, lines = ?, sha256 = ?, rules_version = ? WHERE file_id = ?",
+                (checkpoint.size, checkpoint.mtime_ns, checkpoint.offset, checkpoint.lines, checkpoint.sha256, checkpoint.rules_version, checkpoint.file_id))
+        return replaced
+
+    def forget(self, paths: Iterable[str]) -> list[Partition]:
+        """Drops the checkpoints and partitions of files, returning the partitions so their outputs can be deleted."""
+        forgotten = []
+        with self._connection:
+            for path in paths:
+                checkpoint = self.get(path)
+                if checkpoint is None:
+                    continue
+                forgotten.extend(self.partitions(checkpoint.file_id))
+                self._connection.execute("DELETE FROM partitions WHERE file_id = ?", (checkpoint.file_id,))
+                self._connection.execute("DELETE FROM files WHERE file_id = ?", (checkpoint.file_id,))
+        return forgotten
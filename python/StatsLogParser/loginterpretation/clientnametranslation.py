@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 from typing import List
+from .literalscanner import LiteralScanner
+from .lrucache import CacheInfo, LRUCache
 
 # Client Categories using dataclass
 @dataclass(frozen=True)
@@ -105,42 +107,84 @@ class ClientNames:
         "NuGet Test Client"
     ])
 
+# Precompiled matcher for all client names of all categories
+class ClientCategoryMatcher:
+    """Finds the highest priority category of a client name in a single scan.
+
+    Client names of every category are casefolded once and compiled into one LiteralScanner; each name keeps
+    the priority of the first category listing it, in the order get_client_category checks them.
+    """
+
+    def __init__(self, names: ClientNames = None, categories: ClientCategories = None) -> None:
+        names = names or ClientNames()
+        categories = categories or ClientCategories()
+
+        # Priority order: NuGet, WebMatrix, NPE, Script, Crawler, Mobile, Browser, then Unknown
+        self.categories: List[str] = [
+            categories.nuget,
+            categories.webmatrix,
+            categories.nuget_package_explorer,
+            categories.script,
+            categories.crawler,
+            categories.mobile,
+            categories.browser,
+            categories.unknown]
+        category_names = [
+            names.nuget,
+            names.webmatrix,
+            names.nuget_package_explorer,
+            names.script,
+            names.crawler,
+            names.mobile,
+            names.browser,
+            names.unknown]
+        self._browser_priority = self.categories.index(categories.browser)
+        self._absolute_browser_names = frozenset(name.lower() for name in names.absolute_browser_names)
+
+        priority_by_name: dict[str, int] = {}
+        for priority, client_names in enumerate(category_names):
+            for name in client_names:
+                priority_by_name.setdefault(name.casefold(), priority)
+
+        self._scanner = LiteralScanner(priority_by_name)
+        self._priority_by_match = {
+            name: min(priority_by_name[contained] for contained in self._scanner.contained(name))
+            for name in priority_by_name}
+
+    def get_client_category(self, client_name: str) -> str:
+        priority = len(self.categories)
+        priority_by_match = self._priority_by_match
+        for name in self._scanner.longest_matches(client_name.casefold()):
+            priority = min(priority, priority_by_match[name])
+
+        # Check these late in the process, because other User Agents tend to also send browser strings
+        if priority > self._browser_priority and client_name.strip().lower() in self._absolute_browser_names:
+            priority = self._browser_priority
+
+        # Return empty for all others to allow ecosystem user agents to be picked up in the reports
+        return self.categories[priority] if priority < len(self.categories) else ""
+
 # Client Name Translation Logic using static methods
 class ClientNameTranslation:
+    _MATCHER = ClientCategoryMatcher()
+    _MAX_CACHE_SIZE = 10000
+    _CATEGORY_CACHE: LRUCache[str, str] = LRUCache(_MAX_CACHE_SIZE)
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        return ClientNameTranslation._CATEGORY_CACHE.info()
+
     @staticmethod
     def get_client_category(client_name: str) -> str:
         if not client_name or client_name.strip() == "":
             return ""
 
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().nuget):
-            return ClientCategories().nuget
-
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().webmatrix):
-            return ClientCategories().webmatrix
+        category = ClientNameTranslation._CATEGORY_CACHE.get(client_name)
+        if category is None:
+            category = ClientNameTranslation._MATCHER.get_client_category(client_name)
+            ClientNameTranslation._CATEGORY_CACHE.put(client_name, category)
 
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().nuget_package_explorer):
-            return ClientCategories().nuget_package_explorer
-
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().script):
-            return ClientCategories().script
-
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().crawler):
-            return ClientCategories().crawler
-
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().mobile):
-            return ClientCategories().mobile
-
-        # Check these late in the process, because other User Agents tend to also send browser strings
-        if (ClientNameTranslation.contains_any_client_name(client_name, ClientNames().browser) or
-            any(client_name.strip().lower() == abn.lower() for abn in ClientNames().absolute_browser_names)):
-            return ClientCategories().browser
-
-        # Explicitly categorize unknowns, test frameworks, or others that should be filtered out in the reports
-        if ClientNameTranslation.contains_any_client_name(client_name, ClientNames().unknown):
-            return ClientCategories().unknown
-
-        # Return empty for all others to allow ecosystem user agents to be picked up in the reports
-        return ""
+        return category
 
     @staticmethod
     def contains(source: str, target: str, comparison=str.casefold) -> bool:
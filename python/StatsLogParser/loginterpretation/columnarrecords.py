@@ -0,0 +1,255 @@
+from __future__ import annotations
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional
+import mmap
+import struct
+import sys
+from .cdnlogparser import DownloadRecord
+from .downloadaggregator import DownloadAggregator, DownloadKey
+
+class ColumnarRecordWriter:
+    """Collects download records column by column and writes them in a compact, dictionary-encoded binary file.
+
+    Every string column is stored as one integer code per row, as narrow as its number of distinct values
+    allows, and a dictionary holding each distinct value once; code 0 is null. Timestamps are stored as
+    int64 microseconds since the epoch. ColumnarRecordReader maps the file and reads the codes in place.
+
+    The file is written in one piece, so the writer holds every row until then: 8 bytes for the timestamp
+    and 4 per string column, plus the distinct values, about 44 bytes a row. Write one file per partition,
+    or per bounded number of records, rather than one for a whole day of logs.
+    """
+
+    MAGIC = b"NGDLREC1"
+    STRING_COLUMNS = DownloadRecord._fields[1:]
+    # magic, rows, columns
+    _HEADER = struct.Struct("<8sQQ")
+    # per string column: codes offset, code width, dictionary offset, dictionary values
+    _COLUMN = struct.Struct("<QQQQ")
+    # array typecodes by code width, signed so the codes can be used as Arrow dictionary indices as they are
+    _CODE_TYPECODES = {1: "b", 2: "h", 4: "i"}
+    _EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def __init__(self) -> None:
+        self._timestamps = array("q")
+        self._codes = [array("i") for _ in ColumnarRecordWriter.STRING_COLUMNS]
+        self._dictionaries: list[dict[Optional[str], int]] = [{None: 0} for _ in ColumnarRecordWriter.STRING_COLUMNS]
+
+    def add(self, record: DownloadRecord) -> None:
+        if record.timestamp is None:
+            raise ValueError("Records need a timestamp")
+
+        self._timestamps.append(ColumnarRecordWriter.to_microseconds(record.timestamp))
+        for codes, dictionary, value in zip(self._codes, self._dictionaries, record[1:]):
+            code = dictionary.get(value)
+            if code is None:
+                code = dictionary[value] = len(dictionary)
+            codes.append(code)
+
+    def add_records(self, records: Iterable[DownloadRecord]) -> int:
+        """Adds every record, returning how many were added."""
+        added = 0
+        for record in records:
+            self.add(record)
+            added += 1
+        return added
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def to_bytes(self) -> bytes:
+        writer = ColumnarRecordWriter
+        output = bytearray(writer._HEADER.size + writer._COLUMN.size * len(writer.STRING_COLUMNS))
+
+        def append(section: bytes) -> int:
+            output.extend(bytes(writer._aligned(len(output)) - len(output)))
+            start = len(output)
+            output.extend(section)
+            return start
+
+        append(writer._little_endian(self._timestamps).tobytes())
+        columns = []
+        for name, codes, dictionary in zip(writer.STRING_COLUMNS, self._codes, self._dictionaries):
+            width = next((width for width in writer._CODE_TYPECODES if len(dictionary) <= 1 << (8 * width - 1)), None)
+            if width is None:
+                raise ValueError(f"Too many distinct values in {name} for {max(writer._CODE_TYPECODES)} byte codes: {len(dictionary) - 1}")
+            codes_offset = append(writer._little_endian(array(writer._CODE_TYPECODES[width], codes)).tobytes())
+            dictionary_offset = append(writer._encode_dictionary(list(dictionary)[1:]))
+            columns.append((codes_offset, width, dictionary_offset, len(dictionary) - 1))
+
+        writer._HEADER.pack_into(output, 0, writer.MAGIC, len(self), len(columns))
+        for index, column in enumerate(columns):
+            writer._COLUMN.pack_into(output, writer._HEADER.size + writer._COLUMN.size * index, *column)
+        return bytes(output)
+
+    def write(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    def write_parquet(self, path: str) -> None:
+        """Writes the records as Parquet, with dictionary-encoded string columns; requires pyarrow."""
+        import pyarrow.parquet as pq
+
+        pq.write_table(ColumnarRecordReader(self.to_bytes()).to_arrow(), path)
+
+    @staticmethod
+    def to_microseconds(timestamp: datetime) -> int:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return (timestamp - ColumnarRecordWriter._EPOCH) // timedelta(microseconds=1)
+
+    @staticmethod
+    def _encode_dictionary(values: list[str]) -> bytes:
+        # the same layout as a PackageIdIndex: count + 1 uint64 offsets, then the UTF-8 values back to back
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = array("Q", [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        return ColumnarRecordWriter._little_endian(offsets).tobytes() + b"".join(encoded)
+
+    @staticmethod
+    def _little_endian(values: array) -> array:
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values
+
+    @staticmethod
+    def _aligned(offset: int) -> int:
+        # sections start on 8 byte boundaries so they can be cast in place
+        return (offset + 7) & ~7
+
+class ColumnarRecordReader:
+    """Reads a file written by ColumnarRecordWriter, in place when it is memory-mapped.
+
+    codes and timestamps return views over the file, so aggregation passes scan integer arrays without
+    decoding a string per row; dictionaries are only decoded when asked for.
+    """
+
+    _DAY_MICROSECONDS = 86_400_000_000
+
+    def __init__(self, buffer) -> None:
+        magic, rows, column_count = ColumnarRecordWriter._HEADER.unpack_from(buffer, 0)
+        if magic != ColumnarRecordWriter.MAGIC or column_count != len(ColumnarRecordWriter.STRING_COLUMNS):
+            raise ValueError("Not a columnar download record file")
+
+        self._buffer = buffer
+        self._rows = rows
+        self._views: list[memoryview] = []
+        self._columns = {}
+        self._codes = {}
+        self._dictionaries: dict[str, list[Optional[str]]] = {}
+
+        position = ColumnarRecordWriter._HEADER.size
+        for name in ColumnarRecordWriter.STRING_COLUMNS:
+            self._columns[name] = ColumnarRecordWriter._COLUMN.unpack_from(buffer, position)
+            position += ColumnarRecordWriter._COLUMN.size
+        self._timestamps = self._view(ColumnarRecordWriter._aligned(position), 8, "q")
+
+    @staticmethod
+    def open(path: str) -> ColumnarRecordReader:
+        """Memory-maps a file written by ColumnarRecordWriter.write."""
+        with open(path, "rb") as file:
+            return ColumnarRecordReader(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        # the views have to be released before the map can be closed; views still exported, e.g. to an Arrow
+        # table from to_arrow, keep the map open until they are garbage collected
+        exported = False
+        for view in self._views:
+            try:
+                view.release()
+            except BufferError:
+                exported = True
+        self._views.clear()
+        self._codes.clear()
+        if isinstance(self._buffer, mmap.mmap) and not exported:
+            self._buffer.close()
+
+    def __enter__(self) -> ColumnarRecordReader:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def timestamps(self):
+        """Returns the timestamps as int64 microseconds since the epoch."""
+        return self._timestamps
+
+    def codes(self, column: str):
+        """Returns the codes of a string column, indices into its dictionary, 0 being null."""
+        codes = self._codes.get(column)
+        if codes is None:
+            offset, width, _, _ = self._columns[column]
+            codes = self._codes[column] = self._view(offset, width, ColumnarRecordWriter._CODE_TYPECODES[width])
+        return codes
+
+    def dictionary(self, column: str) -> list[Optional[str]]:
+        """Returns the distinct values of a string column by code, starting with None for code 0."""
+        dictionary = self._dictionaries.get(column)
+        if dictionary is None:
+            _, _, offset, count = self._columns[column]
+            offsets = self._view(offset, 8, "Q", count + 1)
+            blob_start = offset + 8 * (count + 1)
+            dictionary = [None] + [bytes(self._buffer[blob_start + offsets[index]:blob_start + offsets[index + 1]]).decode("utf-8")
+                                   for index in range(count)]
+            self._dictionaries[column] = dictionary
+        return dictionary
+
+    def __iter__(self) -> Iterator[DownloadRecord]:
+        columns = [self.codes(name) for name in ColumnarRecordWriter.STRING_COLUMNS]
+        dictionaries = [self.dictionary(name) for name in ColumnarRecordWriter.STRING_COLUMNS]
+        epoch = ColumnarRecordWriter._EPOCH
+        for row, timestamp in enumerate(self._timestamps):
+            yield DownloadRecord(epoch + timedelta(microseconds=timestamp),
+                                 *(dictionary[codes[row]] for codes, dictionary in zip(columns, dictionaries)))
+
+    def aggregate(self, aggregator: Optional[DownloadAggregator] = None) -> DownloadAggregator:
+        """Counts the records into an aggregator, grouping on codes and day numbers and decoding each distinct key once."""
+        aggregator = aggregator if aggregator is not None else DownloadAggregator()
+        day_length = ColumnarRecordReader._DAY_MICROSECONDS
+        days = (timestamp // day_length for timestamp in self._timestamps)
+        counts = Counter(zip(
+            self.codes("package_id"), self.codes("package_version"), self.codes("client_family"), self.codes("client_category"), days))
+
+        package_ids, versions, families, categories = (self.dictionary(name) for name in ("package_id", "package_version", "client_family", "client_category"))
+        epoch = ColumnarRecordWriter._EPOCH.date()
+        for (package_id, version, family, category, day), count in counts.items():
+            aggregator.add_key(DownloadKey(
+                aggregator.normalize_package_id(package_ids[package_id]), aggregator.normalize_version(versions[version]), families[family], categories[category] or "",
+                epoch + timedelta(days=day)), count)
+        return aggregator
+
+    def to_arrow(self):
+        """Returns the records as a pyarrow Table with dictionary-encoded string columns.
+
+        Code 0 becomes a null index rather than a None in the dictionary, which Parquet can't write. The
+        timestamps share the file's memory, so the table stays valid after the reader is closed; a mapped
+        file is then unmapped once the table is gone.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arrays = [pa.Array.from_buffers(pa.timestamp("us", tz="UTC"), self._rows, [None, pa.py_buffer(self._timestamps)])]
+        for name in ColumnarRecordWriter.STRING_COLUMNS:
+            codes = self.codes(name)
+            index_type = {1: pa.int8(), 2: pa.int16(), 4: pa.int32()}[codes.itemsize]
+            codes = pa.Array.from_buffers(index_type, self._rows, [None, pa.py_buffer(codes)])
+            indices = pc.if_else(pc.equal(codes, 0), pa.scalar(None, index_type), pc.subtract(codes, pa.scalar(1, index_type)))
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionary(name)[1:], pa.string())))
+        return pa.Table.from_arrays(arrays, names=list(DownloadRecord._fields))
+
+    def _view(self, offset: int, itemsize: int, typecode: str, count: Optional[int] = None):
+        count = self._rows if count is None else count
+        view = memoryview(self._buffer)[offset:offset + itemsize * count]
+        if sys.byteorder != "little":
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        view = view.cast(typecode)
+        self._views.append(view)
+        return view
@@ -0,0 +1,23 @@
+from __future__ import annotations
+from typing import Any, Iterable
+
+class Columns:
+    """Converts the columns the batch methods take into lists.
+
+    A column is any iterable of values, including pandas Series, NumPy arrays and pyarrow arrays; nulls come
+    through as None, or as NaN from pandas. The array types are converted in one call rather than boxed one
+    value at a time while iterating.
+    """
+
+    @staticmethod
+    def to_list(values: Iterable[Any]) -> list:
+        if hasattr(values, "to_pylist"):
+            return values.to_pylist()
+        if hasattr(values, "tolist"):
+            return values.tolist()
+        return values if isinstance(values, list) else list(values)
+
+    @staticmethod
+    def strings(values: Iterable[Any]) -> list[str]:
+        """Returns a column as a list of strings, nulls and other non-string values becoming empty strings."""
+        return [value if isinstance(value, str) else "" for value in Columns.to_list(values)]
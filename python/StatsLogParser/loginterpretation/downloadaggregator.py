@@ -0,0 +1,138 @@
+from __future__ import annotations
+from array import array
+from collections import namedtuple
+from datetime import date
+from typing import IO, Iterable, Iterator, Optional
+import gzip
+import sys
+from .cdnlogparser import DownloadRecord
+from .nugetversion import NuGetVersion
+
+DownloadKey = namedtuple('DownloadKey', ['package_id', 'package_version', 'client_family', 'client_category', 'date'])
+
+class DownloadAggregator:
+    """Counts downloads per lowercased package id and normalized version, client family, client category and day.
+
+    This is the roll up Stats.AggregateCdnDownloadsInGallery works from. Key strings are interned and each
+    distinct key is stored once, mapped to a slot of a flat array of 64-bit counters, so a day of traffic
+    takes memory proportional to its distinct keys rather than its downloads. Partial aggregates, e.g. one
+    per worker or per log file, are combined with merge. A client without a category is counted under "",
+    as ClientNameTranslation returns for it, whether the record comes from a log or from a file read back.
+    """
+
+    OUTPUT_COLUMNS = ('date', 'package_id', 'package_version', 'client_family', 'client_category', 'downloads')
+
+    def __init__(self) -> None:
+        self._slots: dict[DownloadKey, int] = {}
+        self._counts = array('q')
+        self._versions: dict[str, str] = {}
+        self._dates: dict[date, date] = {}
+
+    def add(self, record: DownloadRecord, count: int = 1) -> None:
+        self.add_key(self.key(record), count)
+
+    def add_records(self, records: Iterable[DownloadRecord]) -> int:
+        """Counts every record, returning how many were added."""
+        added = 0
+        for record in records:
+            self.add_key(self.key(record))
+            added += 1
+        return added
+
+    def add_key(self, key: DownloadKey, count: int = 1) -> None:
+        slot = self._slots.get(key)
+        if slot is None:
+            self._slots[self._intern(key)] = len(self._counts)
+            self._counts.append(count)
+        else:
+            self._counts[slot] += count
+
+    def key(self, record: DownloadRecord) -> DownloadKey:
+        return DownloadKey(
+            self.normalize_package_id(record.package_id),
+            self.normalize_version(record.package_version),
+            record.client_family,
+            record.client_category or "",
+            record.timestamp.date())
+
+    @staticmethod
+    def normalize_package_id(package_id: Optional[str]) -> Optional[str]:
+        """Returns a package id lowercased, as ids are case-insensitive and urls spell them either way."""
+        return package_id.lower() if package_id is not None else None
+
+    def normalize_version(self, version: Optional[str]) -> Optional[str]:
+        """Returns the lowercased normalized form of a version, without build metadata, as the gallery keys it.
+
+        Versions that don't parse are only lowercased.
+        """
+        if version is None:
+            return None
+
+        normalized = self._versions.get(version)
+        if normalized is None:
+            parsed = NuGetVersion.try_parse(version)
+            normalized = (parsed.to_normalized_string().split("+", 1)[0] if parsed is not None else version).lower()
+            self._versions[version] = normalized
+        return normalized
+
+    def merge(self, other: DownloadAggregator) -> DownloadAggregator:
+        """Adds the counts of another aggregate to this one and returns this one."""
+        for key, count in other.items():
+            self.add_key(key, count)
+        return self
+
+    def items(self) -> Iterator[tuple[DownloadKey, int]]:
+        counts = self._counts
+        for key, slot in self._slots.items():
+            yield key, counts[slot]
+
+    def get(self, key: DownloadKey) -> int:
+        slot = self._slots.get(key)
+        return 0 if slot is None else self._counts[slot]
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def write(self, path: str) -> None:
+        """Writes the counts as tab-separated rows sorted by key, gzipped when the path ends with .gz; None is written empty."""
+        with DownloadAggregator._open(path, "wt") as output:
+            output.write("\t".join(DownloadAggregator.OUTPUT_COLUMNS) + "\n")
+            for key, count in sorted(self.items(), key=DownloadAggregator._sort_key):
+                output.write("\t".join((
+                    key.date.isoformat(),
+                    key.package_id or "",
+                    key.package_version or "",
+                    key.client_family or "",
+                    key.client_category or "",
+                    str(count))) + "\n")
+
+    @staticmethod
+    def read(path: str) -> DownloadAggregator:
+        """Reads counts written by write into a new aggregate, empty values but the category being read back as None."""
+        aggregator = DownloadAggregator()
+        with DownloadAggregator._open(path, "rt") as lines:
+            next(lines, None) # header
+            for line in lines:
+                day, package_id, package_version, client_family, client_category, count = line.rstrip("\n").split("\t")
+                aggregator.add_key(DownloadKey(package_id or None, package_version or None, client_family or None, client_category,
+                                               date.fromisoformat(day)), int(count))
+        return aggregator
+
+    @staticmethod
+    def _open(path: str, mode: str) -> IO[str]:
+        if path.endswith(".gz"):
+            return gzip.open(path, mode, encoding="utf-8", newline="\n")
+        return open(path, mode, encoding="utf-8", newline="\n")
+
+    @staticmethod
+    def _sort_key(item: tuple[DownloadKey, int]) -> tuple:
+        key = item[0]
+        return (key.date, key.package_id or "", key.package_version or "", key.client_family or "", key.client_category or "")
+
+    def _intern(self, key: DownloadKey) -> DownloadKey:
+        day = self._dates.setdefault(key.date, key.date)
+        return DownloadKey(*(sys.intern(part) if type(part) is str else part for part in key[:4]), day)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+import hashlib
+import io
+import os
+from .cdnlogparser import CdnLogParser
+from .checkpointstore import CheckpointStore, FileCheckpoint, Partition
+from .logprocessor import FileResult, LogProcessor
+from .useragentparser import UserAgentParser
+
+FileIncrement = namedtuple('FileIncrement', ['checkpoint', 'result', 'start_offset', 'replace'])
+IncrementalSummary = namedtuple('IncrementalSummary', ['processed', 'unchanged', 'reprocessed'])
+
+class IncrementalProcessor:
+    """Processes only what is new in a set of CDN log files since the last run, as recorded in a CheckpointStore.
+
+    For each file:
+    - when its size, modification time and the rules version are those of its checkpoint, it isn't read at all;
+    - a plain text file that grew from its last line break, with the fingerprint of the bytes before its
+      checkpoint's offset unchanged, is parsed from that offset on, into a new partition;
+    - a gzipped file, or a file whose processed bytes changed, is fingerprinted and, unless its fingerprint is
+      unchanged, processed again from the start, replacing all of its partitions;
+    - every file is processed again from the start when the rules version changes.
+    A file's checkpoint is saved with its partition as soon as the file is done, so a run that dies part way
+    through only redoes the files it didn't finish. Partitions are written under a temporary name first.
+    """
+
+    PARTITION_NAME_FORMAT = "part-{0:05d}-{1:05d}.tsv"
+    _WINDOW_SIZE = 1 << 16
+
+    @staticmethod
+    def process_files(paths: Iterable[str], output_dir: str, checkpoint_path: str, workers: Optional[int] = None) -> IncrementalSummary:
+        """Processes the new data of the log files into output_dir and returns the counts of that data only.
+
+        processed covers the partitions written by this run, unchanged lists the files with nothing new and
+        reprocessed the files processed before whose partitions were replaced. workers is as in LogProcessor.
+        """
+        paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+        workers = workers or os.cpu_count() or 1
+        os.makedirs(output_dir, exist_ok=True)
+        rules_version = UserAgentParser.rules_version()
+
+        with CheckpointStore(checkpoint_path) as store:
+            checkpoints = [store.register(path) for path in paths]
+            output_paths = [os.path.join(output_dir, IncrementalProcessor.PARTITION_NAME_FORMAT.format(checkpoint.file_id, store.next_segment(checkpoint.file_id)))
+                            for checkpoint in checkpoints]
+            order = sorted(range(len(paths)), key=lambda index: os.path.getsize(paths[index]), reverse=True)
+            results: list[Optional[FileResult]] = [None] * len(paths)
+            unchanged = []
+            reprocessed = []
+
+            def save(index: int, increment: FileIncrement) -> None:
+                if increment.result is None:
+                    store.save(increment.checkpoint)
+                    unchanged.append(paths[index])
+                    return
+
+                result = increment.result
+                partition = Partition(increment.checkpoint.file_id, store.next_segment(increment.checkpoint.file_id), result.output_path,
+                                      increment.start_offset, increment.checkpoint.offset, result.records, result.errors)
+                for replaced in store.save(increment.checkpoint, partition, increment.replace):
+                    if os.path.exists(replaced.output_path):
+                        os.remove(replaced.output_path)
+                if increment.replace and checkpoints[index].sha256 is not None:
+                    reprocessed.append(paths[index])
+                results[index] = result
+
+            if workers == 1 or len(paths) <= 1:
+                LogProcessor.initialize_worker(UserAgentParser.DECODE_PLUS_SIGNS)
+                for index in order:
+                    save(index, IncrementalProcessor.process_file(paths[index], output_paths[index], checkpoints[index], rules_version))
+            else:
+                with ProcessPoolExecutor(
+                        max_workers=min(workers, len(paths)),
+                        initializer=LogProcessor.initialize_worker,
+                        initargs=(UserAgentParser.DECODE_PLUS_SIGNS,)) as executor:
+                    futures = {executor.submit(IncrementalProcessor.process_file, paths[index], output_paths[index], checkpoints[index], rules_version): index
+                               for index in order}
+                    # checkpoint each file as it finishes, so a failure later on doesn't lose it
+                    for future in as_completed(futures):
+                        save(futures[future], future.result())
+
+        processed = LogProcessor.merge_results(result for result in results if result is not None)
+        return IncrementalSummary(processed, sorted(unchanged, key=paths.index), sorted(reprocessed, key=paths.index))
+
+    @staticmethod
+    def process_file(path: str, output_path: str, checkpoint: FileCheckpoint, rules_version: str) -> FileIncrement:
+        """Processes what is new in one log file since its checkpoint; the increment's result is None when nothing is."""
+        stat = os.stat(path)
+        current = checkpoint._replace(size=stat.st_size, mtime_ns=stat.st_mtime_ns, rules_version=rules_version)
+        same_rules = checkpoint.rules_version == rules_version
+        if same_rules and checkpoint.size == stat.st_size and checkpoint.mtime_ns == stat.st_mtime_ns:
+            return FileIncrement(current, None, checkpoint.offset, False)
+
+        with open(path, "rb") as file:
+            gzipped = file.read(len(CdnLogParser.GZIP_MAGIC)) == CdnLogParser.GZIP_MAGIC
+
+            if gzipped:
+                fingerprint = IncrementalProcessor.fingerprint(file, stat.st_size)
+                if same_rules and fingerprint == checkpoint.sha256:
+                    return FileIncrement(current, None, checkpoint.offset, False)
+                current = current._replace(offset=stat.st_size, lines=0, sha256=fingerprint)
+                with CdnLogParser.open_log_file(path) as lines:
+                    return IncrementalProcessor._process_lines(path, output_path, lines, current, 0)
+
+            start = 0
+            if same_rules and 0 < checkpoint.offset <= stat.st_size and IncrementalProcessor.fingerprint(file, checkpoint.offset) == checkpoint.sha256:
+                if checkpoint.offset == stat.st_size:
+                    return FileIncrement(current, None, checkpoint.offset, False)
+                file.seek(checkpoint.offset - 1)
+                if file.read(1) == b"\n":
+                    start = checkpoint.offset
+
+            file.seek(start)
+            current = current._replace(lines=checkpoint.lines if start else 0)
+            increment = IncrementalProcessor._process_lines(path, output_path, IncrementalProcessor._read_lines(file), current, start)
+            # the offset is where reading stopped, past the size seen if the file grew meanwhile
+            offset = file.tell()
+            return increment._replace(checkpoint=increment.checkpoint._replace(offset=offset, sha256=IncrementalProcessor.fingerprint(file, offset)))
+
+    @staticmethod
+    def fingerprint(file, end: int) -> str:
+        """Returns a sha256 over the first end bytes of a file: their length, and their first and last 64 KiB.
+
+        Logs are only appended to, and a file written anew differs in its first bytes or in the ones before
+        the offset, so checking a file costs two window reads however large it grows.
+        """
+        window = IncrementalProcessor._WINDOW_SIZE
+        hasher = hashlib.sha256(end.to_bytes(8, "little"))
+        file.seek(0)
+        hasher.update(file.read(min(window, end)))
+        tail_start = max(window, end - window)
+        if tail_start < end:
+            file.seek(tail_start)
+            hasher.update(file.read(end - tail_start))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _process_lines(path: str, output_path: str, lines: Iterable[str], checkpoint: FileCheckpoint, start: int) -> FileIncrement:
+        errors = []
+        line_count = [0]
+        entries = CdnLogParser.parse_log_entries(IncrementalProcessor._count(lines, line_count), lambda e, line_number: errors.append(line_number), checkpoint.lines + 1)
+
+        temporary_path = output_path + ".tmp"
+        records, downloads = LogProcessor.write_partition(CdnLogParser.to_download_records(entries), temporary_path)
+        os.replace(temporary_path, output_path)
+
+        checkpoint = checkpoint._replace(lines=checkpoint.lines + line_count[0])
+        return FileIncrement(checkpoint, FileResult(path, output_path, records, len(errors), downloads), start, start == 0)
+
+    @staticmethod
+    def _read_lines(file) -> Iterator[str]:
+        # decoded as CdnLogParser.open_log_file does, with universal newlines, so a bare '\r' ends a line here
+        # too; the text layer reads to the end, leaving the file's position at the offset reached
+        lines = io.TextIOWrapper(file, encoding="utf-8", errors="replace")
+        try:
+            yield from lines
+        finally:
+            lines.detach()
+
+    @staticmethod
+    def _count(lines: Iterable[str], count: list[int]) -> Iterator[str]:
+        for line in lines:
+            count[0] += 1
+            yield line
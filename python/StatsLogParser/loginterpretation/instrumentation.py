@@ -0,0 +1,91 @@
+from __future__ import annotations
+from collections import Counter
+from typing import Any
+import threading
+
+class Instrumentation:
+    """Process-wide counters and timing histograms for the parsing hot paths, off by default.
+
+    Instrumented code checks ENABLED before doing any work, so leaving it off costs one attribute lookup per
+    call. Timings go to histograms with power-of-two nanosecond buckets, keyed by their upper bound.
+    """
+
+    ENABLED = False
+
+    _LOCK = threading.Lock()
+    _COUNTERS: Counter = Counter()
+    _HISTOGRAMS: dict[str, Counter] = {}
+
+    @staticmethod
+    def enable() -> None:
+        Instrumentation.ENABLED = True
+
+    @staticmethod
+    def disable() -> None:
+        Instrumentation.ENABLED = False
+
+    @staticmethod
+    def reset() -> None:
+        with Instrumentation._LOCK:
+            Instrumentation._COUNTERS.clear()
+            Instrumentation._HISTOGRAMS.clear()
+
+    @staticmethod
+    def increment(name: str, count: int = 1) -> None:
+        with Instrumentation._LOCK:
+            Instrumentation._COUNTERS[name] += count
+
+    @staticmethod
+    def observe(name: str, elapsed_ns: int) -> None:
+        """Records a duration in the histogram of the name."""
+        upper_bound = 1 << max(elapsed_ns, 0).bit_length()
+        with Instrumentation._LOCK:
+            histogram = Instrumentation._HISTOGRAMS.get(name)
+            if histogram is None:
+                histogram = Instrumentation._HISTOGRAMS[name] = Counter()
+            histogram[upper_bound] += 1
+
+    @staticmethod
+    def to_dict(reset: bool = False) -> dict[str, Any]:
+        """Returns a copy of the counters and of the histograms, as {name: {upper bound in ns: count}}."""
+        with Instrumentation._LOCK:
+            snapshot = {
+                "counters": dict(Instrumentation._COUNTERS),
+                "histograms": {name: dict(sorted(histogram.items())) for name, histogram in Instrumentation._HISTOGRAMS.items()}}
+            if reset:
+                Instrumentation._COUNTERS.clear()
+                Instrumentation._HISTOGRAMS.clear()
+            return snapshot
+
+    @staticmethod
+    def to_flat_dict(reset: bool = False) -> dict[str, int]:
+        """Returns the counters and histogram buckets as one {name: count} dict, buckets named <name>.le_<bound>ns."""
+        snapshot = Instrumentation.to_dict(reset)
+        flat = dict(snapshot["counters"])
+        for name, histogram in snapshot["histograms"].items():
+            for upper_bound, count in histogram.items():
+                flat[f"{name}.le_{upper_bound}ns"] = count
+        return flat
+
+    @staticmethod
+    def create_accumulator(spark_context):
+        """Creates a Spark accumulator that sums the flat dicts executors add with add_to_accumulator."""
+        return spark_context.accumulator({}, CounterAccumulatorParam())
+
+    @staticmethod
+    def add_to_accumulator(accumulator, reset: bool = True) -> None:
+        """Adds what was recorded in this process to a Spark accumulator, resetting it so it's only counted once."""
+        flat = Instrumentation.to_flat_dict(reset)
+        if flat:
+            accumulator.add(flat)
+
+class CounterAccumulatorParam:
+    """Spark AccumulatorParam summing {name: count} dicts; Spark only needs zero and addInPlace."""
+
+    def zero(self, value: dict[str, int]) -> dict[str, int]:
+        return {}
+
+    def addInPlace(self, first: dict[str, int], second: dict[str, int]) -> dict[str, int]:
+        for name, count in second.items():
+            first[name] = first.get(name, 0) + count
+        return first
@@ -0,0 +1,74 @@
+from __future__ import annotations
+from typing import Iterable, Iterator
+import re
+
+class LiteralScanner:
+    """Finds which of a fixed set of literal strings occur in a text.
+
+    The literals are compiled into a single trie-shaped regex. Each search reports the longest literal starting
+    at a position, which implies every literal inside it, and scanning resumes one character later so literals
+    overlapping its end are found too. This gives the results of a multi-pattern (Aho-Corasick style) matcher
+    with the standard library only.
+    """
+
+    def __init__(self, literals: Iterable[str]) -> None:
+        self.literals = frozenset(literal for literal in literals if literal)
+
+        trie = LiteralScanner._build_trie(self.literals)
+        self._literal_re = re.compile(LiteralScanner._trie_pattern(trie)) if self.literals else None
+        self._contained: dict[str, tuple[str, ...]] = {
+            literal: tuple(LiteralScanner._contained_literals(trie, literal)) for literal in self.literals}
+
+    def longest_matches(self, text: str) -> Iterator[str]:
+        """Yields the longest literal starting at each position of the text where one starts."""
+        if self._literal_re is None:
+            return
+
+        search = self._literal_re.search
+        match = search(text)
+        while match is not None:
+            yield match.group()
+            match = search(text, match.start() + 1)
+
+    def contained(self, literal: str) -> tuple[str, ...]:
+        """Returns the literals occurring inside one of the literals, itself included."""
+        return self._contained[literal]
+
+    def find_all(self, text: str) -> set[str]:
+        """Returns every literal occurring in the text."""
+        found = set()
+        for literal in self.longest_matches(text):
+            found.update(self._contained[literal])
+        return found
+
+    @staticmethod
+    def _build_trie(literals: Iterable[str]) -> dict:
+        root: dict = {}
+        for literal in literals:
+            node = root
+            for char in literal:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        return root
+
+    @staticmethod
+    def _trie_pattern(node: dict) -> str:
+        # greedy optional groups make the regex match the longest literal at a position
+        terminal = "" in node
+        children = [re.escape(char) + LiteralScanner._trie_pattern(child) for char, child in sorted(node.items()) if char]
+        if not children:
+            return ""
+        if len(children) == 1 and not terminal:
+            return children[0]
+        return "(?:" + "|".join(children) + ")" + ("?" if terminal else "")
+
+    @staticmethod
+    def _contained_literals(trie: dict, text: str) -> Iterator[str]:
+        for start in range(len(text)):
+            node = trie
+            for end in range(start, len(text)):
+                node = node.get(text[end])
+                if node is None:
+                    break
+                if "" in node:
+                    yield text[start:end + 1]
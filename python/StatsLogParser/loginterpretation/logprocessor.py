@@ -0,0 +1,109 @@
+from __future__ import annotations
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Optional
+import csv
+import os
+from .cdnlogparser import CdnLogParser, DownloadRecord
+from .downloadaggregator import DownloadAggregator
+from .useragentparser import UserAgentParser
+
+FileResult = namedtuple('FileResult', ['path', 'output_path', 'records', 'errors', 'downloads'])
+ProcessingSummary = namedtuple('ProcessingSummary', ['files', 'records', 'errors', 'downloads'])
+
+class LogProcessor:
+    """Processes a set of CDN log files across a pool of worker processes.
+
+    Files are the unit of work: each worker streams the download records of one file at a time to its own
+    output partition and rolls its downloads up in a DownloadAggregator. The driver merges each file's
+    aggregate as soon as the file is done, keeping only its counts. The user agent rules are compiled once
+    per worker, when it starts, and each worker keeps its parse caches warm across the files it is given.
+    """
+
+    OUTPUT_COLUMNS = DownloadRecord._fields
+    PARTITION_NAME_FORMAT = "part-{0:05d}.tsv"
+    # a representative user agent to run through every rule set while a worker starts
+    _WARM_UP_USER_AGENT = "NuGet Command Line/6.0.0 (Microsoft Windows NT 10.0.19045.0)"
+
+    @staticmethod
+    def process_files(paths: Iterable[str], output_dir: str, workers: Optional[int] = None) -> ProcessingSummary:
+        """Processes the log files, writing one partition per file to output_dir, and returns the merged counts.
+
+        workers defaults to the number of CPUs; with a single worker the files are processed in this process.
+        """
+        paths = list(paths)
+        workers = workers or os.cpu_count() or 1
+        os.makedirs(output_dir, exist_ok=True)
+
+        output_paths = [os.path.join(output_dir, LogProcessor.PARTITION_NAME_FORMAT.format(index)) for index in range(len(paths))]
+        # start the largest files first so a big file picked up last doesn't leave the other workers idle
+        order = sorted(range(len(paths)), key=lambda index: os.path.getsize(paths[index]), reverse=True)
+
+        if workers == 1 or len(paths) <= 1:
+            LogProcessor.initialize_worker(UserAgentParser.DECODE_PLUS_SIGNS)
+            summary = LogProcessor.merge_results(LogProcessor.process_file(paths[index], output_paths[index]) for index in order)
+        else:
+            with ProcessPoolExecutor(
+                    max_workers=min(workers, len(paths)),
+                    initializer=LogProcessor.initialize_worker,
+                    initargs=(UserAgentParser.DECODE_PLUS_SIGNS,)) as executor:
+                futures = [executor.submit(LogProcessor.process_file, paths[index], output_paths[index]) for index in order]
+                summary = LogProcessor.merge_results(future.result() for future in as_completed(futures))
+
+        # the files are merged in the order they finish and reported in the order they were given
+        positions = {output_path: index for index, output_path in enumerate(output_paths)}
+        return summary._replace(files=sorted(summary.files, key=lambda result: positions[result.output_path]))
+
+    @staticmethod
+    def process_file(path: str, output_path: str) -> FileResult:
+        """Streams the download records of one log file to a tab-separated partition and counts them."""
+        errors = []
+        records, downloads = LogProcessor.write_partition(
+            CdnLogParser.read_download_records(path, lambda e, line_number: errors.append(line_number)), output_path)
+        return FileResult(path, output_path, records, len(errors), downloads)
+
+    @staticmethod
+    def write_partition(records: Iterable[DownloadRecord], output_path: str) -> tuple[int, DownloadAggregator]:
+        """Streams download records to a tab-separated partition, returning how many there were and their counts."""
+        downloads = DownloadAggregator()
+        count = 0
+
+        with open(output_path, "w", encoding="utf-8", newline="") as output:
+            writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+            writer.writerow(LogProcessor.OUTPUT_COLUMNS)
+
+            for record in records:
+                writer.writerow(record)
+                downloads.add(record)
+                count += 1
+
+        return count, downloads
+
+    @staticmethod
+    def merge_results(results: Iterable[FileResult]) -> ProcessingSummary:
+        """Merges file results as they are produced, keeping each file's counts but not its aggregate."""
+        files = []
+        downloads = DownloadAggregator()
+        records = 0
+        errors = 0
+
+        for result in results:
+            downloads.merge(result.downloads)
+            files.append(result._replace(downloads=None))
+            records += result.records
+            errors += result.errors
+
+        return ProcessingSummary(files, records, errors, downloads)
+
+    @staticmethod
+    def initialize_worker(decode_plus_signs: bool) -> None:
+        """Prepares a process or thread to parse logs: applies the driver's settings and compiles the rules.
+
+        Pass it as the initializer of an executor running process_file or the other processors' work.
+        """
+        # workers started with spawn re-import the package, so settings changed in the driver are applied again
+        if UserAgentParser.DECODE_PLUS_SIGNS != decode_plus_signs:
+            UserAgentParser.set_plus_sign_decoding(decode_plus_signs)
+
+        # compiles the rules without counting the warm-up in the caches' or the instrumentation's statistics
+        UserAgentParser.warm_up(LogProcessor._WARM_UP_USER_AGENT)
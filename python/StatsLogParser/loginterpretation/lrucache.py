@@ -0,0 +1,83 @@
+from __future__ import annotations
+from collections import OrderedDict, namedtuple
+from typing import Generic, Hashable, Optional, TypeVar
+import threading
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+class LRUCache(Generic[K, V]):
+    """Bounded, thread-safe least-recently-used cache with hit, miss and eviction counters."""
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key: K) -> Optional[V]:
+        """Returns the cached value and marks it as most recently used, or None on a miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """Returns the cached value, or None, without counting a hit or a miss or marking it as used."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: K, value: V) -> None:
+        """Adds or refreshes an entry, evicting the least recently used ones when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict(self._maxsize)
+
+    def resize(self, maxsize: int) -> None:
+        """Changes the capacity, evicting the least recently used entries if it shrinks."""
+        if maxsize < 1:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict(maxsize)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def _evict(self, maxsize: int) -> None:
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
@@ -1,9 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
+import re
+from .columns import Columns
 from .semanticversion import SemanticVersion, Version
 
-@dataclass
+# A version string that parses and is already in normalized form: 3 or 4 numbers without leading zeros and
+# a non-zero revision, followed by release labels and build metadata exactly as to_normalized_string writes them.
+_NORMALIZED_VERSION_RE = re.compile(
+    r"(?:0|[1-9][0-9]*)\.(?:0|[1-9][0-9]*)\.(?:0|[1-9][0-9]*)(?:\.[1-9][0-9]*)?(?:-[^+]*)?(?:\+.+)?",
+    re.DOTALL)
+
+@dataclass(frozen=True, slots=True, eq=False)
 class NuGetVersion(SemanticVersion):
 
     @classmethod
@@ -15,6 +23,11 @@ class NuGetVersion(SemanticVersion):
         except Exception as e:
             raise ValueError(f"Invalid NuGetVersion string: {value}") from e
 
+    @staticmethod
+    def is_normalized(value: str) -> bool:
+        """Returns whether the string parses and equals its normalized form, without raising or building a version."""
+        return _NORMALIZED_VERSION_RE.fullmatch(value) is not None
+
     @classmethod
     def try_parse(cls, value: str) -> Optional[NuGetVersion]:
         try:
@@ -22,6 +35,47 @@ class NuGetVersion(SemanticVersion):
         except ValueError:
             return None
 
+    @staticmethod
+    def sort_keys(values: Iterable[str]) -> list[tuple]:
+        """Returns the NuGet order sort key of each version string in a column, parsing each distinct string once.
+
+        Strings that don't parse get keys sorting below every version, ordered by value.
+        """
+        keys_by_value: dict[str, tuple] = {}
+        keys = []
+        for value in Columns.to_list(values):
+            key = keys_by_value.get(value)
+            if key is None:
+                version = NuGetVersion.try_parse(value) if isinstance(value, str) else None
+                key = (1, version.sort_key()) if version else (0, value if isinstance(value, str) else "")
+                keys_by_value[value] = key
+            keys.append(key)
+
+        return keys
+
+    @staticmethod
+    def sort_versions(values: Iterable[str], reverse: bool = False) -> list[str]:
+        """Sorts a column of version strings in NuGet order."""
+        values = Columns.to_list(values)
+        keys = NuGetVersion.sort_keys(values)
+        order = sorted(range(len(values)), key=keys.__getitem__, reverse=reverse)
+        return [values[index] for index in order]
+
+    @staticmethod
+    def rank_versions(values: Iterable[str]) -> list[int]:
+        """Returns the dense rank of each version string in a column; equal versions share a rank."""
+        keys = NuGetVersion.sort_keys(values)
+        ranks = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+        return [ranks[key] for key in keys]
+
+    @staticmethod
+    def latest_version(values: Iterable[str]) -> Optional[str]:
+        """Returns the highest version string of a column, or None if none of them parse."""
+        values = Columns.to_list(values)
+        keys = NuGetVersion.sort_keys(values)
+        latest = max(range(len(values)), key=keys.__getitem__, default=None)
+        return values[latest] if latest is not None and keys[latest][0] else None
+
     @staticmethod
     def parse_version(version_string: str) -> Version:
         parts = version_string.split(".")
@@ -1,12 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Iterable, Optional
+from .columns import Columns
+from .instrumentation import Instrumentation
+from .lrucache import CacheInfo, LRUCache
 from .nugetversion import NuGetVersion
+from .packageidindex import PackageIdIndex
+import time
 import urllib.parse
 
-@dataclass(init=False)
+@dataclass(init=False, frozen=True)
 class PackageDefinition:
-    """dataclass to represent a package definition"""
+    """dataclass to represent a package definition, immutable so resolved definitions can be cached and shared"""
 
     NUGET_EXTENSION = ".nupkg"
     VERSION_QUERY_PARAMETER = "packageVersion"
@@ -17,23 +22,92 @@ class PackageDefinition:
     package_id: str
     package_version: str
 
+    _MAX_CACHE_SIZE = 10000
+    # Values are 1-tuples wrapping the result, so a cached None result can be told apart from a miss
+    _REQUEST_URL_CACHE: ClassVar[LRUCache[object, tuple]] = LRUCache(_MAX_CACHE_SIZE)
+    _NUGET_EXE_URL_CACHE: ClassVar[LRUCache[str, tuple]] = LRUCache(_MAX_CACHE_SIZE)
+
     def __init__(self, package_id: str = None, package_version: str = None) -> None:
-        self.package_id = package_id.strip() if package_id else None
-        self.package_version = package_version.strip() if package_version else None
+        object.__setattr__(self, "package_id", package_id.strip() if package_id else None)
+        object.__setattr__(self, "package_version", package_version.strip() if package_version else None)
+
+    @staticmethod
+    def set_cache_size(size: int) -> None:
+        """Changes how many resolved urls are kept by each of the request url and nuget.exe url caches."""
+        PackageDefinition._REQUEST_URL_CACHE.resize(size)
+        PackageDefinition._NUGET_EXE_URL_CACHE.resize(size)
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        """Returns the hit, miss and eviction counters of the from_request_url cache."""
+        return PackageDefinition._REQUEST_URL_CACHE.info()
+
+    @staticmethod
+    def nuget_exe_cache_info() -> CacheInfo:
+        """Returns the hit, miss and eviction counters of the from_nuget_exe_url cache."""
+        return PackageDefinition._NUGET_EXE_URL_CACHE.info()
 
     @staticmethod
-    def from_request_url(request_url) -> list[PackageDefinition]:
-        """Static method to create a PackageDefinition from a request url"""
+    def clear_caches() -> None:
+        PackageDefinition._REQUEST_URL_CACHE.clear()
+        PackageDefinition._NUGET_EXE_URL_CACHE.clear()
+
+    @staticmethod
+    def from_request_url(request_url, package_id_index: Optional[PackageIdIndex] = None) -> list[PackageDefinition]:
+        """Static method to create a PackageDefinition from a request url
+
+        With an index of known package ids, an ambiguous file name resolves to its longest known id: splits
+        are tried from the right, and the scan stops at the first known one. Without a known split, every
+        option is returned, shortest id first.
+        Resolutions of urls that may be packages are cached per url (and index); each call gets its own list.
+        """
 
         if not request_url:
             return None
 
-        resolution_options = []
+        if not PackageDefinition.may_be_package_url(request_url):
+            # cheap to reject, and most requests, so not worth a cache entry
+            if Instrumentation.ENABLED:
+                Instrumentation.increment("packagedefinition.from_request_url.resolved_by.not_a_package")
+            return None
 
-        parsed = urllib.parse.urlparse(request_url)
+        key = request_url if package_id_index is None else (request_url, package_id_index)
+        entry = PackageDefinition._REQUEST_URL_CACHE.get(key)
+        if entry is None:
+            entry = PackageDefinition._cache_entry(PackageDefinition._resolve_request_url(request_url, package_id_index))
+            PackageDefinition._REQUEST_URL_CACHE.put(key, entry)
+        elif Instrumentation.ENABLED:
+            Instrumentation.increment("packagedefinition.from_request_url.resolved_by.cache")
+
+        return list(entry[0]) if entry[0] is not None else None
+
+    @staticmethod
+    def _cache_entry(resolution_options: Optional[list[PackageDefinition]]) -> tuple:
+        return (tuple(resolution_options) if resolution_options is not None else None,)
+
+    @staticmethod
+    def _resolve_request_url(request_url, package_id_index: Optional[PackageIdIndex], parsed=None) -> list[PackageDefinition]:
+        if not Instrumentation.ENABLED:
+            return PackageDefinition._from_request_url(request_url, package_id_index, parsed)
+
+        start = time.perf_counter_ns()
+        resolution_options = PackageDefinition._from_request_url(request_url, package_id_index, parsed)
+        Instrumentation.observe("packagedefinition.from_request_url.time", time.perf_counter_ns() - start)
+        if resolution_options and len(resolution_options) > 1:
+            Instrumentation.increment("packagedefinition.from_request_url.ambiguous")
+        return resolution_options
+
+    @staticmethod
+    def _from_request_url(request_url, package_id_index: Optional[PackageIdIndex] = None, parsed=None) -> list[PackageDefinition]:
+        # callers have already ruled out the urls may_be_package_url rejects
+        if parsed is None:
+            parsed = urllib.parse.urlparse(request_url)
         if(not parsed.path.lower().endswith(PackageDefinition.NUGET_EXTENSION)):
+            if Instrumentation.ENABLED:
+                Instrumentation.increment("packagedefinition.from_request_url.resolved_by.not_a_package")
             return None
 
+        resolution_options = []
         url_segments = [segment for segment in urllib.parse.unquote(parsed.path).split("/") if segment]
 
         file_name = url_segments[-1]
@@ -51,10 +125,12 @@ class PackageDefinition:
                 resolution_options.append(
                     PackageDefinition(package_id_container, package_version_container)
                 )
+                if Instrumentation.ENABLED:
+                    Instrumentation.increment("packagedefinition.from_request_url.resolved_by.flat_container")
 
         # Look for it in the query string
         if not resolution_options:
-            query_params = urllib.parse.parse_qs(parsed.query)
+            query_params = urllib.parse.parse_qs(parsed.query) if parsed.query else {}
             version_param_list = query_params.get(PackageDefinition.VERSION_QUERY_PARAMETER, None)
 
             if version_param_list is not None:
@@ -68,29 +144,150 @@ class PackageDefinition:
                     resolution_options.append(
                         PackageDefinition(parsed_id, version_param)
                     )
+                    if Instrumentation.ENABLED:
+                        Instrumentation.increment("packagedefinition.from_request_url.resolved_by.query_string")
             else:
-                # Look for it in the file name but this can be ambiguous if the package id ends in a number
-                next_dot_index = file_name.find('.')
+                resolution_options = PackageDefinition._from_file_name(file_name, package_id_index)
 
-                while next_dot_index != -1:
-                    package_part = file_name[:next_dot_index]
-                    version_part = file_name[next_dot_index + 1:]
+        if Instrumentation.ENABLED and not resolution_options:
+            Instrumentation.increment("packagedefinition.from_request_url.resolved_by.unresolved")
 
-                    nuget_version = NuGetVersion.try_parse(version_part)
-                    if nuget_version and nuget_version.to_normalized_string().lower() == version_part.lower():
-                        resolution_options.append(PackageDefinition(package_part, version_part))
+        return resolution_options
 
-                    next_dot_index = file_name.find('.', next_dot_index + 1)
+    @staticmethod
+    def _from_file_name(file_name: str, package_id_index: Optional[PackageIdIndex]) -> list[PackageDefinition]:
+        """Splits a file name into an id and a version at every dot followed by a normalized version.
 
-        return resolution_options
+        This can be ambiguous if the package id ends in a number. With an index, the longest known id wins,
+        e.g. foo.2 over foo for foo.2.1.0.1 when both are known.
+        """
+        resolution_options = []
+        known_option = None
+        dot_index = file_name.rfind('.')
+
+        while dot_index != -1:
+            package_part = file_name[:dot_index]
+            version_part = file_name[dot_index + 1:]
 
+            if NuGetVersion.is_normalized(version_part):
+                resolution_options.append(PackageDefinition(package_part, version_part))
+                if package_id_index is not None and package_part in package_id_index:
+                    known_option = resolution_options[-1]
+                    break
 
+            dot_index = file_name.rfind('.', 0, dot_index)
+
+        if Instrumentation.ENABLED:
+            # every dot from the right down to the known id, or all of them, is tried as the split between the id and the version
+            tried = file_name.count('.', dot_index) if known_option is not None else file_name.count('.')
+            Instrumentation.increment("packagedefinition.from_request_url.dot_positions_tried", tried)
+            if known_option is not None:
+                Instrumentation.increment("packagedefinition.from_request_url.resolved_by.known_package_id")
+            elif resolution_options:
+                Instrumentation.increment("packagedefinition.from_request_url.resolved_by.file_name")
+
+        return [known_option] if known_option is not None else resolution_options[::-1]
+
+    @staticmethod
+    def may_be_package_url(request_url: str) -> bool:
+        """Cheaply tells whether the url's path could end in .nupkg, without parsing it.
+
+        The path is part of the raw string, except that urlparse drops tabs and newlines anywhere in the url,
+        so those urls are left to the full check.
+        """
+        return PackageDefinition.NUGET_EXTENSION in request_url.lower() or \
+            "\t" in request_url or "\r" in request_url or "\n" in request_url
+
+    @staticmethod
+    def is_nuget_exe_url(request_url: str) -> bool:
+        return request_url.lower().endswith(PackageDefinition.NUGET_EXE_URL_ENDING)
+
+    @staticmethod
+    def from_request_urls(request_urls: Iterable[str], package_id_index: Optional[PackageIdIndex] = None, return_ambiguous: bool = False) -> tuple:
+        """Static method to resolve a column of request urls (see Columns) into parallel package id and version columns.
+
+        Each row gets the first resolution option from_request_url returns, or None for both columns when the url doesn't resolve.
+        The work is shared across the batch: each distinct url is parsed once, and urls differing only in
+        their host or in a query without packageVersion share one resolution of their path. With
+        return_ambiguous, a third column tells the rows that had more than one option.
+        package_id_index is passed on as to from_request_url.
+        """
+        request_urls = Columns.to_list(request_urls)
+
+        unresolved = (None, None, False)
+        resolved: dict[str, tuple[Optional[str], Optional[str], bool]] = {}
+        resolved_paths: dict[tuple[str, Optional[str]], tuple] = {}
+        package_ids: list[Optional[str]] = []
+        package_versions: list[Optional[str]] = []
+        ambiguous: list[bool] = []
+
+        # bind the lookups once instead of on every row
+        get_resolved = resolved.get
+        append_id = package_ids.append
+        append_version = package_versions.append
+        append_ambiguous = ambiguous.append
+
+        for request_url in request_urls:
+            # nulls in a column come through as None or NaN
+            result = get_resolved(request_url) if isinstance(request_url, str) else unresolved
+            if result is None:
+                entry = PackageDefinition._resolve_in_batch(request_url, package_id_index, resolved_paths)
+                options = entry[0]
+                result = (options[0].package_id, options[0].package_version, len(options) > 1) if options else unresolved
+                resolved[request_url] = result
+
+            append_id(result[0])
+            append_version(result[1])
+            append_ambiguous(result[2])
+
+        if Instrumentation.ENABLED:
+            Instrumentation.increment("packagedefinition.from_request_urls.ambiguous", sum(ambiguous))
+
+        return (package_ids, package_versions, ambiguous) if return_ambiguous else (package_ids, package_versions)
+
+    @staticmethod
+    def _resolve_in_batch(request_url: str, package_id_index: Optional[PackageIdIndex], resolved_paths: dict) -> tuple:
+        """Returns the cache entry of a url for from_request_urls, resolving its path once per batch."""
+        if not request_url or not PackageDefinition.may_be_package_url(request_url):
+            return (None,)
+
+        key = request_url if package_id_index is None else (request_url, package_id_index)
+        entry = PackageDefinition._REQUEST_URL_CACHE.get(key)
+        if entry is not None:
+            return entry
+
+        parsed = urllib.parse.urlparse(request_url)
+        # only the path and the packageVersion parameter matter to the resolution
+        path_key = (parsed.path, PackageDefinition._version_parameter(parsed.query))
+        entry = resolved_paths.get(path_key)
+        if entry is None:
+            entry = resolved_paths[path_key] = PackageDefinition._cache_entry(
+                PackageDefinition._resolve_request_url(request_url, package_id_index, parsed))
+        PackageDefinition._REQUEST_URL_CACHE.put(key, entry)
+        return entry
+
+    @staticmethod
+    def _version_parameter(query: str) -> Optional[str]:
+        # parse_qs percent-decodes the keys, so a query can name the parameter without spelling it out
+        if not query:
+            return None
+        version_param_list = urllib.parse.parse_qs(query).get(PackageDefinition.VERSION_QUERY_PARAMETER)
+        return version_param_list[0] if version_param_list is not None else None
 
     @staticmethod
     def from_nuget_exe_url(request_url) -> Optional[PackageDefinition]:
-        if not request_url or not request_url.lower().endswith(PackageDefinition.NUGET_EXE_URL_ENDING):
+        if not request_url or not PackageDefinition.is_nuget_exe_url(request_url):
             return None
 
+        entry = PackageDefinition._NUGET_EXE_URL_CACHE.get(request_url)
+        if entry is None:
+            entry = (PackageDefinition._from_nuget_exe_url(request_url),)
+            PackageDefinition._NUGET_EXE_URL_CACHE.put(request_url, entry)
+        return entry[0]
+
+    @staticmethod
+    def _from_nuget_exe_url(request_url) -> Optional[PackageDefinition]:
+
         # origin path example: /artifacts/win-x86-commandline/v5.9.1/nuget.exe
         # new CDN logs request path, not origin path:  /win-x86-commandline/v5.11.6/nuget.exe
 
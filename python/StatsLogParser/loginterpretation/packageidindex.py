@@ -0,0 +1,100 @@
+from __future__ import annotations
+from array import array
+from typing import Iterable, Optional
+import mmap
+import struct
+import sys
+
+class PackageIdIndex:
+    """A sorted, case-insensitive set of known package ids that can be memory-mapped from a file.
+
+    The file holds a header, count + 1 little-endian uint64 offsets, and the lowercased UTF-8 ids back to back,
+    sorted by their bytes. Lookups are a binary search over the offsets, reading only the ids they compare
+    with, so opening an index of millions of ids costs no parsing and only the pages touched stay resident.
+    """
+
+    MAGIC = b"NGPKGIDX"
+    _HEADER = struct.Struct("<8sQ")
+
+    def __init__(self, buffer) -> None:
+        magic, count = PackageIdIndex._HEADER.unpack_from(buffer, 0)
+        if magic != PackageIdIndex.MAGIC:
+            raise ValueError("Not a package id index")
+
+        self._buffer = buffer
+        self._count = count
+        offsets_start = PackageIdIndex._HEADER.size
+        self._blob_start = offsets_start + (count + 1) * 8
+
+        offsets = memoryview(buffer)[offsets_start:self._blob_start]
+        if sys.byteorder == "little":
+            self._offsets = offsets.cast("Q")
+        else:
+            self._offsets = array("Q", offsets.tobytes())
+            self._offsets.byteswap()
+
+    @staticmethod
+    def to_bytes(package_ids: Iterable[str]) -> bytes:
+        """Serializes the distinct ids, lowercased, in the index file format."""
+        encoded = sorted({package_id.strip().lower().encode("utf-8") for package_id in package_ids if package_id and package_id.strip()})
+
+        offsets = array("Q", [0])
+        for package_id in encoded:
+            offsets.append(offsets[-1] + len(package_id))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+
+        return PackageIdIndex._HEADER.pack(PackageIdIndex.MAGIC, len(encoded)) + offsets.tobytes() + b"".join(encoded)
+
+    @staticmethod
+    def write(path: str, package_ids: Iterable[str]) -> None:
+        with open(path, "wb") as file:
+            file.write(PackageIdIndex.to_bytes(package_ids))
+
+    @staticmethod
+    def from_ids(package_ids: Iterable[str]) -> PackageIdIndex:
+        """Builds an index in memory."""
+        return PackageIdIndex(PackageIdIndex.to_bytes(package_ids))
+
+    @staticmethod
+    def open(path: str) -> PackageIdIndex:
+        """Memory-maps an index file written by write."""
+        with open(path, "rb") as file:
+            return PackageIdIndex(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        # the offsets view has to be released before the map can be closed
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> PackageIdIndex:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, package_id: Optional[str]) -> bool:
+        if not package_id:
+            return False
+
+        key = package_id.strip().lower().encode("utf-8")
+        offsets = self._offsets
+        buffer = self._buffer
+        blob_start = self._blob_start
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            # slicing bytes or an mmap copies just this id
+            candidate = buffer[blob_start + offsets[middle]:blob_start + offsets[middle + 1]]
+            if candidate == key:
+                return True
+            if candidate < key:
+                low = middle + 1
+            else:
+                high = middle
+        return False
@@ -0,0 +1,482 @@
+# Generated by loginterpretation.rulecompiler from knownclients.yaml and the ua_parser rules. Do not edit.
+
+KNOWN_CLIENTS_YAML_SHA256 = 'b5f4390fb91e5a7a58fc93241266f88489f45b809b39a3f15a2835212c80e386'
+
+KNOWN_CLIENTS_RULES = [
+    ('(NuGet[ +]MSBuild[ +]Task)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet MSBuild Task', None, None),
+    ('(NuGet[ +].NET[ +]Core[ +]MSBuild[ +]Task)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet .NET Core MSBuild Task', None, None),
+    ('(NuGet[ +]Desktop[ +]MSBuild[ +]Task)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Desktop MSBuild Task', None, None),
+    ('(NuGet[ +]Client[ +]V3)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Client V3', None, None),
+    ('(NuGet[ +]VS[ +]PowerShell[ +]Console)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet VS PowerShell Console', None, None),
+    ('(NuGet[ +]VS[ +]Packages[ +]Dialog[ +]-[ +]Solution)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet VS Packages Dialog - Solution', None, None),
+    ('(NuGet[ +]VS[ +]Packages[ +]Dialog)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet VS Packages Dialog - Solution', None, None),
+    ('(NuGet[ +]Add[ +]Package[ +]Dialog)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Add Package Dialog', None, None),
+    ('(NuGet[ +]Package[ +]Manager[ +]Console)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Package Manager Console', None, None),
+    ('(NuGet[ +]Visual[ +]Studio[ +]Extension)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Visual Studio Extension', None, None),
+    ('(Package-Installer)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Package-Installer', None, None),
+    ('(NuGet[ +]Command[ +]Line)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Command Line', None, None),
+    ('(NuGet[ +]xplat)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Cross-Platform Command Line', None, None),
+    ('(NuGet[ +]Core)/?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet', None, None),
+    ('(WebMatrix) (\\d+)\\.(\\d+)\\.?(\\d+)?', 'WebMatrix', None, None),
+    ('(NuGet[ +]Package[ +]Explorer[ +]Metro)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Package Explorer Metro', None, None),
+    ('(NuGet[ +]Package[ +]Explorer)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet Package Explorer', None, None),
+    ('(JetBrains[ +]TeamCity) (\\d+)\\.(\\d+)\\.?(\\d+)?', 'JetBrains TeamCity', None, None),
+    ('(ReSharperPlatformVs10)/?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'JetBrains ReSharper Platform VS2010', None, None),
+    ('(ReSharperPlatformVs11)/?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'JetBrains ReSharper Platform VS2012', None, None),
+    ('(ReSharperPlatformVs12)/?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'JetBrains ReSharper Platform VS2013', None, None),
+    ('(ReSharperPlatformVs14)/?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'JetBrains ReSharper Platform VS2015', None, None),
+    ('(ReSharper)/(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'JetBrains ReSharper', None, None),
+    ('(dotPeek)/(\\d+)\\.(\\d+)\\.(\\d+)\\.?(\\d+)?\\)', 'JetBrains dotPeek', None, None),
+    ('(ReSharper[ +]Extension[ +]Manager)/(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'JetBrains ReSharper Extension Manager', None, None),
+    ('(Nexus)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Sonatype Nexus', None, None),
+    ('(Artifactory)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'JFrog Artifactory', None, None),
+    ('(MyGet)/?(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'MyGet', None, None),
+    ('(ProGet)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Inedo ProGet', None, None),
+    ('(Paket)/?(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'Paket', None, None),
+    ('(Bonsai)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Bonsai', None, None),
+    ('(Xamarin[ +]Studio)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Xamarin Studio', None, None),
+    ('(MonoDevelop)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'MonoDevelop', None, None),
+    ('(MonoDevelop-Unity)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'MonoDevelop', None, None),
+    ('(SharpDevelop)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'SharpDevelop', None, None),
+    ('(Microsoft_.NET_Development_Utility)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'DNX Utility', None, None),
+    ('(NuGet[ +]Shim)/?(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'NuGet Shim', None, None),
+    ('(WindowsPowerShell)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Windows PowerShell', None, None),
+    ('Mozilla.*(PowerShell)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'PowerShell Core', None, None),
+    ('(Fiddler)/?(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'Fiddler', None, None),
+    ('(curl)/?(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'curl', None, None),
+    ('(Java)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Java', None, None),
+    ('(NuGet[ +]Test[ +]Client)/?(\\d+)?\\.?(\\d+)?\\.?(\\d+)?', 'NuGet Test Client', None, None),
+    ('(Cake[ +]NuGet[ +]Client)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Cake NuGet Client', None, None),
+    ('(Cake)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Cake', None, None),
+    ('(NuGet[ +]VS[ +]VSIX)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet VS VSIX', None, None),
+    ('(Xamarin[ +]Updater).*?\\(Version: (\\d+)\\.(\\d+)\\.?(\\d+)?', 'Xamarin Updater', None, None),
+    ('(vsts-task-installer)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'vsts-task-installer', None, None),
+    ('(Checkmarx-NugetSourceCodePriorityCollector)', 'Checkmarx NugetSourceCodePriorityCollector', None, None),
+    ('(Checkmarx-NugetShaCollector)', 'Checkmarx NugetShaCollector', None, None),
+    ('(Checkmarx-NugetDllShaCollector)', 'Checkmarx NugetDllShaCollector', None, None),
+    ('(Checkmarx-SourceCodeDownloader)', 'Checkmarx SourceCodeDownloader', None, None),
+    ('(AzureArtifacts)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Azure artifacts', None, None),
+    ('(Bazel)/.*?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Bazel', None, None),
+    ('(Visual[ +]Studio)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'Visual Studio', None, None),
+    ('(NuGetMirror)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGetMirror', None, None),
+    ('(BaGet)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'BaGet', None, None),
+    ('(NuGet)/?(\\d+)\\.(\\d+)\\.?(\\d+)?', 'NuGet', None, None),
+    ('(GetNuTool)/(\\d+)\\.(\\d+)\\.?(\\d+)?', 'GetNuTool', None, None),
+]
+
+KNOWN_CLIENTS_LITERALS = [
+    frozenset({'NuGet MSBuild Task/', 'NuGet MSBuild+Task/', 'NuGet+MSBuild Task/', 'NuGet+MSBuild+Task/'}),
+    frozenset({'NET Core MSBuild Task', 'NET Core MSBuild+Task', 'NET Core+MSBuild Task', 'NET Core+MSBuild+Task', 'NET+Core MSBuild Task', 'NET+Core MSBuild+Task', 'NET+Core+MSBuild Task', 'NET+Core+MSBuild+Task'}),
+    frozenset({'NuGet Desktop MSBuild Task/', 'NuGet Desktop MSBuild+Task/', 'NuGet Desktop+MSBuild Task/', 'NuGet Desktop+MSBuild+Task/', 'NuGet+Desktop MSBuild Task/', 'NuGet+Desktop MSBuild+Task/', 'NuGet+Desktop+MSBuild Task/', 'NuGet+Desktop+MSBuild+Task/'}),
+    frozenset({'NuGet Client V3/', 'NuGet Client+V3/', 'NuGet+Client V3/', 'NuGet+Client+V3/'}),
+    frozenset({'NuGet VS PowerShell Console/', 'NuGet VS PowerShell+Console/', 'NuGet VS+PowerShell Console/', 'NuGet VS+PowerShell+Console/', 'NuGet+VS PowerShell Console/', 'NuGet+VS PowerShell+Console/', 'NuGet+VS+PowerShell Console/', 'NuGet+VS+PowerShell+Console/'}),
+    frozenset({'NuGet VS Packages Dialog - Solution/', 'NuGet VS Packages Dialog -+Solution/', 'NuGet VS Packages Dialog+- Solution/', 'NuGet VS Packages Dialog+-+Solution/', 'NuGet VS Packages+Dialog - Solution/', 'NuGet VS Packages+Dialog -+Solution/', 'NuGet VS Packages+Dialog+- Solution/', 'NuGet VS Packages+Dialog+-+Solution/', 'NuGet VS+Packages Dialog - Solution/', 'NuGet VS+Packages Dialog -+Solution/', 'NuGet VS+Packages Dialog+- Solution/', 'NuGet VS+Packages Dialog+-+Solution/', 'NuGet VS+Packages+Dialog - Solution/', 'NuGet VS+Packages+Dialog -+Solution/', 'NuGet VS+Packages+Dialog+- Solution/', 'NuGet VS+Packages+Dialog+-+Solution/', 'NuGet+VS Packages Dialog - Solution/', 'NuGet+VS Packages Dialog -+Solution/', 'NuGet+VS Packages Dialog+- Solution/', 'NuGet+VS Packages Dialog+-+Solution/', 'NuGet+VS Packages+Dialog - Solution/', 'NuGet+VS Packages+Dialog -+Solution/', 'NuGet+VS Packages+Dialog+- Solution/', 'NuGet+VS Packages+Dialog+-+Solution/', 'NuGet+VS+Packages Dialog - Solution/', 'NuGet+VS+Packages Dialog -+Solution/', 'NuGet+VS+Packages Dialog+- Solution/', 'NuGet+VS+Packages Dialog+-+Solution/', 'NuGet+VS+Packages+Dialog - Solution/', 'NuGet+VS+Packages+Dialog -+Solution/', 'NuGet+VS+Packages+Dialog+- Solution/', 'NuGet+VS+Packages+Dialog+-+Solution/'}),
+    frozenset({'NuGet VS Packages Dialog/', 'NuGet VS Packages+Dialog/', 'NuGet VS+Packages Dialog/', 'NuGet VS+Packages+Dialog/', 'NuGet+VS Packages Dialog/', 'NuGet+VS Packages+Dialog/', 'NuGet+VS+Packages Dialog/', 'NuGet+VS+Packages+Dialog/'}),
+    frozenset({'NuGet Add Package Dialog/', 'NuGet Add Package+Dialog/', 'NuGet Add+Package Dialog/', 'NuGet Add+Package+Dialog/', 'NuGet+Add Package Dialog/', 'NuGet+Add Package+Dialog/', 'NuGet+Add+Package Dialog/', 'NuGet+Add+Package+Dialog/'}),
+    frozenset({'NuGet Package Manager Console/', 'NuGet Package Manager+Console/', 'NuGet Package+Manager Console/', 'NuGet Package+Manager+Console/', 'NuGet+Package Manager Console/', 'NuGet+Package Manager+Console/', 'NuGet+Package+Manager Console/', 'NuGet+Package+Manager+Console/'}),
+    frozenset({'NuGet Visual Studio Extension/', 'NuGet Visual Studio+Extension/', 'NuGet Visual+Studio Extension/', 'NuGet Visual+Studio+Extension/', 'NuGet+Visual Studio Extension/', 'NuGet+Visual Studio+Extension/', 'NuGet+Visual+Studio Extension/', 'NuGet+Visual+Studio+Extension/'}),
+    frozenset({'Package-Installer/'}),
+    frozenset({'NuGet Command Line/', 'NuGet Command+Line/', 'NuGet+Command Line/', 'NuGet+Command+Line/'}),
+    frozenset({'NuGet xplat/', 'NuGet+xplat/'}),
+    frozenset({'NuGet Core', 'NuGet+Core'}),
+    frozenset({'WebMatrix '}),
+    frozenset({'NuGet Package Explorer Metro/', 'NuGet Package Explorer+Metro/', 'NuGet Package+Explorer Metro/', 'NuGet Package+Explorer+Metro/', 'NuGet+Package Explorer Metro/', 'NuGet+Package Explorer+Metro/', 'NuGet+Package+Explorer Metro/', 'NuGet+Package+Explorer+Metro/'}),
+    frozenset({'NuGet Package Explorer/', 'NuGet Package+Explorer/', 'NuGet+Package Explorer/', 'NuGet+Package+Explorer/'}),
+    frozenset({'JetBrains TeamCity ', 'JetBrains+TeamCity '}),
+    frozenset({'ReSharperPlatformVs10'}),
+    frozenset({'ReSharperPlatformVs11'}),
+    frozenset({'ReSharperPlatformVs12'}),
+    frozenset({'ReSharperPlatformVs14'}),
+    frozenset({'ReSharper/'}),
+    frozenset({'dotPeek/'}),
+    frozenset({'ReSharper Extension Manager/', 'ReSharper Extension+Manager/', 'ReSharper+Extension Manager/', 'ReSharper+Extension+Manager/'}),
+    frozenset({'Nexus/'}),
+    frozenset({'Artifactory/'}),
+    frozenset({'MyGet'}),
+    frozenset({'ProGet/'}),
+    frozenset({'Paket'}),
+    frozenset({'Bonsai/'}),
+    frozenset({'Xamarin Studio/', 'Xamarin+Studio/'}),
+    frozenset({'MonoDevelop/'}),
+    frozenset({'MonoDevelop-Unity/'}),
+    frozenset({'SharpDevelop/'}),
+    frozenset({'NET_Development_Utility'}),
+    frozenset({'NuGet Shim', 'NuGet+Shim'}),
+    frozenset({'WindowsPowerShell/'}),
+    frozenset({'PowerShell/'}),
+    frozenset({'Fiddler'}),
+    frozenset({'curl'}),
+    frozenset({'Java/'}),
+    frozenset({'NuGet Test Client', 'NuGet Test+Client', 'NuGet+Test Client', 'NuGet+Test+Client'}),
+    frozenset({'Cake NuGet Client/', 'Cake NuGet+Client/', 'Cake+NuGet Client/', 'Cake+NuGet+Client/'}),
+    frozenset({'Cake/'}),
+    frozenset({'NuGet VS VSIX/', 'NuGet VS+VSIX/', 'NuGet+VS VSIX/', 'NuGet+VS+VSIX/'}),
+    frozenset({'Xamarin Updater', 'Xamarin+Updater'}),
+    frozenset({'vsts-task-installer/'}),
+    frozenset({'Checkmarx-NugetSourceCodePriorityCollector'}),
+    frozenset({'Checkmarx-NugetShaCollector'}),
+    frozenset({'Checkmarx-NugetDllShaCollector'}),
+    frozenset({'Checkmarx-SourceCodeDownloader'}),
+    frozenset({'AzureArtifacts/'}),
+    frozenset({'Bazel/'}),
+    frozenset({'Visual Studio/', 'Visual+Studio/'}),
+    frozenset({'NuGetMirror/'}),
+    frozenset({'BaGet/'}),
+    frozenset({'NuGet'}),
+    frozenset({'GetNuTool/'}),
+]
+
+DEFAULT_RULES_SHA256 = '3779d9cbe061eca46d12c5a577d7dbb7538e2a28499af235a5492576f8b8843f'
+
+DEFAULT_LITERALS = [
+    frozenset({'GeoEvent Server '}),
+    frozenset({'ArcGIS Pro'}),
+    frozenset({'ArcGIS Client Using WinInet'}),
+    frozenset({'OperationsDashboard-Windows-'}),
+    frozenset({'arcgisearth/'}),
+    frozenset({'phone/'}),
+    frozenset({'arcgis-explorer/'}),
+    frozenset({'arcgis-aurora/', 'arcgis-collector/'}),
+    frozenset({'arcgis-workforce/'}),
+    frozenset({'Collector-Android-', 'Collector-iOS-', 'Explorer-Android-', 'Explorer-iOS-', 'Workforce-Android-', 'Workforce-iOS-'}),
+    frozenset({' CFNetwork'}),
+    frozenset({'ArcGISRuntime-Android/', 'ArcGISRuntime-NET/', 'ArcGISRuntime-Qt/', 'ArcGISRuntime-iOS/'}),
+    frozenset({'ArcGIS.Android-', 'ArcGIS.Android.', 'ArcGIS.NET-', 'ArcGIS.NET.', 'ArcGIS.Qt-', 'ArcGIS.Qt.', 'ArcGIS.iOS-', 'ArcGIS.iOS.', 'ArcGISAndroid-', 'ArcGISAndroid.', 'ArcGISNET-', 'ArcGISNET.', 'ArcGISQt-', 'ArcGISQt.', 'ArcGISiOS-', 'ArcGISiOS.'}),
+    frozenset({'ArcGIS.Runtime.Qt.'}),
+    frozenset({' CFNetwork'}),
+    frozenset({' CFNetwork'}),
+    frozenset({' CFNetwork'}),
+    frozenset({'TopPodcastsPro/'}),
+    frozenset({'MusicDownloaderLite/'}),
+    frozenset({' CFNetwork'}),
+    frozenset({' CFNetwork'}),
+    frozenset({' CFNetwork'}),
+    frozenset({'Luminary/'}),
+    frozenset({'espn.go'}),
+    frozenset({'espnradio.com'}),
+    frozenset({'ESPN APP'}),
+    frozenset({'audioboom.com'}),
+    frozenset({' Rivo RHYTHM'}),
+    frozenset({'CFNetwork'}),
+    frozenset({'Pingdom.com_bot_version_'}),
+    frozenset({'PingdomTMS/'}),
+    frozenset({'PingdomPageSpeed/'}),
+    frozenset({' PTST/'}),
+    frozenset({'X11; Datanyze; Linux'}),
+    frozenset({'NewRelicPinger/'}),
+    frozenset({'Tableau/'}),
+    frozenset({' CreativeCloud/'}),
+    frozenset({'Salesforce'}),
+    frozenset({'(StatusCake)'}),
+    frozenset({'facebookexternalhit/'}),
+    frozenset({'/+/web/snippet'}),
+    frozenset({'via ggpht.com GoogleImageProxy'}),
+    frozenset({'YahooMailProxy; https://help.yahoo.com/kb/yahoo-mail-proxy-SLN28749.html'}),
+    frozenset({'Twitterbot/'}),
+    frozenset({'Axtaris', 'Bot', 'Isara', 'Nutch', 'ShopSalad', 'Spider', 'Tailsweep', 'bot', 'fetchurl', 'spider'}),
+    frozenset({'008', 'Altresium', 'Argus', 'BaiduMobaider', 'BoardReader', 'DNSGroup', 'DataparkSearch', 'EDI', 'Goodzer', 'Grub', 'INGRID', 'Infohelfer', 'LOOQ', 'LinkedInBot', 'Nutch', 'OgScrper', 'Pandora', 'PathDefender', 'Peew', 'PostPost', 'Steeler', 'Twitterbot', 'VSE', 'WebCrunch', 'WebZIP', 'Y!J-BR', 'YahooSeeker', 'envolk', 'sproose', 'wminer'}),
+    frozenset({' MSIECrawler'}),
+    frozenset({'DAVdroid/'}),
+    frozenset({'Apache-HttpClient', 'Go-http-client', 'Google-HTTP-Java-Client', 'HttpMonitor', 'JNLP', 'PostmanRuntime', 'Python-urllib', 'TLSProber', 'WinHTTP', 'aihttp', 'axios', 'http%20client', 'okhttp', 'reqwest', 'scalaj-http', 'unirest-java', 'unirest-net', 'unirest-nodejs', 'unirest-php', 'unirest-python', 'unirest-ruby'}),
+    frozenset({'+https://www'}),
+    frozenset({' Link Sleuth', '.org_bot', '123metaspider-Bot', '1470.net crawler', '50.nu', '8bo Crawler Bot', 'Aboundex', 'Accoona-', 'AdsBot-Google', 'AppEngine-Google', 'ArcGIS Hub Indexer', 'Ask Jeeves', 'BUbiNG', 'BaiDuSpider-', 'BaiDuspider-', 'BaiduSpider-', 'Baiduspider-', 'BingPreview', 'BlogBridge', 'Bloglovin', 'BoardReader Blog Indexer', 'BoardReader Favicon Fetcher', 'BotName/$BotVersion', 'BotSeer', 'CRAWL-E', 'CSimpleSpider', 'Catchpoint', 'Charlotte', 'Checklinks', 'Cityreview Robot', 'Comodo HTTP(S) Crawler', 'Comodo-Webinspector-Crawler', 'ConveraCrawler', 'CrawlConvera', 'CrawlDaddy', 'CrawlFire', 'Daumoa', 'Feed Seeker Bot', 'Feedbin', 'Finderbots', 'Flamingo_SearchEngine', 'FollowSite Bot', 'Genieo', 'GomezAgent', 'Google SketchUp', 'Googlebot', 'HiddenMarket', 'HooWWWer', 'ICC-Crawler', 'IP2', 'Icarus6j', 'IconSurf', 'IlTrovatore', 'Index crawler', 'InfuzApp', 'Innovazion Crawler', 'InternetArchive', 'Job Roboter', 'KaloogaBot', 'KiwiStatus Spider', 'Kraken', 'Kurzor', 'LEIA', 'LesnikBot', 'Lijit Crawler', 'Linguee Bot', 'LinkAider', 'LinkedInBot', 'Lite Bot', 'Llaut', 'MJ12bot', 'Mail.RU_Bot', 'Mediapartners-Google', 'Microsoft ', 'Mtps Feed Aggregation System', 'NING', 'Netvibes', 'NewsGator', 'Nutch', 'Nymesis', 'OOZBOT', 'ObjectsSearch', 'OgScrper', 'Orbiter', 'PHPCrawl', 'PagePeeker', 'PagesInventory', 'PaxleFramework', 'Peeplo Screenshot Bot', 'PlantyNet_WebRobot', 'Pompos', 'QuerySeekerSpider', 'Qwantify', 'Read%20Later', 'Reaper', 'RedCarpet', 'Retreiver', 'Riddler', 'Rival IQ', 'SEOstats', 'ScollSpider', 'Scrapy', 'Scrubby', 'SemrushBot', 'SimplePie', 'SimpleRSS', 'Simpy', 'SiteCat Webbot', 'SiteCon', 'Slack-ImgProxy', 'Slackbot-LinkExpanding', 'Slurp', 'Speedy Spider', 'Squrl Java', 'Stringer', 'TheUsefulbot', 'ThumbShotsBot', 'Thumbshots.ru', 'Tiny Tiny RSS', 'Trends Crawler', 'Twitterbot', 'URL2PNG', 'USyd-NLP-Spider', 'Vagabondo', 'VoilaBot', 'Votay bot', 'WASALive', 'WIRE', 'WeSEE:', 'Web-sniffer', 'WebThumb', 'WhatWeb', 'WhatsApp', 'WordPress', 'Wotbox', 'Xerka ', 'YahooSeeker', 'Yandex', 'Yeti', 'YodaoBot', 'YottaaMonitor', 'Yowedo', 'Zao', 'ZeBot_www.ze.bz', 'ZooShot', 'ZyBorg', 'altavista', 'archiver', 'baiDuSpider-', 'baiDuspider-', 'baiduSpider-', 'baiduspider-', 'bingbot', 'blitzbot', 'boitho', 'charlotte', 'clumboot', 'favicon', 'findlinks', 'furlbot', 'gigabot', 'gonzo1', 'grub-client', 'gsa-crawler', 'heritrix', 'holmes', 'htdig', 'ichiro', 'jbot', 'larbin', 'lycos', 'masidani_bot', 'masscan', 'mogimogi', 'mozDex', 'msnbot', 'msrbot', 'netresearch', 'scooter', 'searchsight', 'seekbot', 'semanticdiscovery', 'snappy', 'vortex', 'voyager', 'www.almaden.ibm.com', 'yacy'}),
+    frozenset({'Boto', 'JetS3t', 'aws-', 's3fs'}),
+    frozenset({'FME/'}),
+    frozenset({'QGIS/'}),
+    frozenset({'JOSM/'}),
+    frozenset({'Tygron Platform ('}),
+    frozenset({'[FBAN/MessengerForiOS;FBAV/', '[FB_IAB/MESSENGER;FBAV/'}),
+    frozenset({';FBAV/'}),
+    frozenset({'[FB'}),
+    frozenset({'Archiver', 'Bot', 'Crawl', 'Indexer', 'Scraper', 'Spider', 'archiver', 'bot', 'crawl', 'indexer', 'scraper', 'spider'}),
+    frozenset({'Bot', 'bot'}),
+    frozenset({'CRAWL', 'CRAWl', 'CRAwL', 'CRAwl', 'CRaWL', 'CRaWl', 'CRawL', 'CRawl', 'CrAWL', 'CrAWl', 'CrAwL', 'CrAwl', 'CraWL', 'CraWl', 'CrawL', 'Crawl', 'SPIDER', 'SPIDEr', 'SPIDeR', 'SPIDer', 'SPIdER', 'SPIdEr', 'SPIdeR', 'SPIder', 'SPiDER', 'SPiDEr', 'SPiDeR', 'SPiDer', 'SPidER', 'SPidEr', 'SPideR', 'SPider', 'Scrape', 'SpIDER', 'SpIDEr', 'SpIDeR', 'SpIDer', 'SpIdER', 'SpIdEr', 'SpIdeR', 'SpIder', 'SpiDER', 'SpiDEr', 'SpiDeR', 'SpiDer', 'SpidER', 'SpidEr', 'SpideR', 'Spider', 'cRAWL', 'cRAWl', 'cRAwL', 'cRAwl', 'cRaWL', 'cRaWl', 'cRawL', 'cRawl', 'crAWL', 'crAWl', 'crAwL', 'crAwl', 'craWL', 'craWl', 'crawL', 'crawl', 'sPIDER', 'sPIDEr', 'sPIDeR', 'sPIDer', 'sPIdER', 'sPIdEr', 'sPIdeR', 'sPIder', 'sPiDER', 'sPiDEr', 'sPiDeR', 'sPiDer', 'sPidER', 'sPidEr', 'sPideR', 'sPider', 'scrape', 'spIDER', 'spIDEr', 'spIDeR', 'spIDer', 'spIdER', 'spIdEr', 'spIdeR', 'spIder', 'spiDER', 'spiDEr', 'spiDeR', 'spiDer', 'spidER', 'spidEr', 'spideR', 'spider'}),
+    frozenset({'HbbTV/'}),
+    frozenset({'Camino/', 'Chimera/', 'SeaMonkey/', 'Waterfox/'}),
+    frozenset({'SailfishBrowser/'}),
+    frozenset({'[Pinterest/'}),
+    frozenset({'Pinterest for Android Tablet/', 'Pinterest for Android/', 'Pinterest/'}),
+    frozenset({'Instagram'}),
+    frozenset({'Flipboard'}),
+    frozenset({'Flipboard-Briefing'}),
+    frozenset({'Onefootball/Android'}),
+    frozenset({'Snapchat/'}),
+    frozenset({'Twitter for iPad', 'Twitter for iPhone', 'TwitterAndroid'}),
+    frozenset({'Mozilla'}),
+    frozenset({'AspiegelBot', 'PetalBot'}),
+    frozenset({'AspiegelBot', 'PetalBot'}),
+    frozenset({' Basilisk/'}),
+    frozenset({'PaleMoon/'}),
+    frozenset({'Fennec/'}),
+    frozenset({'Fennec/'}),
+    frozenset({'Fennec/'}),
+    frozenset({'Firefox/'}),
+    frozenset({'Minefield/', 'Namoroka/', 'Shiretoko/'}),
+    frozenset({'Firefox/'}),
+    frozenset({'Firefox/'}),
+    frozenset({'Firefox-'}),
+    frozenset({'Firefox-'}),
+    frozenset({'Minefield/', 'Namoroka/', 'Shiretoko/'}),
+    frozenset({'Tablet browser '}),
+    frozenset({'MozillaDeveloperPreview/'}),
+    frozenset({'FxiOS/'}),
+    frozenset({'Flock/'}),
+    frozenset({'RockMelt/'}),
+    frozenset({'Navigator/'}),
+    frozenset({'Navigator/'}),
+    frozenset({'Netscape6/'}),
+    frozenset({'MyIBrow/'}),
+    None,
+    frozenset({'Opera Tablet'}),
+    frozenset({'Opera Mini'}),
+    frozenset({'Opera Mobi'}),
+    frozenset({'Opera Mobi'}),
+    frozenset({'Opera Mobi'}),
+    frozenset({'Opera Mobi'}),
+    frozenset({'Version/'}),
+    frozenset({'Mobile Safari'}),
+    frozenset({'Chrome'}),
+    frozenset({'Coast/'}),
+    frozenset({'OPiOS/'}),
+    frozenset({'Chrome/'}),
+    frozenset({'hpwOS/', 'webOS/'}),
+    frozenset({'luakit'}),
+    frozenset({'Snowshoe/'}),
+    frozenset({' Lightning/'}),
+    frozenset({' (Swiftfox)'}),
+    frozenset({' (Swiftfox)'}),
+    frozenset({'rekonq/'}),
+    frozenset({'rekonq'}),
+    frozenset({'Conkeror/', 'conkeror/'}),
+    frozenset({'konqueror/'}),
+    frozenset({'WeTab-Browser'}),
+    frozenset({'Comodo_Dragon/'}),
+    frozenset({'Symphony '}),
+    frozenset({'PLAYSTATION 3'}),
+    frozenset({'PLAYSTATION 3'}),
+    frozenset({'PlayStation Portable'}),
+    frozenset({'PlayStation Vita'}),
+    frozenset({'AppleWebKit'}),
+    frozenset({'Nintendo 3DS'}),
+    frozenset({'Silk/'}),
+    frozenset({'Puffin/'}),
+    frozenset({'Windows Phone '}),
+    frozenset({'EdgA/', 'EdgiOS/'}),
+    frozenset({'OculusBrowser/'}),
+    frozenset({'SamsungBrowser/'}),
+    frozenset({'SznProhlizec/'}),
+    frozenset({'coc_coc_browser/'}),
+    frozenset({'baidubrowser'}),
+    frozenset({'FlyFlow/'}),
+    frozenset({'MxBrowser/'}),
+    frozenset({'Crosswalk/'}),
+    frozenset({'Line/'}),
+    frozenset({'MiuiBrowser/'}),
+    frozenset({'Mint Browser/'}),
+    frozenset({'TopBuzz/'}),
+    frozenset({'Mozilla'}),
+    frozenset({'MQQBrowser/Mini'}),
+    frozenset({'MQQBrowser'}),
+    frozenset({'QQBrowser'}),
+    frozenset({'DuckDuckGo/'}),
+    frozenset({'Tenta/'}),
+    frozenset({'Version/'}),
+    frozenset({'Chrome/'}),
+    frozenset({'CrMo/'}),
+    frozenset({'CriOS/'}),
+    frozenset({'Chrome/'}),
+    frozenset({' Mobile '}),
+    frozenset({'chromeframe/'}),
+    frozenset({'SLP Browser/'}),
+    frozenset({'SE 2.X MetaSr '}),
+    frozenset({'Rackspace Monitoring/'}),
+    frozenset({'PRTG Network Monitor'}),
+    frozenset({'PyAMF/'}),
+    frozenset({'YaBrowser/'}),
+    frozenset({' MRCHROME'}),
+    frozenset({'; AOLBuild '}),
+    frozenset({'Downcast', 'PodCruncher'}),
+    frozenset({' BoxNotes/'}),
+    frozenset({' Mobile'}),
+    frozenset({'Whale/'}),
+    frozenset({'1Password/'}),
+    frozenset({'Ghost/'}),
+    frozenset({' (X11; Linux x86_64)'}),
+    frozenset({'surveyon/'}),
+    frozenset({'Slack_SSB/'}),
+    frozenset({'HipChat'}),
+    frozenset({'ANTGalio/', 'Bunjalloo/', 'Camino/', 'Demeter/', 'Dillo/', 'Electron/', 'Epiphany/', 'Fennec/', 'FireWeb/', 'Flock/', 'Fluid/', 'Fresco/', 'Galeon/', 'Google Earth/', 'GranParadiso/', 'IceWeasel/', 'Iceape/', 'Iceweasel/', 'Iris/', 'Iron/', 'Jasmine/', 'K-Meleon/', 'Kazehakase/', 'Konqueror/', 'Lobo/', 'Lunascape/', 'Lynx/', 'MacOutlook/', 'Maxthon/', 'Midori/', 'NetFront/', 'NetNewsWire/', 'Netfront/', 'Netscape/', 'OktaMobile/', 'OmniWeb/', 'Openwave/', 'Opera Mini/', 'PaleMoon/', 'Raven for Mac/', 'SeaMonkey/', 'Shiira/', 'Sleipnir/', 'Spotify/', 'Sunrise/', 'ThunderBrowse/', 'UP.Browser/', 'Vienna/', 'WebPilot/', 'iCab/'}),
+    frozenset({'SOffice 12', 'icrosoft Office Outlook 12.'}),
+    frozenset({'SOffice 14', 'icrosoft Outlook 14.'}),
+    frozenset({'Microsoft Outlook 15.'}),
+    frozenset({'SOffice 16', 'icrosoft Outlook 16.', 'icrosoft Outlook Mail 16.'}),
+    frozenset({'Microsoft Office Word 2014'}),
+    frozenset({'Outlook-Express/7.0'}),
+    frozenset({'Airmail '}),
+    frozenset({'Thunderbird/'}),
+    frozenset({'Postbox/'}),
+    frozenset({'Barca/', 'BarcaPro/'}),
+    frozenset({'Lotus-Notes/'}),
+    frozenset({'Superhuman'}),
+    frozenset({'Vivaldi/'}),
+    frozenset({'Edg/', 'Edge/'}),
+    frozenset({' Chrome'}),
+    frozenset({'Chrome/'}),
+    frozenset({'Dolphin ', 'Dolphin/INT-', 'DolphinHDCN/'}),
+    frozenset({'HeadlessChrome'}),
+    frozenset({'Evolution/'}),
+    frozenset({'RCM CardDAV plugin/'}),
+    frozenset({'Abrowser/', 'AdobeAIR/', 'Arora/', 'BOLT/', 'Bolt/', 'Camino/', 'Dillo/', 'Dolfin/', 'Dragon/', 'Epiphany/', 'ExchangeServicesClient/', 'ExchangeWebServices/', 'Fennec/', 'Flock/', 'Galeon/', 'Googlebot/', 'GranParadiso/', 'IBrowse/', 'ICE Browser/', 'IceCat/', 'IceWeasel/', 'Iceape/', 'Iceweasel/', 'Iron/', 'Jasmine/', 'K-Meleon/', 'Kazehakase/', 'Konqueror/', 'Lunascape/', 'Lynx/', 'MacAppStore/', 'MailBar/', 'Maxthon/', 'Midori/', 'Minimo/', 'NetFront/', 'NetNewsWire/', 'Netfront/', 'Netscape/', 'Opera Mini/', 'Opera/', 'Orca/', 'Otter/', 'Outlook-iOS-Android/', 'Phoenix/', 'Planetweb/', 'Polaris/', 'QupZilla/', 'SeaMonkey/', 'Shiira/', 'Skyfire/', 'Sleipnir/', 'Space Bison/', 'Stainless/', 'Tizen Browser/', 'Vienna/', 'WebPilot/', 'YahooMobileMail/', 'bingbot/', 'iCab/', 'iTunes/', 'kmail2/', 'mDolphin/', 'qutebrowser/'}),
+    frozenset({'Chrome/', 'Chromium/'}),
+    frozenset({'IEMobile ', 'IEMobile/'}),
+    frozenset({'BacaBerita App/'}),
+    frozenset({'Player FM', 'Pocket Casts', 'bPod'}),
+    frozenset({'AlexaMediaPlayer/', 'VLC/'}),
+    frozenset({'AntennaPod/', 'Banshee/', 'DoggCatcher/', 'ExoPlayerDemo/', 'GoldenPod/', 'Juice/', 'MediaGo/', 'Miro/', 'NSPlayer/', 'Overcast/', 'Peapod/', 'PocketTunes/', 'Podcasts/', 'Podkicker/', 'QuickNews/', 'QuickTime/', 'Radio/', 'Spotify/', 'VLC/', 'WMPlayer/', 'Zune/', 'gPodder/', 'iPodder/', 'okhttp/'}),
+    frozenset({'Liferea/', 'Peapod/'}),
+    frozenset({'Player FM BMID/', 'bPod BMID/'}),
+    frozenset({'Podcast Addict/v', 'PodcastAddict/v'}),
+    frozenset({'Podcast Addict ', 'PodcastAddict '}),
+    frozenset({'Replay AV'}),
+    frozenset({'VOX Music Player'}),
+    frozenset({'CITA RSS Aggregator/'}),
+    frozenset({'Pocket Casts'}),
+    frozenset({'Player FM'}),
+    frozenset({'Clementine ', 'Doppler ', 'FancyMusic ', 'LG Player ', 'MediaMonkey '}),
+    frozenset({'philpodder/'}),
+    frozenset({'BashPodder', 'DoggCatcher', 'MediaGo', 'MediaMonkey', 'Player FM', 'Pocket Casts', 'Spotify'}),
+    frozenset({'QuickTime.'}),
+    frozenset({'Kinoma'}),
+    frozenset({'Fancy Cloud Music '}),
+    frozenset({'EspnDownloadManager'}),
+    frozenset({'ESPN Radio '}),
+    frozenset({'jPodder v', 'podracer v'}),
+    frozenset({'ZDM/'}),
+    frozenset({'BeyondPod ', 'Zune '}),
+    frozenset({'WMPlayer/'}),
+    frozenset({'Lavf'}),
+    frozenset({'RSSRadio'}),
+    frozenset({'RSS_Radio '}),
+    frozenset({'Podkicker '}),
+    frozenset({'HTC Streaming Player '}),
+    frozenset({'Stitcher/iOS'}),
+    frozenset({'Stitcher/Android'}),
+    frozenset({'version '}),
+    frozenset({' VLC for'}),
+    frozenset({'vlc/'}),
+    frozenset({'foobar'}),
+    frozenset({'Clementine'}),
+    frozenset({'amarok/'}),
+    frozenset({'Custom-Feed Reader'}),
+    frozenset({'Crazy Browser ', 'Lunascape ', 'Maemo Browser ', 'SkipStone ', 'Sleipnir ', 'iCab ', 'iRider '}),
+    frozenset({'Android ', 'Jasmine ', 'Lunascape ', 'Microsoft SkyDriveSync ', 'Opera ', 'Polaris ', 'The Bat! ', 'iCab '}),
+    frozenset({'Kindle/'}),
+    frozenset({'Android Donut'}),
+    frozenset({'Android Eclair'}),
+    frozenset({'Android Froyo'}),
+    frozenset({'Android Gingerbread'}),
+    frozenset({'Android Honeycomb'}),
+    frozenset({'XBLWP7'}),
+    frozenset({'Nextcloud'}),
+    frozenset({'mirall/'}),
+    frozenset({'ownCloud-android/'}),
+    frozenset({' (Skype for Business)'}),
+    frozenset({'OpenVAS'}),
+    frozenset({'AnyConnect/'}),
+    frozenset({'compatible; monitis'}),
+    frozenset({'ObigoInternetBrowser'}),
+    frozenset({'Obigo-Browser'}),
+    frozenset({'OBIGO', 'Obigo'}),
+    frozenset({'MAXTHON ', 'Maxthon '}),
+    frozenset({'Maxthon', 'MyIE2', 'Shiira', 'Uzbl'}),
+    frozenset({'BrowseX ('}),
+    frozenset({'NCSA_Mosaic/'}),
+    frozenset({'POLARIS/'}),
+    frozenset({'Embider/'}),
+    frozenset({'BonEcho/'}),
+    frozenset({'TopBuzz com'}),
+    frozenset({'mobilesrepublic'}),
+    frozenset({'TopBuzz com'}),
+    frozenset({' Mobile'}),
+    frozenset({'Version/'}),
+    frozenset({' AppleNews/'}),
+    frozenset({'Version/'}),
+    frozenset({' Safari'}),
+    frozenset({'iPad', 'iPhone', 'iPod'}),
+    frozenset({'Watch'}),
+    frozenset({'.prod.iphone ('}),
+    frozenset({'AvantGo '}),
+    frozenset({'OneBrowser/'}),
+    frozenset({'Avant'}),
+    frozenset({'QtCarBrowser'}),
+    frozenset({'iBrowser/Mini'}),
+    frozenset({'iBrowser/', 'iRAPP/'}),
+    frozenset({'Nokia'}),
+    frozenset({'NokiaBrowser/'}),
+    frozenset({'NokiaBrowser/'}),
+    frozenset({'NokiaBrowser/'}),
+    frozenset({'BrowserNG/'}),
+    frozenset({'Series60/5.0'}),
+    frozenset({'Series60/'}),
+    frozenset({'S40OviBrowser/'}),
+    frozenset({'Nokia'}),
+    frozenset({'RIM Tablet OS '}),
+    frozenset({'Version/'}),
+    frozenset({'BlackBerry', 'Blackberry'}),
+    frozenset({'OmniWeb/v'}),
+    frozenset({'Blazer/'}),
+    frozenset({'Pre/'}),
+    frozenset({'ELinks/'}),
+    frozenset({'ELinks ('}),
+    frozenset({'Links ('}),
+    frozenset({'QtWeb Internet Browser/'}),
+    frozenset({'PhantomJS/'}),
+    frozenset({'AppleWebKit/'}),
+    frozenset({'Version/'}),
+    frozenset({'Safari/'}),
+    frozenset({'OLPC/Update'}),
+    frozenset({'OLPC/Update.'}),
+    frozenset({'SEMC-Browser/'}),
+    frozenset({'Teleca'}),
+    frozenset({'Phantom/V'}),
+    frozenset({'Trident/7.0', 'Trident/8.0'}),
+    frozenset({'Trident/6.0'}),
+    frozenset({'Trident/5.0'}),
+    frozenset({'Trident/4.0'}),
+    frozenset({'Espial/'}),
+    frozenset({'AppleWebKit/'}),
+    frozenset({'Firefox/'}),
+    frozenset({'Firefox/'}),
+    frozenset({'IE '}),
+    frozenset({'python-requests/'}),
+    frozenset({'AHC', 'Apache-CXF', 'Axel', 'CloudCockpitBackend', 'Debian APT-HTTP', 'Go-CF-client', 'HTTPie', 'Jersey', 'Microsoft-CryptoAPI', 'OpenBSD ftp', 'PycURL', 'ReactorNetty', 'SophosAgent', 'SophosUpdateManager', 'Ubuntu APT-HTTP', 'Wget', 'Windows-Update-Agent', 'WindowsPowerShell', 'akka-http', 'aria2', 'axios', 'curl', 'fetch libfetch', 'go-resty', 'got', 'insomnia', 'jupdate', 'lftp', 'libwww-perl', 'urlgrabber', 'wget2', 'x-WebClient'}),
+    frozenset({'cf/'}),
+    frozenset({'sap-leonardo-iot-sdk-nodejs / '}),
+    frozenset({'SAP NetWeaver Application Server (1'}),
+    frozenset({'-HTTPClient'}),
+    frozenset({'go-cli'}),
+    frozenset({'HTTPClient/', 'Java-EurekaClient-Replication/', 'Java-EurekaClient/', 'lua-resty-http/'}),
+    frozenset({'JAEGER_SECURITY', 'Node-oauth', 'SAP CPI', 'Site24x7', 'ping-service', 'sap xsuaa'}),
+    frozenset({'Python/3.'}),
+    frozenset({'Java'}),
+    frozenset({'Java'}),
+    frozenset({'minio-go/v'}),
+    frozenset({'ureq ', 'ureq/'}),
+    frozenset({'http.rb/'}),
+    frozenset({'GuzzleHttp/'}),
+    frozenset({'grab'}),
+    frozenset({'Cyberduck/'}),
+    frozenset({'S3 Browser '}),
+    frozenset({'S3Gof3r'}),
+    frozenset({'ibm-cos-sdk-core/', 'ibm-cos-sdk-java/', 'ibm-cos-sdk-js/', 'ibm-cos-sdk-python/'}),
+    frozenset({'rusoto/'}),
+    frozenset({'rclone/v'}),
+    frozenset({'Roku/DVP-'}),
+    frozenset({'Kurio/'}),
+    frozenset({'Box Sync/', 'Box/'}),
+    frozenset({'ViaFree-', 'Viafree-'}),
+    frozenset({'Transmit/'}),
+    frozenset({'Download Master'}),
+    frozenset({'HTTrack '}),
+    frozenset({'SerenityOS'}),
+]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+from enum import Enum
+from typing import Iterable, Optional
+import urllib.parse
+from .columns import Columns
+from .packagedefinition import PackageDefinition
+from .packageidindex import PackageIdIndex
+
+class RequestKind(Enum):
+    PACKAGE = "package"
+    NUGET_EXE = "nuget.exe"
+    OTHER = "other"
+
+class RequestClassifier:
+    """Tells package downloads, nuget.exe downloads and other requests apart, and resolves the downloads.
+
+    Requests whose url can't contain '.nupkg' or end with '/nuget.exe' are classified from the raw string,
+    without parsing or decoding it; only the remaining ones go through urlparse and the resolvers. Package
+    downloads take precedence over nuget.exe downloads, as when trying from_request_url first.
+    """
+
+    @staticmethod
+    def classify(request_url: str) -> RequestKind:
+        if not request_url or not isinstance(request_url, str):
+            return RequestKind.OTHER
+
+        if PackageDefinition.may_be_package_url(request_url) and \
+                urllib.parse.urlparse(request_url).path.lower().endswith(PackageDefinition.NUGET_EXTENSION):
+            return RequestKind.PACKAGE
+
+        if PackageDefinition.is_nuget_exe_url(request_url):
+            return RequestKind.NUGET_EXE
+
+        return RequestKind.OTHER
+
+    @staticmethod
+    def classify_many(request_urls: Iterable[str]) -> list[RequestKind]:
+        """Classifies a column of request urls (see Columns); nulls are OTHER."""
+        return [RequestClassifier.classify(request_url) for request_url in Columns.to_list(request_urls)]
+
+    @staticmethod
+    def resolve(request_url: str, package_id_index: Optional[PackageIdIndex] = None) -> Optional[PackageDefinition]:
+        """Returns the package a request downloaded, or None when it isn't a download.
+
+        Ambiguous package file names resolve to their first option, as from_request_url orders them, or to
+        the longest known id when an index of package ids is given.
+        """
+        if not request_url or not isinstance(request_url, str):
+            return None
+
+        # from_request_url rules out the urls that can't be packages from the raw string already
+        packages = PackageDefinition.from_request_url(request_url, package_id_index)
+        if packages:
+            return packages[0]
+
+        if PackageDefinition.is_nuget_exe_url(request_url):
+            return PackageDefinition.from_nuget_exe_url(request_url)
+
+        return None
+
+    @staticmethod
+    def resolve_many(request_urls: Iterable[str], package_id_index: Optional[PackageIdIndex] = None) -> tuple[list[Optional[str]], list[Optional[str]]]:
+        """Resolves a column of request urls into parallel package id and version columns, nuget.exe included.
+
+        Packages are resolved by PackageDefinition.from_request_urls, and the remaining rows that are nuget.exe
+        downloads by from_nuget_exe_url; rows that aren't downloads get None in both columns.
+        """
+        request_urls = Columns.to_list(request_urls)
+        package_ids, package_versions = PackageDefinition.from_request_urls(request_urls, package_id_index)
+
+        for row, request_url in enumerate(request_urls):
+            if package_ids[row] is None and isinstance(request_url, str) and PackageDefinition.is_nuget_exe_url(request_url):
+                package = PackageDefinition.from_nuget_exe_url(request_url)
+                if package is not None:
+                    package_ids[row], package_versions[row] = package.package_id, package.package_version
+
+        return package_ids, package_versions
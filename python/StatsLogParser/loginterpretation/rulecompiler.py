@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import Optional
+import argparse
+import os
+import sys
+from .rulematcher import RuleMatcher
+from .useragentparser import UserAgentParser
+
+class RuleCompiler:
+    """Generates precompiledrules.py, the rule table UserAgentParser loads instead of parsing knownclients.yaml.
+
+    The module holds the known client rules with the China CDN rewrite applied, and the required literals of
+    both rule sets, each with the hash of the source it was built from. Regenerate it whenever
+    knownclients.yaml or the ua_parser dependency changes:
+
+        python -m loginterpretation.rulecompiler
+    """
+
+    MODULE_NAME = "precompiledrules.py"
+
+    @staticmethod
+    def render_module() -> str:
+        known_rules = UserAgentParser._load_known_clients_rules()
+        known_parsers = UserAgentParser._create_parser_data(known_rules)
+
+        lines = [
+            "# Generated by loginterpretation.rulecompiler from knownclients.yaml and the ua_parser rules. Do not edit.",
+            "",
+            f"KNOWN_CLIENTS_YAML_SHA256 = {UserAgentParser.known_clients_fingerprint()!r}",
+            "",
+            "KNOWN_CLIENTS_RULES = [",
+            *(f"    {rule!r}," for rule in known_rules),
+            "]",
+            "",
+            "KNOWN_CLIENTS_LITERALS = [",
+            *(f"    {RuleCompiler._render_literals(parser)}," for parser in known_parsers),
+            "]",
+            "",
+            f"DEFAULT_RULES_SHA256 = {UserAgentParser.default_rules_fingerprint()!r}",
+            "",
+            "DEFAULT_LITERALS = [",
+            *(f"    {RuleCompiler._render_literals(parser)}," for parser in UserAgentParser.DEFAULT_PARSER_DATA),
+            "]",
+            ""]
+        return "\n".join(lines)
+
+    @staticmethod
+    def write_module(path: Optional[str] = None) -> str:
+        path = path or os.path.join(os.path.dirname(__file__), RuleCompiler.MODULE_NAME)
+        with open(path, "w", encoding="utf-8", newline="\n") as module:
+            module.write(RuleCompiler.render_module())
+        return path
+
+    @staticmethod
+    def _render_literals(parser) -> str:
+        literals = RuleMatcher.required_literals(parser)
+        if literals is None:
+            return "None"
+        # sorted so regenerating an unchanged rule set gives an identical file
+        return "frozenset({" + ", ".join(repr(literal) for literal in sorted(literals)) + "})"
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generates precompiledrules.py from knownclients.yaml and the ua_parser rules.")
+    parser.add_argument("--output", help=f"where to write the module, by default the package's {RuleCompiler.MODULE_NAME}")
+    args = parser.parse_args(argv)
+
+    if args.output is not None:
+        if not args.output.endswith(".py"):
+            parser.error(f"the output must be a .py file: {args.output}")
+        if not os.path.isdir(os.path.dirname(os.path.abspath(args.output))):
+            parser.error(f"the output's directory doesn't exist: {args.output}")
+
+    print(f"Wrote {RuleCompiler.write_module(args.output)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
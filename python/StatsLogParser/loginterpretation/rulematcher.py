@@ -0,0 +1,192 @@
+from __future__ import annotations
+from collections import namedtuple
+from typing import Iterable, Optional
+import re
+from ua_parser import user_agent_parser
+from .literalscanner import LiteralScanner
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError: # Python 3.10
+    import sre_parse
+    import sre_constants
+
+RuleMatch = namedtuple('RuleMatch', ['index', 'family', 'v1', 'v2', 'v3'])
+
+class RuleMatcher:
+    """Matches user agents against an ordered list of user agent parser rules.
+
+    Every rule is reduced to a set of literal strings such that any match of its regex contains at least one
+    of them. A LiteralScanner over the user agent finds which literals occur, and only the rules
+    owning one of them (plus the rules without literals) run their regex, still in list order. The first
+    matching rule wins and the family/version replacements of user_agent_parser apply as before.
+    """
+
+    MIN_LITERAL_LENGTH = 3
+    _MAX_LITERAL_SET_SIZE = 64
+    _MAX_CLASS_SIZE = 4
+    _REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None))
+    _ZERO_WIDTH = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+    def __init__(self, parsers: Iterable[user_agent_parser.UserAgentParser],
+                 literals: Optional[Iterable[Optional[frozenset[str]]]] = None) -> None:
+        """literals, when given, are the required_literals of every rule computed ahead of time."""
+        self.parsers: list[user_agent_parser.UserAgentParser] = list(parsers)
+        if literals is None:
+            self.literals: list[Optional[frozenset[str]]] = [RuleMatcher.required_literals(parser) for parser in self.parsers]
+        else:
+            self.literals = list(literals)
+            if len(self.literals) != len(self.parsers):
+                raise ValueError(f"Expected literals for {len(self.parsers)} rules, got {len(self.literals)}")
+
+        self._unfiltered_rules = tuple(index for index, literals in enumerate(self.literals) if literals is None)
+
+        rules_by_literal: dict[str, list[int]] = {}
+        for index, literals in enumerate(self.literals):
+            for literal in literals or ():
+                rules_by_literal.setdefault(literal, []).append(index)
+
+        self._scanner = LiteralScanner(rules_by_literal)
+        self._rules_by_match: dict[str, tuple[int, ...]] = {}
+        for literal in rules_by_literal:
+            indices = set()
+            for contained in self._scanner.contained(literal):
+                indices.update(rules_by_literal[contained])
+            self._rules_by_match[literal] = tuple(indices)
+
+    def candidates(self, user_agent_string: str) -> list[int]:
+        """Returns the indices, in rule order, of the rules that may match the user agent."""
+        candidates = set(self._unfiltered_rules)
+        rules_by_match = self._rules_by_match
+        for literal in self._scanner.longest_matches(user_agent_string):
+            candidates.update(rules_by_match[literal])
+
+        return sorted(candidates)
+
+    def match(self, user_agent_string: str) -> Optional[RuleMatch]:
+        """Returns the first rule that matches the user agent, or None."""
+        parsers = self.parsers
+        for index in self.candidates(user_agent_string):
+            family, v1, v2, v3 = parsers[index].Parse(user_agent_string)
+            if family:
+                return RuleMatch(index, family, v1, v2, v3)
+
+        return None
+
+    @staticmethod
+    def required_literals(parser: user_agent_parser.UserAgentParser) -> Optional[frozenset[str]]:
+        """Returns literal strings at least one of which occurs in every match of the rule, or None if there are none."""
+        if parser.user_agent_re.flags & re.IGNORECASE:
+            return None
+
+        try:
+            parsed = sre_parse.parse(parser.pattern)
+        except re.error:
+            return None
+
+        exact, best = RuleMatcher._analyze_sequence(parsed)
+        literals = RuleMatcher._better(exact, best)
+        if not literals:
+            return None
+
+        # a literal containing another one from the set adds nothing to the filter
+        return frozenset(literal for literal in literals
+                         if not any(other != literal and other in literal for other in literals))
+
+    # The analysis below works on the parsed regex. For every node it computes the exact set of strings the
+    # node can match (when that set is small and finite) and the best set of literals a match of it has to
+    # contain, preferring sets whose shortest literal is longest.
+
+    @staticmethod
+    def _analyze_sequence(items) -> tuple[Optional[set[str]], Optional[set[str]]]:
+        run = {""}
+        exact_throughout = True
+        factors = []
+
+        for item in items:
+            exact, best = RuleMatcher._analyze_item(*item)
+            if exact is not None:
+                combined = {prefix + suffix for prefix in run for suffix in exact}
+                if len(combined) > RuleMatcher._MAX_LITERAL_SET_SIZE:
+                    factors.append(run)
+                    run = exact
+                    exact_throughout = False
+                else:
+                    run = combined
+            else:
+                factors.append(run)
+                run = {""}
+                exact_throughout = False
+                if best is not None:
+                    factors.append(best)
+
+        factors.append(run)
+        best = max(factors, key=RuleMatcher._score)
+        return (run if exact_throughout else None), (best if RuleMatcher._score(best)[0] > 0 else None)
+
+    @staticmethod
+    def _analyze_item(op, av) -> tuple[Optional[set[str]], Optional[set[str]]]:
+        if op == sre_constants.LITERAL:
+            return {chr(av)}, None
+
+        if op == sre_constants.IN:
+            chars = RuleMatcher._class_chars(av)
+            return (chars, None) if chars else (None, None)
+
+        if op in RuleMatcher._ZERO_WIDTH:
+            return {""}, None
+
+        if op == sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, items = av
+            if add_flags or del_flags:
+                return None, None
+            return RuleMatcher._analyze_sequence(items)
+
+        if op == sre_constants.BRANCH:
+            branches = [RuleMatcher._analyze_sequence(items) for items in av[1]]
+            exact = None
+            if all(branch_exact is not None for branch_exact, _ in branches):
+                exact = set().union(*(branch_exact for branch_exact, _ in branches))
+                if len(exact) > RuleMatcher._MAX_LITERAL_SET_SIZE:
+                    exact = None
+
+            best = None
+            branch_bests = [RuleMatcher._better(branch_exact, branch_best) for branch_exact, branch_best in branches]
+            if all(branch_best is not None for branch_best in branch_bests):
+                best = set().union(*branch_bests)
+
+            return exact, best
+
+        if op in RuleMatcher._REPEATS:
+            low, high, items = av
+            exact, best = RuleMatcher._analyze_sequence(items)
+            if high <= 1 and exact is not None:
+                return (exact | {""} if low == 0 else exact), None
+            if low == 0:
+                return None, None
+            return None, RuleMatcher._better(exact, best)
+
+        return None, None
+
+    @staticmethod
+    def _class_chars(items) -> Optional[set[str]]:
+        chars = set()
+        for op, av in items:
+            if op == sre_constants.LITERAL:
+                chars.add(chr(av))
+            elif op == sre_constants.RANGE and av[1] - av[0] < RuleMatcher._MAX_CLASS_SIZE:
+                chars.update(chr(c) for c in range(av[0], av[1] + 1))
+            else:
+                return None
+
+        return chars if len(chars) <= RuleMatcher._MAX_CLASS_SIZE else None
+
+    @staticmethod
+    def _better(first: Optional[set[str]], second: Optional[set[str]]) -> Optional[set[str]]:
+        options = [option for option in (first, second) if option and RuleMatcher._score(option)[0] >= RuleMatcher.MIN_LITERAL_LENGTH]
+        return max(options, key=RuleMatcher._score) if options else None
+
+    @staticmethod
+    def _score(literals: set[str]) -> tuple[int, int]:
+        return min(len(literal) for literal in literals), -len(literals)
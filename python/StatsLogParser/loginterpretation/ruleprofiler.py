@@ -0,0 +1,236 @@
+from __future__ import annotations
+from collections import Counter, namedtuple
+from typing import Iterable, Optional
+import argparse
+import heapq
+import re
+import sys
+import time
+from ua_parser import user_agent_parser
+from .rulematcher import RuleMatcher
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError: # Python 3.10
+    import sre_parse
+    import sre_constants
+
+RuleProfile = namedtuple('RuleProfile', ['index', 'pattern', 'hits', 'attempts', 'time_ns'])
+ReorderResult = namedtuple('ReorderResult', ['order', 'profiles', 'constraints', 'verified', 'attempts_before', 'attempts_after'])
+
+class RuleProfiler:
+    """Profiles an ordered rule list on a sample of user agents and reorders it by how often each rule wins.
+
+    The first matching rule wins, so two rules may only swap places when they don't match the same user agents.
+    A rule keeps its place relative to every other one unless the two are exclusive, which is the case when:
+    - both are anchored at the start of the user agent, with literal prefixes neither of which starts the other;
+    - or each has required literals (those of RuleMatcher's prefilter), and no literal of one overlaps a literal
+      of the other, so no client token matches both, and no user agent of the sample matches both.
+    The second case is not a proof: a user agent naming two clients, like 'Paket/1 curl/2', matches both rules,
+    and only those of them that are in the sample are guaranteed to keep their result. Within the constraints
+    the rules are ordered by descending hits, keeping the original order on ties. The new order is then
+    verified to only swap exclusive rules, and to give the same result as the original one for every user
+    agent of the sample.
+    """
+
+    def __init__(self, parsers: Iterable[user_agent_parser.UserAgentParser]) -> None:
+        self.parsers: list[user_agent_parser.UserAgentParser] = list(parsers)
+        self.matcher = RuleMatcher(self.parsers)
+
+    def profile(self, user_agents: Counter) -> list[RuleProfile]:
+        """Replays the sample, weighted by count, recording per rule the wins, the regex runs and their time."""
+        hits = [0] * len(self.parsers)
+        attempts = [0] * len(self.parsers)
+        time_ns = [0] * len(self.parsers)
+        clock = time.perf_counter_ns
+
+        for user_agent, count in user_agents.items():
+            for index in self.matcher.candidates(user_agent):
+                start = clock()
+                family = self.parsers[index].Parse(user_agent)[0]
+                time_ns[index] += (clock() - start) * count
+                attempts[index] += count
+                if family:
+                    hits[index] += count
+                    break
+
+        return [RuleProfile(index, parser.pattern, hits[index], attempts[index], time_ns[index])
+                for index, parser in enumerate(self.parsers)]
+
+    def constraints(self, user_agents: Iterable[str] = ()) -> set[tuple[int, int]]:
+        """Returns the (earlier, later) rule pairs whose relative order has to be kept, all but the exclusive ones.
+
+        Rules that both match a user agent of the sample are never exclusive.
+        """
+        prefixes = [RuleProfiler.anchored_prefix(parser) for parser in self.parsers]
+        literals = self.matcher.literals
+        constraints = {(first, second)
+                       for first in range(len(self.parsers))
+                       for second in range(first + 1, len(self.parsers))
+                       if not RuleProfiler._exclusive(prefixes[first], prefixes[second])
+                       and not RuleProfiler._disjoint(literals[first], literals[second])}
+
+        for user_agent in user_agents:
+            matching = [index for index in self.matcher.candidates(user_agent) if self.parsers[index].Parse(user_agent)[0]]
+            constraints.update((first, second) for position, first in enumerate(matching) for second in matching[position + 1:])
+        return constraints
+
+    def reorder(self, user_agents: Counter) -> ReorderResult:
+        profiles = self.profile(user_agents)
+        constraints = self.constraints(user_agents)
+        order = RuleProfiler.order_by_hits([profile.hits for profile in profiles], constraints)
+
+        reordered = RuleProfiler([self.parsers[index] for index in order])
+        position = {index: rank for rank, index in enumerate(order)}
+        swaps_exclusive = all(position[first] < position[second] for first, second in constraints)
+        verified = swaps_exclusive and all(self._result(user_agent) == reordered._result(user_agent) for user_agent in user_agents)
+        attempts_after = sum(profile.attempts for profile in reordered.profile(user_agents))
+
+        return ReorderResult(order, profiles, constraints, verified, sum(profile.attempts for profile in profiles), attempts_after)
+
+    @staticmethod
+    def order_by_hits(hits: list[int], constraints: Iterable[tuple[int, int]]) -> list[int]:
+        """Topologically sorts the rules under the constraints, which always point from a lower to a higher index.
+
+        Among the rules free to go next, the one with the most hits, counting the hits of the rules it has to
+        precede, goes first, so a rare rule holding back a frequent one isn't left behind.
+        """
+        successors: list[list[int]] = [[] for _ in hits]
+        predecessors = [0] * len(hits)
+        for first, second in set(constraints):
+            successors[first].append(second)
+            predecessors[second] += 1
+
+        priority = list(hits)
+        for index in reversed(range(len(hits))):
+            for successor in successors[index]:
+                priority[index] = max(priority[index], priority[successor])
+
+        ready = [(-priority[index], index) for index in range(len(hits)) if predecessors[index] == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, index = heapq.heappop(ready)
+            order.append(index)
+            for successor in successors[index]:
+                predecessors[successor] -= 1
+                if predecessors[successor] == 0:
+                    heapq.heappush(ready, (-priority[successor], successor))
+
+        return order
+
+    @staticmethod
+    def reorder_yaml(yaml_content: str, order: list[int]) -> str:
+        """Reorders the rules of a knownclients.yaml, each with the comments and blank lines above it."""
+        lines = yaml_content.splitlines(keepends=True)
+        rule_starts = [number for number, line in enumerate(lines) if re.match(r"\s*- regex:", line)]
+        if len(rule_starts) != len(order):
+            raise ValueError(f"Expected {len(order)} rules, found {len(rule_starts)}")
+
+        # a rule's block starts after the previous rule's last indented line
+        block_starts = []
+        for number in rule_starts:
+            start = number
+            while start > 0 and (not lines[start - 1].strip() or lines[start - 1].lstrip().startswith("#")):
+                start -= 1
+            block_starts.append(start)
+
+        header = "".join(lines[:block_starts[0]])
+        blocks = ["".join(lines[start:end]).strip("\n") for start, end in zip(block_starts, block_starts[1:] + [len(lines)])]
+        return header + "\n\n".join(blocks[index] for index in order) + "\n"
+
+    def _result(self, user_agent: str) -> Optional[tuple]:
+        match = self.matcher.match(user_agent)
+        return match[1:] if match is not None else None
+
+    @staticmethod
+    def anchored_prefix(parser: user_agent_parser.UserAgentParser) -> Optional[str]:
+        """Returns the literal text every match of a rule starts the user agent with, or None when it isn't anchored."""
+        flags = parser.user_agent_re.flags
+        if flags & re.MULTILINE:
+            return None
+        try:
+            items = list(sre_parse.parse(parser.pattern))
+        except re.error:
+            return None
+        if not items or items[0] != (sre_constants.AT, sre_constants.AT_BEGINNING) and items[0] != (sre_constants.AT, sre_constants.AT_BEGINNING_STRING):
+            return None
+
+        return RuleProfiler._literal_prefix(items[1:])[0]
+
+    @staticmethod
+    def _literal_prefix(items) -> tuple[str, bool]:
+        # returns the literal text the items start with, and whether they are nothing but that text
+        prefix = []
+        for op, av in items:
+            if op == sre_constants.LITERAL:
+                prefix.append(chr(av))
+            elif op == sre_constants.SUBPATTERN:
+                text, complete = RuleProfiler._literal_prefix(av[-1])
+                prefix.append(text)
+                if not complete:
+                    return "".join(prefix), False
+            else:
+                return "".join(prefix), False
+        return "".join(prefix), True
+
+    @staticmethod
+    def _exclusive(first: Optional[str], second: Optional[str]) -> bool:
+        # a user agent can only start with both prefixes when one of them starts the other; they are compared
+        # ignoring case, in case either rule does
+        if not first or not second:
+            return False
+        first, second = first.casefold(), second.casefold()
+        return not first.startswith(second) and not second.startswith(first)
+
+    @staticmethod
+    def _disjoint(first: Optional[frozenset[str]], second: Optional[frozenset[str]]) -> bool:
+        # no text can contain a literal of each unless it holds them apart, as when a user agent names two clients
+        if not first or not second:
+            return False
+        return not any(RuleProfiler._overlap(a, b) or RuleProfiler._overlap(b, a) for a in first for b in second)
+
+    @staticmethod
+    def _overlap(first: str, second: str) -> bool:
+        # whether second occurs in first, or starts with an end of first
+        return second in first or any(second.startswith(first[start:]) for start in range(1, len(first)))
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from .useragentparser import UserAgentParser
+
+    parser = argparse.ArgumentParser(description="Reorders knownclients.yaml by how often each rule matches a sample.")
+    parser.add_argument("sample", help="file with one user agent per line, or a CDN log with --cdn-log")
+    parser.add_argument("--cdn-log", action="store_true", help="read the user agents of the downloads in a CDN log")
+    parser.add_argument("--output", help="where to write the reordered knownclients.yaml")
+    args = parser.parse_args(argv)
+
+    if args.cdn_log:
+        from .cdnlogparser import CdnLogParser
+        user_agents = Counter(CdnLogParser.unquote(entry.user_agent) for entry in CdnLogParser.read_log_entries(args.sample, lambda e, line_number: None))
+    else:
+        with open(args.sample, encoding="utf-8") as sample:
+            user_agents = Counter(line.rstrip("\r\n") for line in sample)
+    if UserAgentParser.DECODE_PLUS_SIGNS:
+        user_agents = Counter({user_agent.replace("+", " "): count for user_agent, count in user_agents.items()})
+
+    UserAgentParser._ensure_initialized()
+    result = RuleProfiler(UserAgentParser.KNOWN_CLIENTS_DATA).reorder(user_agents)
+
+    for profile in sorted(result.profiles, key=lambda profile: -profile.time_ns):
+        print(f"{profile.index:>4} {profile.hits:>10} hits {profile.attempts:>10} runs {profile.time_ns / 1e6:>10.2f} ms  {profile.pattern}")
+    print(f"{len(result.constraints)} order constraints, regex runs {result.attempts_before} -> {result.attempts_after}")
+    print(f"New order: {result.order}")
+
+    if not result.verified:
+        print("The new order changes results on the sample, not writing it")
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8-sig", newline="\n") as output:
+            output.write(RuleProfiler.reorder_yaml(UserAgentParser._read_known_clients_yaml(), result.order))
+        print(f"Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,69 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from collections import namedtuple
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 from functools import total_ordering
+import sys
+from .lrucache import LRUCache
 
 Version = namedtuple("Version", ["major", "minor", "patch", "revision"])
 
-@dataclass
+# Release label tuples are interned so versions sharing labels (e.g. "beta.1") share one tuple; the table is
+# bounded, as labels come from request urls, so the rarely seen ones are evicted instead of accumulating
+_RELEASE_LABELS: LRUCache[Tuple[str, ...], Tuple[str, ...]] = LRUCache(4096)
+
+def _intern_release_labels(release_labels: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    if not release_labels:
+        return ()
+    labels = tuple(release_labels)
+    interned = _RELEASE_LABELS.get(labels)
+    if interned is None:
+        interned = tuple(sys.intern(label) for label in labels)
+        _RELEASE_LABELS.put(interned, interned)
+    return interned
+
+@dataclass(frozen=True, slots=True, eq=False)
 @total_ordering
 class SemanticVersion:
     major: int
     minor: int
     patch: int
     revision: int
-    release_labels: Optional[List[str]] = field(default_factory=list)
+    release_labels: Tuple[str, ...] = ()
     metadata: Optional[str] = None
-    version: Optional[Version] = field(init=False)
+    _sort_key: Optional[tuple] = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        self.version = (self.major, self.minor, self.patch, self.revision)
+        object.__setattr__(self, "release_labels", _intern_release_labels(self.release_labels))
+        if self.metadata:
+            object.__setattr__(self, "metadata", sys.intern(self.metadata))
+
+    @property
+    def version(self) -> Version:
+        return Version(self.major, self.minor, self.patch, self.revision)
+
+    def sort_key(self) -> tuple:
+        """Returns the key versions are ordered by, computed on first use and kept for later comparisons.
+
+        The order follows NuGet's default version comparer: numbers first, a release above its prereleases,
+        release labels compared pairwise with numeric labels as numbers below alphanumeric ones, alphanumeric
+        labels case-insensitively, and a shorter label list first when it is a prefix. Metadata is ignored.
+        """
+        key = self._sort_key
+        if key is None:
+            if self.release_labels:
+                labels_key = (0,) + tuple(SemanticVersion._release_label_key(label) for label in self.release_labels)
+            else:
+                labels_key = (1,)
+            key = (self.major, self.minor, self.patch, self.revision, labels_key)
+            object.__setattr__(self, "_sort_key", key)
+        return key
+
+    @staticmethod
+    def _release_label_key(label: str) -> tuple:
+        if label.isdigit() and label.isascii():
+            return (0, int(label))
+        return (1, label.upper())
 
     def to_normalized_string(self) -> str:
         return self.__str__()
@@ -37,24 +82,25 @@ class SemanticVersion:
         return self.to_full_string()
 
     def __eq__(self, other):
+        # equal exactly when neither orders before the other: metadata is ignored and labels compare case-insensitively
         if not isinstance(other, SemanticVersion):
             return NotImplemented
-        return (self.version, self.release_labels, self.metadata) == (other.version, other.release_labels, other.metadata)
+        return self.sort_key() == other.sort_key()
 
     def __lt__(self, other):
         if not isinstance(other, SemanticVersion):
             return NotImplemented
-        return (self.version, self.release_labels, self.metadata) < (other.version, other.release_labels, other.metadata)
+        return self.sort_key() < other.sort_key()
 
     def __hash__(self):
-        return hash((self.version, tuple(self.release_labels), self.metadata))
+        return hash(self.sort_key())
 
     @classmethod
     def parse(cls, value: str) -> SemanticVersion:
         try:
             version_string, release_labels, build_metadata = cls.parse_sections(value)
             major, minor, patch = cls.parse_version(version_string)
-            return cls(major, minor, patch, release_labels, build_metadata)
+            return cls(major, minor, patch, 0, release_labels, build_metadata)
         except Exception as e:
             raise ValueError(f"Invalid SemanticVersion string: {value}") from e
 
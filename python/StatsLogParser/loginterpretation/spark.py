@@ -0,0 +1,119 @@
+from __future__ import annotations
+from typing import Optional
+from .packageidindex import PackageIdIndex
+from .requestclassifier import RequestClassifier
+from .useragentclassifier import UserAgentClassifier
+
+PACKAGE_SCHEMA = "package_id string, package_version string"
+CLIENT_SCHEMA = "client_family string, client_major string, client_minor string, client_patch string, client_category string"
+DOWNLOAD_SCHEMA = f"{PACKAGE_SCHEMA}, {CLIENT_SCHEMA}"
+
+CLIENT_COLUMNS = ["client_family", "client_major", "client_minor", "client_patch", "client_category"]
+
+class SparkUdfs:
+    """Vectorized (Arrow batch) Spark UDFs resolving packages and classifying clients into struct columns.
+
+    Each batch goes through the batch methods of RequestClassifier and UserAgentClassifier, which resolve its
+    distinct values once and spread the results back to the rows.
+    pandas and pyspark are only imported when these are used, so they stay optional dependencies (the spark
+    extra); the functions the UDFs run, from the *_function methods, only need pandas.
+
+        from loginterpretation.spark import SparkUdfs
+        downloads = logs.withColumn("download", SparkUdfs.download_udf()("request_url", "user_agent"))
+    """
+
+    # package id indexes opened by this process, by path, so each executor maps a file once
+    _PACKAGE_ID_INDEXES: dict[str, PackageIdIndex] = {}
+
+    @staticmethod
+    def resolve_packages(request_urls, package_id_index: Optional[PackageIdIndex] = None):
+        """Resolves a pandas Series of request urls into a DataFrame of package ids and versions."""
+        import pandas as pd
+
+        package_ids, package_versions = RequestClassifier.resolve_many(request_urls, package_id_index)
+        return pd.DataFrame({"package_id": package_ids, "package_version": package_versions}, index=request_urls.index, dtype=object)
+
+    @staticmethod
+    def classify_clients(user_agents):
+        """Classifies a pandas Series of user agents into a DataFrame of client families, versions and categories."""
+        import pandas as pd
+
+        clients = UserAgentClassifier.classify_many(user_agents)
+        # object columns from the start, as inferring string columns would turn the missing versions into NaN
+        return pd.DataFrame(clients, columns=CLIENT_COLUMNS, index=user_agents.index, dtype=object)
+
+    @staticmethod
+    def resolve_downloads(request_urls, user_agents, package_id_index: Optional[PackageIdIndex] = None):
+        import pandas as pd
+
+        return pd.concat([
+            SparkUdfs.resolve_packages(request_urls, package_id_index),
+            SparkUdfs.classify_clients(user_agents)], axis=1)
+
+    @staticmethod
+    def package_function(package_id_index_path: Optional[str] = None):
+        """Returns the Series to DataFrame function package_udf runs, opening the index on first use."""
+        import pandas as pd
+
+        def resolve_package(request_urls):
+            return SparkUdfs.resolve_packages(request_urls, SparkUdfs._open_package_id_index(package_id_index_path))
+
+        # annotations are set on the function so Spark infers a Series to DataFrame UDF without pandas imported here
+        resolve_package.__annotations__ = {"request_urls": pd.Series, "return": pd.DataFrame}
+        return resolve_package
+
+    @staticmethod
+    def client_function():
+        """Returns the Series to DataFrame function client_udf runs."""
+        import pandas as pd
+
+        def classify_client(user_agents):
+            return SparkUdfs.classify_clients(user_agents)
+
+        classify_client.__annotations__ = {"user_agents": pd.Series, "return": pd.DataFrame}
+        return classify_client
+
+    @staticmethod
+    def download_function(package_id_index_path: Optional[str] = None):
+        """Returns the two Series to DataFrame function download_udf runs, opening the index on first use."""
+        import pandas as pd
+
+        def resolve_download(request_urls, user_agents):
+            return SparkUdfs.resolve_downloads(request_urls, user_agents, SparkUdfs._open_package_id_index(package_id_index_path))
+
+        resolve_download.__annotations__ = {"request_urls": pd.Series, "user_agents": pd.Series, "return": pd.DataFrame}
+        return resolve_download
+
+    @staticmethod
+    def package_udf(package_id_index_path: Optional[str] = None):
+        """Returns a pandas UDF mapping a request url column to a struct<package_id, package_version> column.
+
+        package_id_index_path, when given, is a PackageIdIndex file readable at the same path on every executor.
+        """
+        from pyspark.sql.functions import pandas_udf
+
+        return pandas_udf(SparkUdfs.package_function(package_id_index_path), PACKAGE_SCHEMA)
+
+    @staticmethod
+    def client_udf():
+        """Returns a pandas UDF mapping a user agent column to a struct column of the client family, version parts and category."""
+        from pyspark.sql.functions import pandas_udf
+
+        return pandas_udf(SparkUdfs.client_function(), CLIENT_SCHEMA)
+
+    @staticmethod
+    def download_udf(package_id_index_path: Optional[str] = None):
+        """Returns a pandas UDF mapping request url and user agent columns to one struct column with both results."""
+        from pyspark.sql.functions import pandas_udf
+
+        return pandas_udf(SparkUdfs.download_function(package_id_index_path), DOWNLOAD_SCHEMA)
+
+    @staticmethod
+    def _open_package_id_index(path: Optional[str]) -> Optional[PackageIdIndex]:
+        if path is None:
+            return None
+
+        index = SparkUdfs._PACKAGE_ID_INDEXES.get(path)
+        if index is None:
+            index = SparkUdfs._PACKAGE_ID_INDEXES[path] = PackageIdIndex.open(path)
+        return index
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from collections import namedtuple
+from typing import Iterable
+from .clientnametranslation import ClientNameTranslation
+from .columns import Columns
+from .lrucache import CacheInfo, LRUCache
+from .useragentparser import UserAgentParser
+
+ClientInfo = namedtuple('ClientInfo', ['family', 'major', 'minor', 'patch', 'category'])
+
+class UserAgentClassifier:
+    """Parses a user agent and resolves its client category in one call, caching the result per user agent."""
+
+    _MAX_CACHE_SIZE = 10000
+    _CLASSIFY_CACHE: LRUCache[str, ClientInfo] = LRUCache(_MAX_CACHE_SIZE)
+
+    @staticmethod
+    def set_cache_size(size: int) -> None:
+        UserAgentClassifier._CLASSIFY_CACHE.resize(size)
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        return UserAgentClassifier._CLASSIFY_CACHE.info()
+
+    @staticmethod
+    def classify(user_agent_string: str) -> ClientInfo:
+        """Returns the family, version parts and client category of a user agent."""
+        entry = UserAgentClassifier._CLASSIFY_CACHE.get(user_agent_string)
+        if entry is not None:
+            return entry
+
+        user_agent = UserAgentParser.parse(user_agent_string)
+        category = ClientNameTranslation.get_client_category(user_agent.family)
+        entry = ClientInfo(user_agent.family, user_agent.major, user_agent.minor, user_agent.patch, category)
+
+        UserAgentClassifier._CLASSIFY_CACHE.put(user_agent_string, entry)
+        return entry
+
+    @staticmethod
+    def classify_many(user_agent_strings: Iterable[str]) -> list[ClientInfo]:
+        """Classifies a column of user agents (see Columns), doing the work once per distinct value; nulls are
+        classified as an empty user agent."""
+        user_agent_strings = Columns.strings(user_agent_strings)
+        classified = {value: UserAgentClassifier.classify(value) for value in dict.fromkeys(user_agent_strings)}
+        return [classified[value] for value in user_agent_strings]
@@ -0,0 +1,265 @@
+from __future__ import annotations
+from collections import Counter, namedtuple
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional
+import argparse
+import csv
+import sqlite3
+import sys
+from .cdnlogparser import CdnLogParser, DownloadRecord
+from .clientnametranslation import ClientNameTranslation
+from .columns import Columns
+from .downloadaggregator import DownloadAggregator, DownloadKey
+from .requestclassifier import RequestClassifier, RequestKind
+from .useragentclassifier import ClientInfo, UserAgentClassifier
+from .useragentparser import UserAgentParser
+
+ClientRemap = namedtuple('ClientRemap', ['ua_id', 'user_agent', 'old', 'new'])
+UserAgentDownloadKey = namedtuple('UserAgentDownloadKey', ['package_id', 'package_version', 'ua_id', 'date'])
+
+class UserAgentDictionary:
+    """A sqlite dictionary of the distinct user agents seen, each with an id and its classification.
+
+    There are orders of magnitude fewer distinct user agents than log lines, so when the rules change only
+    the dictionary has to be classified again: reclassify returns the entries whose client changes, a remap
+    table from which aggregates keyed by user agent id can be corrected without reprocessing any log.
+
+        counts = dictionary.count_downloads(records)          # keyed by user agent id, kept across rule changes
+        downloads = dictionary.to_downloads(counts)
+        remaps = dictionary.reclassify(new_classify, new_version, apply=True)
+        downloads = UserAgentDictionary.remap_downloads(downloads, counts, remaps)  # same as to_downloads(counts) now
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS user_agents (
+            ua_id INTEGER PRIMARY KEY,
+            user_agent TEXT NOT NULL UNIQUE,
+            family TEXT,
+            major TEXT,
+            minor TEXT,
+            patch TEXT,
+            category TEXT);
+        CREATE TABLE IF NOT EXISTS properties (
+            name TEXT PRIMARY KEY,
+            value TEXT);
+        """
+    REMAP_COLUMNS = ('ua_id', 'user_agent',
+                     'old_family', 'old_major', 'old_minor', 'old_patch', 'old_category',
+                     'new_family', 'new_major', 'new_minor', 'new_patch', 'new_category')
+    # stays under SQLite's default limit on the number of parameters of a statement
+    _BATCH_SIZE = 500
+    # user agents added at a time when streaming records or log entries
+    _ADD_BATCH_SIZE = 10000
+
+    def __init__(self, path: str) -> None:
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.executescript(UserAgentDictionary._SCHEMA)
+        self._ids: dict[str, int] = {}
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> UserAgentDictionary:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM user_agents").fetchone()[0]
+
+    @property
+    def rules_version(self) -> Optional[str]:
+        """The version of the rules the stored classifications were made with."""
+        row = self._connection.execute("SELECT value FROM properties WHERE name = 'rules_version'").fetchone()
+        return row[0] if row is not None else None
+
+    def add(self, user_agents: Iterable[str]) -> list[int]:
+        """Returns the ids of the user agents, adding and classifying with the rules in use the ones not seen yet.
+
+        user_agents is a column (see Columns); nulls are added as an empty user agent.
+        """
+        user_agents = Columns.strings(user_agents)
+
+        missing = [user_agent for user_agent in dict.fromkeys(user_agents) if user_agent not in self._ids]
+        self._load_ids(missing)
+        new = [user_agent for user_agent in missing if user_agent not in self._ids]
+
+        if new:
+            rules_version = UserAgentParser.rules_version()
+            if self.rules_version not in (None, rules_version):
+                raise ValueError("The dictionary was classified with other rules, reclassify it with the rules in use first")
+
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO user_agents (user_agent, family, major, minor, patch, category) VALUES (?, ?, ?, ?, ?, ?)",
+                    ((user_agent, *UserAgentClassifier.classify(user_agent)) for user_agent in new))
+                self._set_rules_version(rules_version)
+            self._load_ids(new)
+
+        return [self._ids[user_agent] for user_agent in user_agents]
+
+    def add_all(self, user_agents: Iterable[str]) -> None:
+        """Adds a stream of user agents, e.g. every download of a log, a batch at a time."""
+        for batch in UserAgentDictionary._batches(user_agents, UserAgentDictionary._ADD_BATCH_SIZE):
+            self.add(batch)
+
+    def count_downloads(self, records: Iterable[DownloadRecord], counts: Optional[Counter] = None) -> Counter:
+        """Counts downloads per package id, normalized version, user agent id and day, adding the user agents.
+
+        Unlike a DownloadAggregator, these counts don't depend on the rules; to_downloads rolls them up by client.
+        """
+        counts = counts if counts is not None else Counter()
+        normalizer = DownloadAggregator()
+        for batch in UserAgentDictionary._batches(records, UserAgentDictionary._ADD_BATCH_SIZE):
+            for record, ua_id in zip(batch, self.add(record.user_agent for record in batch)):
+                key = normalizer.key(record)
+                counts[UserAgentDownloadKey(key.package_id, key.package_version, ua_id, key.date)] += 1
+        return counts
+
+    def to_downloads(self, counts: Counter) -> DownloadAggregator:
+        """Rolls counts keyed by user agent id up by client, with the classifications stored in the dictionary."""
+        clients = self._clients({key.ua_id for key in counts})
+        downloads = DownloadAggregator()
+        for key, count in counts.items():
+            client = clients[key.ua_id]
+            downloads.add_key(DownloadKey(key.package_id, key.package_version, client.family, client.category, key.date), count)
+        return downloads
+
+    @staticmethod
+    def remap_downloads(downloads: DownloadAggregator, counts: Counter, remaps: Iterable[ClientRemap]) -> DownloadAggregator:
+        """Returns downloads with the counts of the remapped user agents moved from their old client to their new one.
+
+        counts are the ones keyed by user agent id the downloads were rolled up from, and remaps come from reclassify.
+        """
+        remaps = {remap.ua_id: remap for remap in remaps}
+        changes: Counter = Counter()
+        for key, count in counts.items():
+            remap = remaps.get(key.ua_id)
+            if remap is not None:
+                changes[DownloadKey(key.package_id, key.package_version, remap.old.family, remap.old.category, key.date)] -= count
+                changes[DownloadKey(key.package_id, key.package_version, remap.new.family, remap.new.category, key.date)] += count
+
+        remapped = DownloadAggregator()
+        for key, count in downloads.items():
+            count += changes.pop(key, 0)
+            if count:
+                remapped.add_key(key, count)
+        for key, count in changes.items():
+            if count:
+                remapped.add_key(key, count)
+        return remapped
+
+    def get(self, ua_id: int) -> Optional[ClientInfo]:
+        row = self._connection.execute("SELECT family, major, minor, patch, category FROM user_agents WHERE ua_id = ?", (ua_id,)).fetchone()
+        return ClientInfo(*row) if row is not None else None
+
+    def lookup(self, user_agent: str) -> Optional[int]:
+        """Returns the id of a user agent, or None when it isn't in the dictionary."""
+        self._load_ids([user_agent])
+        return self._ids.get(user_agent)
+
+    def reclassify(self, classify: Callable[[str], ClientInfo] = UserAgentClassifier.classify, rules_version: Optional[str] = None,
+                   apply: bool = False) -> list[ClientRemap]:
+        """Classifies every entry again and returns, by id, those whose classification changes.
+
+        classify defaults to the rules in use; known_clients_classifier previews another known clients YAML.
+        With apply, the changes are stored, along with rules_version (by default, the version of the rules in use).
+        """
+        remaps = []
+        rows = self._connection.execute("SELECT ua_id, user_agent, family, major, minor, patch, category FROM user_agents ORDER BY ua_id")
+        for ua_id, user_agent, *old in rows:
+            old = ClientInfo(*old)
+            new = ClientInfo(*classify(user_agent))
+            if new != old:
+                remaps.append(ClientRemap(ua_id, user_agent, old, new))
+
+        if apply:
+            with self._connection:
+                self._connection.executemany(
+                    "UPDATE user_agents SET family = ?, major = ?, minor = ?, patch = ?, category = ? WHERE ua_id = ?",
+                    ((*remap.new, remap.ua_id) for remap in remaps))
+                self._set_rules_version(rules_version or UserAgentParser.rules_version())
+
+        return remaps
+
+    @staticmethod
+    def known_clients_classifier(yaml_content: str) -> Callable[[str], ClientInfo]:
+        """Returns a classify function using the rules of a known clients YAML instead of the ones in use."""
+        matcher = UserAgentParser.create_known_clients_matcher(yaml_content)
+
+        def classify(user_agent: str) -> ClientInfo:
+            parsed = UserAgentParser.parse_with_known_clients(user_agent, matcher)
+            return ClientInfo(parsed.family, parsed.major, parsed.minor, parsed.patch, ClientNameTranslation.get_client_category(parsed.family))
+
+        return classify
+
+    @staticmethod
+    def write_remap(path: str, remaps: Iterable[ClientRemap]) -> None:
+        """Writes a remap table as tab-separated values, one row per user agent id with its old and new client."""
+        with open(path, "w", encoding="utf-8", newline="") as output:
+            writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+            writer.writerow(UserAgentDictionary.REMAP_COLUMNS)
+            for remap in remaps:
+                writer.writerow((remap.ua_id, remap.user_agent, *remap.old, *remap.new))
+
+    def _clients(self, ua_ids: set[int]) -> dict[int, ClientInfo]:
+        ua_ids = list(ua_ids)
+        clients = {}
+        for start in range(0, len(ua_ids), UserAgentDictionary._BATCH_SIZE):
+            batch = ua_ids[start:start + UserAgentDictionary._BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            clients.update((ua_id, ClientInfo(*client)) for ua_id, *client in self._connection.execute(
+                f"SELECT ua_id, family, major, minor, patch, category FROM user_agents WHERE ua_id IN ({placeholders})", batch))
+        return clients
+
+    @staticmethod
+    def _batches(values: Iterable, size: int) -> Iterator[list]:
+        values = iter(values)
+        while batch := list(islice(values, size)):
+            yield batch
+
+    def _load_ids(self, user_agents: list[str]) -> None:
+        for start in range(0, len(user_agents), UserAgentDictionary._BATCH_SIZE):
+            batch = user_agents[start:start + UserAgentDictionary._BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            self._ids.update((user_agent, ua_id) for ua_id, user_agent in self._connection.execute(
+                f"SELECT ua_id, user_agent FROM user_agents WHERE user_agent IN ({placeholders})", batch))
+
+    def _set_rules_version(self, rules_version: str) -> None:
+        self._connection.execute("INSERT OR REPLACE INTO properties (name, value) VALUES ('rules_version', ?)", (rules_version,))
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Keeps a dictionary of distinct user agents and remaps them when the rules change.")
+    parser.add_argument("dictionary", help="the sqlite dictionary file, created if it doesn't exist")
+    parser.add_argument("--add-cdn-log", nargs="*", default=[], help="CDN logs whose download user agents to add")
+    parser.add_argument("--known-clients", help="a knownclients.yaml to reclassify with instead of the one in use")
+    parser.add_argument("--remap", help="where to write the remap table of the user agents whose client changes")
+    parser.add_argument("--apply", action="store_true", help="store the new classifications")
+    args = parser.parse_args(argv)
+
+    with UserAgentDictionary(args.dictionary) as dictionary:
+        if args.add_cdn_log:
+            for path in args.add_cdn_log:
+                # only the downloads' user agents, without resolving the packages or classifying every line
+                dictionary.add_all(CdnLogParser.unquote(entry.user_agent) for entry in CdnLogParser.read_log_entries(path, lambda e, line_number: None)
+                                   if RequestClassifier.classify(entry.request_url) is not RequestKind.OTHER)
+            print(f"{len(dictionary)} distinct user agents")
+
+        if args.remap or args.apply:
+            if args.known_clients:
+                with open(args.known_clients, "rb") as known_clients:
+                    yaml_content = known_clients.read()
+                remaps = dictionary.reclassify(UserAgentDictionary.known_clients_classifier(yaml_content.decode("utf-8-sig")),
+                                               UserAgentParser.rules_version(yaml_content), args.apply)
+            else:
+                remaps = dictionary.reclassify(apply=args.apply)
+
+            print(f"{len(remaps)} of {len(dictionary)} user agents change client")
+            if args.remap:
+                UserAgentDictionary.write_remap(args.remap, remaps)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,49 +1,174 @@
 from __future__ import annotations
 from collections import namedtuple
-from typing import Optional
+from array import array
+from typing import Iterable, Iterator, Optional
+import hashlib
 import re
 import pkgutil
+import threading
+import time
 from ua_parser import user_agent_parser
 from ua_parser._regexes import USER_AGENT_PARSERS
-import yaml
+from .columns import Columns
+from .instrumentation import Instrumentation
+from .lrucache import CacheInfo, LRUCache
+from .rulematcher import RuleMatch, RuleMatcher
 
 UserAgent = namedtuple('UserAgent', ['family', 'major', 'minor', 'patch'])
 
+class ParsedUserAgents:
+    """The parse results of a column of user agents, stored once per distinct value.
+
+    codes holds, for each row, the index of its value in uniques, and counts how many rows have each value;
+    row results are looked up through the codes rather than copied per row.
+    """
+
+    def __init__(self, codes: array, uniques: list[str], counts: array, parsed: list[UserAgent]) -> None:
+        self.codes = codes
+        self.uniques = uniques
+        self.counts = counts
+        self.parsed = parsed
+
+    @staticmethod
+    def factorize(values: Iterable[str]) -> tuple[array, list[str], array]:
+        """Returns the int32 code of each value, the distinct values in order of first appearance and their counts;
+        nulls count as an empty string."""
+        code_by_value: dict[str, int] = {}
+        codes = array("i")
+        counts = array("q")
+        for value in Columns.strings(values):
+            code = code_by_value.get(value)
+            if code is None:
+                code = code_by_value[value] = len(counts)
+                counts.append(0)
+            codes.append(code)
+            counts[code] += 1
+
+        return codes, list(code_by_value), counts
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> UserAgent:
+        return self.parsed[self.codes[row]]
+
+    def __iter__(self) -> Iterator[UserAgent]:
+        parsed = self.parsed
+        return (parsed[code] for code in self.codes)
+
+    def column(self, field: str) -> list[Optional[str]]:
+        """Returns one field, e.g. 'family', of every row."""
+        position = UserAgent._fields.index(field)
+        values = [entry[position] for entry in self.parsed]
+        return [values[code] for code in self.codes]
+
+    def to_numpy(self):
+        """Returns the rows as a NumPy structured array with object fields named as UserAgent's; requires numpy."""
+        import numpy as np
+
+        codes = np.asarray(memoryview(self.codes))
+        rows = np.empty(len(codes), dtype=[(field, object) for field in UserAgent._fields])
+        for position, field in enumerate(UserAgent._fields):
+            values = np.empty(len(self.parsed), dtype=object)
+            values[:] = [entry[position] for entry in self.parsed]
+            rows[field] = values[codes]
+        return rows
+
 class UserAgentParser:
     """UserAgentParser class to parse user agent string."""
     DEFAULT_PARSER_DATA = USER_AGENT_PARSERS
     KNOWN_CLIENTS_DATA: list[user_agent_parser.UserAgentParser] = []
-    KNOWN_CLIENTS_IN_CHINA_DATA: list[user_agent_parser.UserAgentParser] = []
+    KNOWN_CLIENTS_MATCHER: RuleMatcher = None
+    DEFAULT_MATCHER: RuleMatcher = None
+
+    # When set, '+' is decoded to a space before matching instead of relying on the rules accepting both forms
+    DECODE_PLUS_SIGNS = False
+
+    _INITIALIZED = False
+    _INIT_LOCK = threading.Lock()
 
     @classmethod
     def __static_init__(cls):
-        cls.KNOWN_CLIENTS_DATA = cls._load_known_clients_parser()
-        cls.KNOWN_CLIENTS_IN_CHINA_DATA = cls._load_known_clients_in_china_parser()
+        """Builds the rule matchers, from the precompiled rules when they are in sync with the YAML and the
+        installed ua_parser rules, otherwise from the YAML itself."""
+        precompiled = cls._load_precompiled_rules()
+        if precompiled is not None and precompiled.KNOWN_CLIENTS_YAML_SHA256 == cls.known_clients_fingerprint():
+            cls.KNOWN_CLIENTS_DATA = cls._create_parser_data(precompiled.KNOWN_CLIENTS_RULES)
+            cls.KNOWN_CLIENTS_MATCHER = RuleMatcher(cls.KNOWN_CLIENTS_DATA, precompiled.KNOWN_CLIENTS_LITERALS)
+        else:
+            cls.KNOWN_CLIENTS_DATA = cls._load_known_clients_parser()
+            cls.KNOWN_CLIENTS_MATCHER = RuleMatcher(cls.KNOWN_CLIENTS_DATA)
+
+        if precompiled is not None and precompiled.DEFAULT_RULES_SHA256 == cls.default_rules_fingerprint():
+            cls.DEFAULT_MATCHER = RuleMatcher(cls.DEFAULT_PARSER_DATA, precompiled.DEFAULT_LITERALS)
+        else:
+            cls.DEFAULT_MATCHER = RuleMatcher(cls.DEFAULT_PARSER_DATA)
+
+    @classmethod
+    def _ensure_initialized(cls):
+        """Builds the rule matchers on first use rather than at import, once even with concurrent callers."""
+        if cls._INITIALIZED:
+            return
+
+        with cls._INIT_LOCK:
+            if not cls._INITIALIZED:
+                cls.__static_init__()
+                cls._INITIALIZED = True
+
+    @staticmethod
+    def _load_precompiled_rules():
+        try:
+            from . import precompiledrules
+        except ImportError:
+            return None
+        return precompiledrules
+
+    @staticmethod
+    def known_clients_fingerprint() -> str:
+        """Returns the hash of knownclients.yaml the precompiled rules are checked against."""
+        return hashlib.sha256(pkgutil.get_data(__name__, 'knownclients.yaml')).hexdigest()
+
+    @staticmethod
+    def default_rules_fingerprint() -> str:
+        """Returns the hash of the installed ua_parser rule patterns the precompiled literals are checked against."""
+        patterns = "\n".join(parser.pattern for parser in UserAgentParser.DEFAULT_PARSER_DATA)
+        return hashlib.sha256(patterns.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def rules_version(known_clients_yaml: Optional[bytes] = None) -> str:
+        """Identifies the rules user agents are parsed with: knownclients.yaml, the ua_parser rules and the '+' decoding mode.
+
+        Results recorded under another version may differ from what parse returns now. known_clients_yaml
+        gives the version of another known clients YAML instead of the one in use.
+        """
+        known_clients = hashlib.sha256(known_clients_yaml).hexdigest() if known_clients_yaml is not None else UserAgentParser.known_clients_fingerprint()
+        version = f"{known_clients}:{UserAgentParser.default_rules_fingerprint()}:{int(UserAgentParser.DECODE_PLUS_SIGNS)}"
+        return hashlib.sha256(version.encode("utf-8")).hexdigest()
 
     @staticmethod
     def _load_known_clients_parser():
-        yaml_content = UserAgentParser._read_known_clients_yaml()
-        return UserAgentParser._create_parser_data_from_yaml(yaml_content)
+        """Known client rules accept both the space separated form and the '+' encoded form the China CDN logs."""
+        return UserAgentParser._create_parser_data(UserAgentParser._load_known_clients_rules())
 
     @staticmethod
-    def _load_known_clients_in_china_parser():
+    def _load_known_clients_rules() -> list[tuple]:
         yaml_content = UserAgentParser._read_known_clients_yaml()
         patched_yaml = UserAgentParser._add_support_for_china_cdn(yaml_content)
-        return UserAgentParser._create_parser_data_from_yaml(patched_yaml)
+        return UserAgentParser._create_rules_from_yaml(patched_yaml)
 
     @staticmethod
     def _add_support_for_china_cdn(yaml_content):
         patched_yaml = re.sub(
             r"(?:[:]\s'\()+([\w\-.\s]+)(?:\))+",
-            UserAgentParser._replace_whitespace_with_plus_sign,
+            UserAgentParser._accept_whitespace_or_plus_sign,
             yaml_content,
             flags=re.DOTALL
         )
         return patched_yaml
 
     @staticmethod
-    def _replace_whitespace_with_plus_sign(match):
-        return ": '(" + match.group(1).replace(" ", r"\+") + ")"
+    def _accept_whitespace_or_plus_sign(match):
+        return ": '(" + match.group(1).replace(" ", "[ +]") + ")"
 
     @staticmethod
     def _read_known_clients_yaml() -> str:
@@ -52,9 +177,16 @@ class UserAgentParser:
 
     @staticmethod
     def _create_parser_data_from_yaml(yaml_content) -> list[user_agent_parser.UserAgentParser]:
+        return UserAgentParser._create_parser_data(UserAgentParser._create_rules_from_yaml(yaml_content))
+
+    @staticmethod
+    def _create_rules_from_yaml(yaml_content) -> list[tuple]:
+        """Returns the (regex, family_replacement, v1_replacement, v2_replacement) of every rule in the YAML."""
+        # imported here so loading the precompiled rules doesn't pay for importing yaml
+        import yaml
         data = yaml.safe_load(yaml_content)
 
-        parsers: list[user_agent_parser.UserAgentParser] = []
+        rules = []
 
         for parser in data["user_agent_parsers"]:
             regex = parser["regex"]
@@ -63,57 +195,152 @@ class UserAgentParser:
             v1_replacement = parser.get("v1_replacement")
             v2_replacement = parser.get("v2_replacement")
 
-            parsers.append(
-                user_agent_parser.UserAgentParser(
-                    regex, family_replacement, v1_replacement, v2_replacement
-                )
-            )
+            rules.append((regex, family_replacement, v1_replacement, v2_replacement))
 
-        return parsers
+        return rules
 
-    _MAX_CACHE_SIZE = 200
-    _PARSE_CACHE: dict[str, UserAgent] = {}
+    @staticmethod
+    def _create_parser_data(rules) -> list[user_agent_parser.UserAgentParser]:
+        return [user_agent_parser.UserAgentParser(regex, family_replacement, v1_replacement, v2_replacement)
+                for regex, family_replacement, v1_replacement, v2_replacement in rules]
+
+    _MAX_CACHE_SIZE = 10000
+    _PARSE_CACHE: LRUCache[str, UserAgent] = LRUCache(_MAX_CACHE_SIZE)
 
     @staticmethod
-    def _lookup(ua: str) -> Optional[UserAgent]:
+    def set_cache_size(size: int) -> None:
+        """Changes how many parsed user agents are kept, evicting the least recently used ones if it shrinks."""
+        UserAgentParser._PARSE_CACHE.resize(size)
 
-        entry = UserAgentParser._PARSE_CACHE.get(ua)
-        if entry is not None:
-            return entry
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        """Returns the hit, miss and eviction counters of the parse cache."""
+        return UserAgentParser._PARSE_CACHE.info()
 
-        if len(UserAgentParser._PARSE_CACHE) >= UserAgentParser._MAX_CACHE_SIZE:
-            UserAgentParser._PARSE_CACHE.clear()
+    @staticmethod
+    def set_plus_sign_decoding(enabled: bool) -> None:
+        """Switches decoding '+' to a space before matching on or off, dropping results cached in the other mode,
+        the classifications of UserAgentClassifier included."""
+        from .useragentclassifier import UserAgentClassifier
 
-        return None
+        UserAgentParser.DECODE_PLUS_SIGNS = enabled
+        UserAgentParser._PARSE_CACHE.clear()
+        UserAgentClassifier._CLASSIFY_CACHE.clear()
+
+    @staticmethod
+    def warm_up(user_agent_string: str) -> None:
+        """Builds the rule matchers and runs a user agent through them, leaving the cache and the instrumentation untouched."""
+        UserAgentParser._ensure_initialized()
+        normalized = user_agent_string.replace("+", " ") if UserAgentParser.DECODE_PLUS_SIGNS else user_agent_string
+        UserAgentParser.KNOWN_CLIENTS_MATCHER.match(normalized)
+        UserAgentParser.DEFAULT_MATCHER.match(normalized)
+
+    @staticmethod
+    def _lookup(ua: str) -> Optional[UserAgent]:
+        return UserAgentParser._PARSE_CACHE.get(ua)
 
     @staticmethod
     def parse(user_agent_string):
-        """Parse using known clients parser, then known clients in China parser, then default parser."""
+        """Parse using known clients parser (standard and China CDN forms), then default parser."""
         entry = UserAgentParser._lookup(user_agent_string)
 
         if entry is not None:
+            if Instrumentation.ENABLED:
+                Instrumentation.increment("useragentparser.parse.resolved_by.cache")
             return entry
 
-        # Try known clients parser
-        entry = UserAgentParser._parse_user_agent_with_parsers(user_agent_string, UserAgentParser.KNOWN_CLIENTS_DATA)
+        entry = UserAgentParser._parse_uncached(user_agent_string)
+        UserAgentParser._PARSE_CACHE.put(user_agent_string, entry)
+        return entry
+
+    @staticmethod
+    def parse_batch(user_agent_strings: Iterable[str]) -> ParsedUserAgents:
+        """Parses a column of user agents (see Columns), each distinct value once, the most frequent first.
 
-        if entry.family.lower() == 'other': # Try China parser
-            entry = UserAgentParser._parse_user_agent_with_parsers(user_agent_string, UserAgentParser.KNOWN_CLIENTS_IN_CHINA_DATA)
+        Nulls are parsed as an empty user agent. Only as many distinct values as the parse cache holds go through it, the most frequent ones,
+        so the long tail of a batch doesn't evict its head.
+        """
+        codes, uniques, counts = ParsedUserAgents.factorize(user_agent_strings)
+        parsed: list[Optional[UserAgent]] = [None] * len(uniques)
+        capacity = UserAgentParser._PARSE_CACHE.maxsize
 
-        if entry.family.lower() == 'other': # Try default parser
-            entry = UserAgentParser._parse_user_agent_with_parsers(user_agent_string, UserAgentParser.DEFAULT_PARSER_DATA)
+        for rank, code in enumerate(sorted(range(len(uniques)), key=counts.__getitem__, reverse=True)):
+            user_agent_string = uniques[code]
+            if rank < capacity:
+                parsed[code] = UserAgentParser.parse(user_agent_string)
+            else:
+                # the tail doesn't count in the cache's statistics, as it doesn't go through the cache
+                parsed[code] = UserAgentParser._PARSE_CACHE.peek(user_agent_string) or UserAgentParser._parse_uncached(user_agent_string)
 
-        UserAgentParser._PARSE_CACHE[user_agent_string] = entry
+        return ParsedUserAgents(codes, uniques, counts, parsed)
+
+    @staticmethod
+    def _parse_uncached(user_agent_string: str) -> UserAgent:
+        UserAgentParser._ensure_initialized()
+        entry, stage = UserAgentParser._parse_with_matcher(user_agent_string, UserAgentParser.KNOWN_CLIENTS_MATCHER)
+
+        if Instrumentation.ENABLED:
+            Instrumentation.increment(f"useragentparser.parse.resolved_by.{stage}")
         return entry
 
     @staticmethod
-    def _parse_user_agent_with_parsers(user_agent_string: str, parsers: list[user_agent_parser.UserAgentParser]) -> UserAgent:
-        for ua_parser in parsers:
-            family, v1, v2, v3 = ua_parser.Parse(user_agent_string)
-            if family:
-                break
+    def create_known_clients_matcher(yaml_content: str) -> RuleMatcher:
+        """Builds a matcher for a known clients YAML other than the one in use, e.g. to preview a rule change."""
+        return RuleMatcher(UserAgentParser._create_parser_data(UserAgentParser._create_rules_from_yaml(UserAgentParser._add_support_for_china_cdn(yaml_content))))
 
-        family = family or "Other"
-        return UserAgent(family, v1 or None, v2 or None, v3 or None)
+    @staticmethod
+    def parse_with_known_clients(user_agent_string: str, known_clients_matcher: RuleMatcher) -> UserAgent:
+        """Parses as parse does, with the known client rules of the given matcher, bypassing the parse cache."""
+        UserAgentParser._ensure_initialized()
+        return UserAgentParser._parse_with_matcher(user_agent_string, known_clients_matcher)[0]
+
+    @staticmethod
+    def _parse_with_matcher(user_agent_string: str, known_clients_matcher: RuleMatcher) -> tuple[UserAgent, str]:
+        normalized = user_agent_string.replace("+", " ") if UserAgentParser.DECODE_PLUS_SIGNS else user_agent_string
+
+        # Try known clients parser
+        match = UserAgentParser._match_with_matcher(normalized, known_clients_matcher, "known_clients")
+        entry = UserAgentParser._to_user_agent(match)
+        stage = "known_clients"
+
+        if entry.family.lower() == 'other': # Try default parser
+            entry = UserAgentParser._parse_user_agent_with_matcher(normalized, UserAgentParser.DEFAULT_MATCHER, "default")
+            stage = "default" if entry.family.lower() != 'other' else "unmatched"
+        elif normalized is not user_agent_string or UserAgentParser._matched_plus_sign(user_agent_string, known_clients_matcher.parsers[match.index]):
+            # the '+' encoded form only the China CDN logs
+            stage = "china_cdn"
+
+        return entry, stage
+
+    @staticmethod
+    def _matched_plus_sign(user_agent_string: str, parser: user_agent_parser.UserAgentParser) -> bool:
+        """Whether the rule only matches because of the China CDN rewrite of its spaces to [ +]."""
+        if "+" not in user_agent_string or "[ +]" not in parser.pattern:
+            return False
+        return re.search(parser.pattern.replace("[ +]", " "), user_agent_string, parser.user_agent_re.flags) is None
+
+    @staticmethod
+    def _parse_user_agent_with_matcher(user_agent_string: str, matcher: RuleMatcher, rules: str = None) -> UserAgent:
+        return UserAgentParser._to_user_agent(UserAgentParser._match_with_matcher(user_agent_string, matcher, rules))
+
+    @staticmethod
+    def _match_with_matcher(user_agent_string: str, matcher: RuleMatcher, rules: str = None) -> Optional[RuleMatch]:
+        if not Instrumentation.ENABLED:
+            return matcher.match(user_agent_string)
+
+        start = time.perf_counter_ns()
+        match = matcher.match(user_agent_string)
+        elapsed = time.perf_counter_ns() - start
+        # which rule matched, and the time spent until it did, to find the rules costing the most
+        rule = f"rule_{match.index}" if match is not None else "no_match"
+        Instrumentation.observe(f"useragentparser.{rules}.time", elapsed)
+        Instrumentation.increment(f"useragentparser.{rules}.{rule}.hits")
+        Instrumentation.increment(f"useragentparser.{rules}.{rule}.time_ns", elapsed)
+        return match
+
+    @staticmethod
+    def _to_user_agent(match: Optional[RuleMatch]) -> UserAgent:
+        if match is None:
+            return UserAgent("Other", None, None, None)
 
-UserAgentParser.__static_init__()
+        return UserAgent(match.family, match.v1 or None, match.v2 or None, match.v3 or None)
@@ -0,0 +1,18 @@
+"""
+CDN log lines and files shared by the log processing tests
+"""
+import gzip
+
+LOG_LINE_FORMAT = '{0} 27 127.0.0.1 126908 127.0.0.1 443 TCP_HIT/200 127213 GET {1} - 0 0 - "{2}" 123 "-"'
+NUPKG_URL = "https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3/newtonsoft.json.13.0.3.nupkg"
+EXE_URL = "/win-x86-commandline/v5.11.6/nuget.exe"
+INDEX_URL = "https://api.nuget.org/v3/index.json"
+NUGET_USER_AGENT = "NuGet Command Line/6.8.0 (Microsoft Windows NT 10.0.22621.0)"
+
+def log_line(timestamp, request_url=NUPKG_URL, user_agent=NUGET_USER_AGENT):
+    return LOG_LINE_FORMAT.format(timestamp, request_url, user_agent)
+
+def write_log(path, lines, compress=False):
+    content = "\n".join(lines).encode("utf-8")
+    path.write_bytes(gzip.compress(content) if compress else content)
+    return str(path)
@@ -0,0 +1,19 @@
+import pytest
+
+from tests.cdnlogs import EXE_URL, INDEX_URL, log_line, write_log
+
+@pytest.fixture
+def log_files(tmp_path):
+    """A plain log with a header, two downloads, a malformed line and a request that isn't a download, an empty
+    log, and a gzipped log with two downloads."""
+    return [
+        write_log(tmp_path / "first.log", [
+            "#Fields: timestamp",
+            log_line(1433257489),
+            log_line(1433257490),
+            "malformed",
+            log_line(1433257491, INDEX_URL)]),
+        write_log(tmp_path / "empty.log", []),
+        write_log(tmp_path / "second.log.gz", [
+            log_line(1433257491),
+            log_line(1433257492, EXE_URL, "curl/7.21.0")], compress=True)]
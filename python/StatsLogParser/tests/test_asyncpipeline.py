@@ -0,0 +1,91 @@
+import csv
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import islice
+import pytest
+
+from loginterpretation import asyncpipeline
+from loginterpretation.asyncpipeline import AsyncLogPipeline
+from loginterpretation.logprocessor import LogProcessor
+from tests.cdnlogs import log_line
+
+def read_partition(output_path):
+    with open(output_path, encoding="utf-8", newline="") as partition:
+        return list(csv.reader(partition, delimiter="\t"))
+
+@pytest.mark.parametrize("batch_size,workers", [(1, 1), (2, 2), (10000, 1)])
+def test_process_files(tmp_path, log_files, batch_size, workers):
+    summary = AsyncLogPipeline(batch_size=batch_size, queue_size=1, workers=workers).run(log_files, str(tmp_path / "output"))
+
+    assert [result.path for result in summary.files] == log_files
+    assert [result.records for result in summary.files] == [2, 0, 2]
+    assert summary.records == 4
+    assert summary.errors == 1
+    assert dict(summary.downloads.items()) == {
+        ("newtonsoft.json", "13.0.3", "NuGet Command Line", "NuGet", date(2015, 6, 2)): 3,
+        ("tool/nuget.exe", "5.11.6", "curl", "Script", date(2015, 6, 2)): 1}
+
+def test_partitions_match_log_processor(tmp_path, log_files):
+    expected = LogProcessor.process_files(log_files, str(tmp_path / "expected"), 1)
+    summary = AsyncLogPipeline(batch_size=2, executor=ThreadPoolExecutor(2)).run(log_files, str(tmp_path / "output"))
+
+    for result, expected_result in zip(summary.files, expected.files):
+        assert read_partition(result.output_path) == read_partition(expected_result.output_path)
+    assert read_partition(summary.files[1].output_path) == [list(LogProcessor.OUTPUT_COLUMNS)]
+
+def test_parse_batch():
+    records, error_count = AsyncLogPipeline.parse_batch(["malformed", log_line(1433257489)], 41)
+
+    assert error_count == 1
+    assert [record.package_id for record in records] == ["newtonsoft.json"]
+
+def test_failure_stops_the_pipeline(tmp_path, log_files):
+    def opener(path):
+        if path.endswith(".gz"):
+            raise OSError("unavailable")
+        return open(path, encoding="utf-8")
+
+    with pytest.raises(OSError):
+        AsyncLogPipeline(batch_size=1, queue_size=1, workers=1, opener=opener).run(log_files, str(tmp_path / "output"))
+
+def test_failure_removes_the_partial_partition_and_waits_for_parsing(tmp_path, log_files, monkeypatch):
+    parsing = []
+    started = threading.Event()
+    released = threading.Event()
+    parse_batch = AsyncLogPipeline.parse_batch
+    wait = asyncpipeline.wait
+
+    def blocked_parse_batch(lines, first_line_number):
+        # batches stay in the parser until the pipeline, having failed, waits for them
+        parsing.append(first_line_number)
+        started.set()
+        released.wait(10)
+        parsing.remove(first_line_number)
+        return parse_batch(lines, first_line_number)
+
+    def release_and_wait(futures):
+        released.set()
+        return wait(futures)
+
+    def opener(path):
+        with open(path, encoding="utf-8") as lines:
+            yield from islice(lines, 3)
+        started.wait(10)
+        raise OSError("connection reset")
+
+    monkeypatch.setattr(AsyncLogPipeline, "parse_batch", staticmethod(blocked_parse_batch))
+    monkeypatch.setattr(asyncpipeline, "wait", release_and_wait)
+    output_dir = tmp_path / "output"
+    with ThreadPoolExecutor(2) as executor:
+        with pytest.raises(OSError):
+            AsyncLogPipeline(batch_size=1, queue_size=2, executor=executor, opener=opener).run(log_files, str(output_dir))
+
+        assert released.is_set()
+        assert parsing == []
+    assert os.listdir(output_dir) == []
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.run import BenchmarkResult, compare, differences, machine, run_parameters
+
+def result(ops_per_sec):
+    return BenchmarkResult("NuGetVersion.parse", 1000, ops_per_sec, 1.0, 2.0, None, 0)
+
+def baseline(ops_per_sec, **parameters):
+    return {**run_parameters(1000, 42), **machine(), **parameters, "results": {"NuGetVersion.parse": {"ops_per_sec": ops_per_sec}}}
+
+def test_compare_reports_regressions_beyond_the_tolerance():
+    parameters = run_parameters(1000, 42)
+
+    assert compare([result(90)], baseline(100), 0.2, parameters) == []
+    assert compare([result(70)], baseline(100), 0.2, parameters) == ["NuGetVersion.parse: 70 ops/sec, baseline 100"]
+
+@pytest.mark.parametrize("parameters", [{"rows": 20000}, {"seed": 7}, {"python": "2.7.18"}])
+def test_compare_refuses_baselines_of_other_runs(parameters):
+    with pytest.raises(ValueError, match=next(iter(parameters))):
+        compare([result(100)], baseline(100, **parameters), 0.2, run_parameters(1000, 42))
+
+def test_differences_tell_another_machine():
+    assert differences(baseline(100), machine()) == []
+    assert differences(baseline(100, host="0"), machine()) == [f"host is '0' in the baseline and {machine()['host']!r} here"]
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
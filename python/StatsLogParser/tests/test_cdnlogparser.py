@@ -0,0 +1,70 @@
+import gzip
+from datetime import datetime, timezone
+import pytest
+
+from loginterpretation.cdnlogparser import CdnLogParser
+
+LOG_LINES = [
+    "#Fields: timestamp time-taken c-ip filesize s-ip s-port sc-status sc-bytes cs-method cs-uri-stem - rs-duration rs-bytes c-referrer c-user-agent customer-id x-ec_custom-1",
+    '1433257489 27 127.0.0.1 126908 127.0.0.1 443 TCP_HIT/200 127213 GET https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3/newtonsoft.json.13.0.3.nupkg - 0 0 - "NuGet Command Line/6.8.0 (Microsoft Windows NT 10.0.22621.0)" 123 "NuGet-Operation: - NuGet-DependentPackage: - NuGet-ProjectGuids: -"',
+    '1433257490 27 127.0.0.1 126908 127.0.0.1 443 TCP_MISS/404 127213 GET https://api.nuget.org/v3-flatcontainer/missing/1.0.0/missing.1.0.0.nupkg - 0 0 - "NuGet Command Line/6.8.0" 123 "-"',
+    '1433257491 27 127.0.0.1 126908 127.0.0.1 443 TCP_MISS/504 127213 GET https://api.nuget.org/v3-flatcontainer/failed/1.0.0/failed.1.0.0.nupkg - 0 0 - "NuGet Command Line/6.8.0" 123 "-"',
+    '1433257492 27 127.0.0.1 126908 127.0.0.1 443 200 127213 GET /win-x86-commandline/v5.11.6/nuget.exe - 0 0 - "curl/7.21.0" 123 "-"',
+    '1433257493 27 127.0.0.1 126908 127.0.0.1 443 TCP_HIT/200 127213 GET https://api.nuget.org/v3/index.json - 0 0 - "NuGet Command Line/6.8.0" 123 "-"',
+    "",
+]
+
+def test_get_log_line_records_keeps_quoted_records_together():
+    records = CdnLogParser.get_log_line_records('1 2 "a b c" 3 "x"')
+    assert records == ["1", "2", '"a b c"', "3", '"x"']
+
+def test_parse_log_entry():
+    entry = CdnLogParser.parse_log_entry(2, LOG_LINES[1])
+
+    assert entry.edge_server_time_delivered == datetime(2015, 6, 2, 15, 4, 49, tzinfo=timezone.utc)
+    assert entry.edge_server_time_taken == 27
+    assert entry.cache_status_code == "TCP_HIT/200"
+    assert entry.http_method == "GET"
+    assert entry.referrer == ""
+    assert entry.user_agent == '"NuGet Command Line/6.8.0 (Microsoft Windows NT 10.0.22621.0)"'
+    assert entry.customer_id == "123"
+
+@pytest.mark.parametrize("line_index", [0, 2, 3, 6])
+def test_parse_log_entry_skips_comments_errors_and_blank_lines(line_index):
+    assert CdnLogParser.parse_log_entry(line_index + 1, LOG_LINES[line_index]) is None
+
+def test_parse_log_entry_reports_malformed_lines():
+    errors = []
+
+    entry = CdnLogParser.parse_log_entry(7, "not a timestamp", lambda e, line_number: errors.append(line_number))
+
+    assert entry is None and errors == [7]
+    with pytest.raises(ValueError):
+        CdnLogParser.parse_log_entry(7, "not a timestamp")
+
+@pytest.mark.parametrize("timestamp", ["inf", "1e20", "-1e18", "nan"])
+def test_parse_log_entries_reports_timestamps_out_of_range(timestamp):
+    errors = []
+
+    entries = list(CdnLogParser.parse_log_entries(
+        [LOG_LINES[1].replace("1433257489", timestamp, 1), LOG_LINES[4]], lambda e, line_number: errors.append(line_number), 1))
+
+    assert errors == [1]
+    assert [entry.edge_server_time_delivered for entry in entries] == [datetime(2015, 6, 2, 15, 4, 52, tzinfo=timezone.utc)]
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_read_download_records(tmp_path, compress):
+    path = tmp_path / "log.txt"
+    content = "\n".join(LOG_LINES).encode("utf-8")
+    path.write_bytes(gzip.compress(content) if compress else content)
+
+    records = list(CdnLogParser.read_download_records(str(path)))
+
+    assert [(r.package_id, r.package_version, r.client_family, r.client_category) for r in records] == [
+        ("newtonsoft.json", "13.0.3", "NuGet Command Line", "NuGet"),
+        ("tool/nuget.exe", "5.11.6", "curl", "Script")]
+    assert records[0].user_agent == "NuGet Command Line/6.8.0 (Microsoft Windows NT 10.0.22621.0)"
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -1,6 +1,6 @@
 import sys
 sys.path.append('..') # This is to add the parent directory to the path so that the module can be imported
-from loginterpretation.clientnametranslation import ClientNameTranslation
+from loginterpretation.clientnametranslation import ClientCategoryMatcher, ClientNameTranslation
 import pytest
 
 @pytest.mark.parametrize("expected_category,client_name", [
@@ -19,6 +19,27 @@ def test_clientname_returns_correct_category(expected_category, client_name):
     found =  ClientNameTranslation.get_client_category(client_name)
     assert found and found == expected_category
 
+@pytest.mark.parametrize("expected_category,client_name", [
+    ("NuGet", "NuGet Command Line Bot"),
+    ("Script", "Java"),
+    ("Crawler", "Mobile Spider"),
+    ("Browser", "IE"),
+    ("Browser", " iron "),
+    ("Unknown", "PhantomJS"),
+    ("Unknown", "Python Requests"),
+    ("", "Iron Python"),
+    ("", "Paket"),
+    ("", " "),
+    ("", None)])
+def test_clientname_returns_highest_priority_category(expected_category, client_name):
+    assert ClientNameTranslation.get_client_category(client_name) == expected_category
+
+def test_category_matcher_finds_categories_without_the_cache():
+    matcher = ClientCategoryMatcher()
+    assert matcher.get_client_category("NuGet VS VSIX") == "NuGet"
+    assert matcher.get_client_category("BINGPREVIEW") == "Crawler"
+    assert matcher.get_client_category("Cake") == ""
+
 # To invoke the pytest framework and run all tests
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,128 @@
+from datetime import datetime, timezone
+import pytest
+
+from loginterpretation.cdnlogparser import DownloadRecord
+from loginterpretation.columnarrecords import ColumnarRecordReader, ColumnarRecordWriter
+from loginterpretation.downloadaggregator import DownloadAggregator
+from tests.cdnlogs import NUGET_USER_AGENT, NUPKG_URL
+
+def record(timestamp, package_id="newtonsoft.json", package_version="13.0.3", user_agent=NUGET_USER_AGENT, family="NuGet Command Line", patch="0", category="NuGet"):
+    return DownloadRecord(timestamp, package_id, package_version, user_agent, family, "6", "8", patch, category, NUPKG_URL)
+
+RECORDS = [
+    record(datetime(2015, 6, 2, 15, 4, 49, tzinfo=timezone.utc)),
+    record(datetime(2015, 6, 2, 15, 4, 50, 250000, tzinfo=timezone.utc), package_version="13.0.3+metadata"),
+    record(datetime(2015, 6, 3, 0, 0, tzinfo=timezone.utc), package_id="Ünïcode.Package", family="curl", patch=None, category=""),
+    record(datetime(1969, 12, 31, 23, 59, 59, tzinfo=timezone.utc), user_agent=None)]
+
+@pytest.fixture
+def path(tmp_path):
+    writer = ColumnarRecordWriter()
+    assert writer.add_records(RECORDS) == len(RECORDS)
+    path = str(tmp_path / "records.bin")
+    writer.write(path)
+    return path
+
+def test_round_trip(path):
+    with ColumnarRecordReader.open(path) as reader:
+        assert len(reader) == len(RECORDS)
+        assert list(reader) == RECORDS
+
+def test_round_trip_from_bytes():
+    writer = ColumnarRecordWriter()
+    writer.add_records(RECORDS)
+
+    assert list(ColumnarRecordReader(writer.to_bytes())) == RECORDS
+
+def test_codes_are_dictionary_indices(path):
+    with ColumnarRecordReader.open(path) as reader:
+        assert reader.dictionary("package_id") == [None, "newtonsoft.json", "Ünïcode.Package"]
+        assert list(reader.codes("package_id")) == [1, 1, 2, 1]
+        assert list(reader.codes("user_agent")) == [1, 1, 1, 0]
+        assert reader.codes("package_id").itemsize == 1
+        assert reader.timestamps()[0] == 1433257489_000000
+
+def test_code_width_grows_with_the_dictionary():
+    writer = ColumnarRecordWriter()
+    writer.add_records(record(datetime(2015, 6, 2, tzinfo=timezone.utc), package_version=f"1.0.{patch}") for patch in range(300))
+    reader = ColumnarRecordReader(writer.to_bytes())
+
+    assert reader.codes("package_version").itemsize == 2
+    assert reader.codes("package_id").itemsize == 1
+    assert [item.package_version for item in reader][-1] == "1.0.299"
+
+def test_empty_file():
+    reader = ColumnarRecordReader(ColumnarRecordWriter().to_bytes())
+
+    assert len(reader) == 0
+    assert list(reader) == []
+    assert reader.dictionary("package_id") == [None]
+
+def test_aggregate_matches_download_aggregator(path):
+    expected = DownloadAggregator()
+    expected.add_records(RECORDS)
+
+    with ColumnarRecordReader.open(path) as reader:
+        aggregated = reader.aggregate()
+
+    assert dict(aggregated.items()) == dict(expected.items())
+    assert aggregated.total == len(RECORDS)
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        ColumnarRecordReader(b"NGPKGIDX" + bytes(16))
+
+def test_records_need_a_timestamp():
+    with pytest.raises(ValueError):
+        ColumnarRecordWriter().add(record(None))
+
+def test_too_many_distinct_values_raise(monkeypatch):
+    monkeypatch.setattr(ColumnarRecordWriter, "_CODE_TYPECODES", {1: "b"})
+    writer = ColumnarRecordWriter()
+    writer.add_records(record(RECORDS[0].timestamp, package_id=f"package{index}") for index in range(200))
+
+    with pytest.raises(ValueError, match="package_id"):
+        writer.to_bytes()
+
+def test_to_arrow(path):
+    pytest.importorskip("pyarrow")
+
+    with ColumnarRecordReader.open(path) as reader:
+        table = reader.to_arrow()
+        assert table.column_names == list(DownloadRecord._fields)
+        assert table.column("package_id").to_pylist() == [item.package_id for item in RECORDS]
+        assert table.column("user_agent").to_pylist()[-1] is None
+
+    # the table outlives the reader
+    assert table.column("package_id").to_pylist() == [item.package_id for item in RECORDS]
+
+def test_to_arrow_keeps_nulls_out_of_the_dictionaries(path):
+    pytest.importorskip("pyarrow")
+
+    with ColumnarRecordReader.open(path) as reader:
+        table = reader.to_arrow()
+
+    patches = table.column("client_patch").combine_chunks()
+    assert patches.null_count == 1
+    assert None not in patches.dictionary.to_pylist()
+    assert table.column("user_agent").null_count == 1
+
+def test_write_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    writer = ColumnarRecordWriter()
+    writer.add_records(RECORDS)
+    path = str(tmp_path / "records.parquet")
+
+    writer.write_parquet(path)
+    table = pq.read_table(path)
+
+    assert table.column_names == list(DownloadRecord._fields)
+    assert table.num_rows == len(RECORDS)
+    for name in DownloadRecord._fields[1:]:
+        assert table.column(name).to_pylist() == [getattr(item, name) for item in RECORDS]
+    assert table.column("client_patch").null_count == 1
+    assert table.column("timestamp").to_pylist() == [item.timestamp for item in RECORDS]
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
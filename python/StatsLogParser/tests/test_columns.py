@@ -0,0 +1,27 @@
+import pytest
+
+from loginterpretation.columns import Columns
+
+def test_to_list():
+    values = ["a", None, "b"]
+
+    assert Columns.to_list(values) is values
+    assert Columns.to_list(value for value in values) == values
+    assert Columns.to_list(("a", None)) == ["a", None]
+
+def test_to_list_converts_arrays_in_one_call():
+    pa = pytest.importorskip("pyarrow")
+
+    assert Columns.to_list(pa.array(["a", None, "b"])) == ["a", None, "b"]
+
+def test_to_list_converts_pandas_series():
+    pd = pytest.importorskip("pandas")
+
+    assert Columns.to_list(pd.Series(["a", None, "b"], dtype=object)) == ["a", None, "b"]
+
+def test_strings_turns_nulls_into_empty_strings():
+    assert Columns.strings(["a", None, float("nan"), 1, "b"]) == ["a", "", "", "", "b"]
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
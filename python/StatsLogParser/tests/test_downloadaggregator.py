@@ -0,0 +1,113 @@
+from datetime import date, datetime, timezone
+import pytest
+
+from loginterpretation.cdnlogparser import DownloadRecord
+from loginterpretation.downloadaggregator import DownloadAggregator, DownloadKey
+from loginterpretation.requestclassifier import RequestClassifier
+
+def record(package_id, package_version, client_family="NuGet Command Line", client_category="NuGet", day=2):
+    return DownloadRecord(datetime(2024, 5, day, 13, 30, tzinfo=timezone.utc), package_id, package_version, "",
+                          client_family, "6", "8", "0", client_category, "")
+
+@pytest.mark.parametrize("version,expected", [
+    ("1.0.0", "1.0.0"),
+    ("1.0.0.0", "1.0.0"),
+    ("01.2.3-Beta", "1.2.3-beta"),
+    ("1.2.3+metadata", "1.2.3"),
+    ("not.a.version", "not.a.version"),
+    (None, None)])
+def test_normalize_version(version, expected):
+    assert DownloadAggregator().normalize_version(version) == expected
+
+def test_add_records_counts_per_key():
+    aggregator = DownloadAggregator()
+
+    added = aggregator.add_records([
+        record("newtonsoft.json", "13.0.3"),
+        record("newtonsoft.json", "13.0.3.0"),
+        record("newtonsoft.json", "13.0.3", "curl", "Script"),
+        record("newtonsoft.json", "13.0.3", day=3)])
+
+    assert added == 4
+    assert len(aggregator) == 3
+    assert aggregator.total == 4
+    assert aggregator.get(DownloadKey("newtonsoft.json", "13.0.3", "NuGet Command Line", "NuGet", date(2024, 5, 2))) == 2
+    assert aggregator.get(DownloadKey("missing", "1.0.0", "NuGet Command Line", "NuGet", date(2024, 5, 2))) == 0
+
+def test_ids_and_versions_are_counted_case_insensitively():
+    aggregator = DownloadAggregator()
+    for url in ("http://localhost/packages/Newtonsoft.Json.13.0.3-Beta.nupkg",
+                "http://localhost/packages/Newtonsoft.Json.13.0.3-Beta.nupkg?packageVersion=13.0.3-Beta",
+                "https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3-beta/newtonsoft.json.13.0.3-beta.nupkg"):
+        package = RequestClassifier.resolve(url)
+        aggregator.add(record(package.package_id, package.package_version))
+
+    assert dict(aggregator.items()) == {
+        DownloadKey("newtonsoft.json", "13.0.3-beta", "NuGet Command Line", "NuGet", date(2024, 5, 2)): 3}
+
+def test_merge_adds_partial_aggregates():
+    first = DownloadAggregator()
+    first.add_records([record("a", "1.0.0"), record("b", "1.0.0")])
+    second = DownloadAggregator()
+    second.add_records([record("a", "1.0.0"), record("c", "2.0.0")])
+
+    merged = DownloadAggregator().merge(first).merge(second)
+
+    assert {key.package_id: count for key, count in merged.items()} == {"a": 2, "b": 1, "c": 1}
+
+def test_keys_are_interned():
+    aggregator = DownloadAggregator()
+    aggregator.add(record("".join(["pack", "age"]), "1.0.0"))
+    aggregator.add(record("".join(["pack", "age"]), "2.0.0"))
+
+    first, second = (key for key, _ in aggregator.items())
+    assert first.package_id is second.package_id
+    assert first.date is second.date
+
+@pytest.mark.parametrize("file_name", ["downloads.tsv", "downloads.tsv.gz"])
+def test_write_and_read_round_trip(tmp_path, file_name):
+    aggregator = DownloadAggregator()
+    aggregator.add_records([record("b", "1.0.0"), record("a", "1.0.0-beta", "curl", "Script"), record("a", "1.0.0-beta", "curl", "Script")])
+    path = str(tmp_path / file_name)
+
+    aggregator.write(path)
+    read = DownloadAggregator.read(path)
+
+    assert dict(read.items()) == dict(aggregator.items())
+    if not file_name.endswith(".gz"):
+        with open(path, encoding="utf-8") as output:
+            assert output.read().splitlines() == [
+                "\t".join(DownloadAggregator.OUTPUT_COLUMNS),
+                "2024-05-02\ta\t1.0.0-beta\tcurl\tScript\t2",
+                "2024-05-02\tb\t1.0.0\tNuGet Command Line\tNuGet\t1"]
+
+def test_read_round_trips_missing_values(tmp_path):
+    aggregator = DownloadAggregator()
+    aggregator.add(record(None, None, None, None))
+    path = str(tmp_path / "downloads.tsv")
+
+    aggregator.write(path)
+
+    assert dict(DownloadAggregator.read(path).items()) == {DownloadKey(None, None, None, "", date(2024, 5, 2)): 1}
+
+def test_read_merges_with_live_counts(tmp_path):
+    live = DownloadAggregator()
+    live.add(record("package", "1.0.0", "Other", ""))
+    live.add(record("package", "1.0.0", "NuGet Command Line", "NuGet"))
+    path = str(tmp_path / "downloads.tsv")
+    live.write(path)
+
+    merged = DownloadAggregator.read(path).merge(live)
+    merged.write(path)
+
+    assert dict(merged.items()) == {
+        DownloadKey("package", "1.0.0", "Other", "", date(2024, 5, 2)): 2,
+        DownloadKey("package", "1.0.0", "NuGet Command Line", "NuGet", date(2024, 5, 2)): 2}
+    with open(path, encoding="utf-8") as output:
+        assert output.read().splitlines()[1:] == [
+            "2024-05-02\tpackage\t1.0.0\tNuGet Command Line\tNuGet\t2",
+            "2024-05-02\tpackage\t1.0.0\tOther\t\t2"]
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,203 @@
+import csv
+import gzip
+import os
+import pytest
+
+from loginterpretation.checkpointstore import CheckpointStore
+from loginterpretation.incrementalprocessor import IncrementalProcessor
+from loginterpretation.logprocessor import LogProcessor
+from loginterpretation.useragentparser import UserAgentParser
+from tests.cdnlogs import EXE_URL, NUPKG_URL, log_line
+
+def log_lines(*timestamps, request_url=NUPKG_URL):
+    return "".join(log_line(timestamp, request_url) + "\n" for timestamp in timestamps)
+
+def append(path, content):
+    with open(path, "a", encoding="utf-8", newline="") as file:
+        file.write(content)
+    # make sure the change is visible even on file systems with a coarse modification time
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def read_timestamps(output_path):
+    with open(output_path, encoding="utf-8", newline="") as partition:
+        return [row[0] for row in list(csv.reader(partition, delimiter="\t"))[1:]]
+
+@pytest.fixture
+def paths(tmp_path):
+    plain = tmp_path / "first.log"
+    plain.write_text("#Fields: timestamp\n" + log_lines(1433257489, 1433257490) + "malformed\n", encoding="utf-8")
+    compressed = tmp_path / "second.log.gz"
+    compressed.write_bytes(gzip.compress(log_lines(1433257491, request_url=EXE_URL).encode("utf-8")))
+    return str(plain), str(compressed), str(tmp_path / "output"), str(tmp_path / "checkpoints.db")
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_first_run_processes_everything(paths, workers):
+    plain, compressed, output_dir, checkpoint_path = paths
+    summary = IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, workers)
+
+    assert [result.records for result in summary.processed.files] == [2, 1]
+    assert summary.processed.errors == 1
+    assert summary.unchanged == []
+    assert summary.reprocessed == []
+
+    with CheckpointStore(checkpoint_path) as store:
+        checkpoints = store.checkpoints()
+        assert [checkpoint.offset for checkpoint in checkpoints] == [os.path.getsize(plain), os.path.getsize(compressed)]
+        assert [checkpoint.lines for checkpoint in checkpoints] == [4, 1]
+        assert [partition.output_path for partition in store.partitions()] == [result.output_path for result in summary.processed.files]
+
+def test_rerun_skips_unchanged_files(paths):
+    plain, compressed, output_dir, checkpoint_path = paths
+    IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, 1)
+    summary = IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, 1)
+
+    assert summary.processed.files == []
+    assert summary.unchanged == [os.path.abspath(plain), os.path.abspath(compressed)]
+
+def test_touched_file_with_same_content_is_unchanged(paths):
+    plain, compressed, output_dir, checkpoint_path = paths
+    IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, 1)
+    append(plain, "")
+    append(compressed, "")
+    summary = IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, 1)
+
+    assert summary.processed.files == []
+    assert len(summary.unchanged) == 2
+
+def test_appended_lines_are_processed_from_the_offset(paths):
+    plain, _, output_dir, checkpoint_path = paths
+    first = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+    append(plain, log_lines(1433257500) + "also malformed\n")
+    second = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+
+    assert second.processed.records == 1
+    assert [result.errors for result in second.processed.files] == [1]
+    assert second.reprocessed == []
+    assert read_timestamps(second.processed.files[0].output_path) == ["2015-06-02 15:05:00+00:00"]
+
+    with CheckpointStore(checkpoint_path) as store:
+        partitions = store.partitions()
+        assert [partition.output_path for partition in partitions] == [first.processed.files[0].output_path, second.processed.files[0].output_path]
+        assert partitions[1].start_offset == partitions[0].end_offset
+        assert store.checkpoints()[0].lines == 6
+
+def test_rewritten_file_replaces_its_partitions(paths):
+    plain, _, output_dir, checkpoint_path = paths
+    first = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+    with open(plain, "w", encoding="utf-8", newline="") as file:
+        file.write(log_lines(1433257501, 1433257502, 1433257503))
+    os.utime(plain, ns=(0, 1))
+    second = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+
+    assert second.processed.records == 3
+    assert second.reprocessed == [os.path.abspath(plain)]
+    assert not os.path.exists(first.processed.files[0].output_path)
+
+    with CheckpointStore(checkpoint_path) as store:
+        assert [partition.output_path for partition in store.partitions()] == [second.processed.files[0].output_path]
+
+def test_changed_bytes_before_the_offset_reprocess_the_file(paths):
+    plain, _, output_dir, checkpoint_path = paths
+    IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+    with open(plain, "r+b") as file:
+        file.seek(-len("malformed\n"), os.SEEK_END)
+        file.write(b"MALFORMED\n")
+    append(plain, log_lines(1433257500))
+    summary = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+
+    assert summary.processed.records == 3
+    assert summary.reprocessed == [os.path.abspath(plain)]
+
+class CountingReader:
+    def __init__(self, file):
+        self.file = file
+        self.read_bytes = 0
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self.file.seek(offset, whence)
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.read_bytes += len(data)
+        return data
+
+def test_fingerprint_reads_two_windows_whatever_the_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(IncrementalProcessor, "_WINDOW_SIZE", 16)
+    path = tmp_path / "large.log"
+    path.write_bytes(bytes(range(256)) * 64)
+
+    with open(path, "rb") as file:
+        reader = CountingReader(file)
+        fingerprint = IncrementalProcessor.fingerprint(reader, 10_000)
+        assert reader.read_bytes == 32
+        assert IncrementalProcessor.fingerprint(file, 10_001) != fingerprint
+        assert IncrementalProcessor.fingerprint(file, 8) != IncrementalProcessor.fingerprint(file, 9)
+
+    with open(path, "r+b") as file:
+        file.seek(9_990)
+        file.write(b"changed")
+        assert IncrementalProcessor.fingerprint(file, 10_000) != fingerprint
+
+def test_unterminated_last_line_is_reprocessed_when_the_file_grows(paths):
+    plain, _, output_dir, checkpoint_path = paths
+    with open(plain, "w", encoding="utf-8", newline="") as file:
+        file.write(log_lines(1433257489).rstrip("\n"))
+    IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+    append(plain, "\n" + log_lines(1433257490))
+    summary = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+
+    assert summary.processed.records == 2
+    assert summary.reprocessed == [os.path.abspath(plain)]
+
+def test_line_breaks_are_read_as_log_processor_reads_them(paths, tmp_path):
+    plain, _, output_dir, checkpoint_path = paths
+    with open(plain, "w", encoding="utf-8", newline="") as file:
+        file.write(log_line(1433257489) + "\r" + log_line(1433257490) + "\r\nmalformed\r" + log_line(1433257491) + "\n")
+
+    summary = IncrementalProcessor.process_files([plain], output_dir, checkpoint_path, 1)
+    expected = LogProcessor.process_files([plain], str(tmp_path / "expected"), 1)
+
+    assert summary.processed.records == expected.records == 3
+    assert summary.processed.errors == expected.errors == 1
+    assert read_timestamps(summary.processed.files[0].output_path) == read_timestamps(expected.files[0].output_path)
+    with CheckpointStore(checkpoint_path) as store:
+        checkpoint = store.checkpoints()[0]
+        assert checkpoint.lines == 4
+        assert checkpoint.offset == os.path.getsize(plain)
+
+def test_rules_change_reprocesses_everything(paths, monkeypatch):
+    plain, compressed, output_dir, checkpoint_path = paths
+    IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, 1)
+    monkeypatch.setattr(UserAgentParser, "known_clients_fingerprint", staticmethod(lambda: "changed"))
+    summary = IncrementalProcessor.process_files([plain, compressed], output_dir, checkpoint_path, 1)
+
+    assert summary.processed.records == 3
+    assert summary.reprocessed == [os.path.abspath(plain), os.path.abspath(compressed)]
+
+    with CheckpointStore(checkpoint_path) as store:
+        assert len(store.partitions()) == 2
+        assert {checkpoint.rules_version for checkpoint in store.checkpoints()} == {UserAgentParser.rules_version()}
+
+def test_rules_version_depends_on_plus_sign_decoding():
+    version = UserAgentParser.rules_version()
+    UserAgentParser.set_plus_sign_decoding(True)
+    try:
+        assert UserAgentParser.rules_version() != version
+    finally:
+        UserAgentParser.set_plus_sign_decoding(False)
+
+def test_checkpoint_store_forget(tmp_path):
+    with CheckpointStore(str(tmp_path / "checkpoints.db")) as store:
+        checkpoint = store.register("a.log")
+        assert store.register("a.log") == checkpoint
+        assert store.next_segment(checkpoint.file_id) == 0
+
+        store.save(checkpoint._replace(offset=10), None)
+        assert store.get("a.log").offset == 10
+        assert store.forget(["a.log", "unknown.log"]) == []
+        assert store.get("a.log") is None
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
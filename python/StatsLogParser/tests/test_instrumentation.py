@@ -0,0 +1,96 @@
+import pytest
+
+from loginterpretation.instrumentation import CounterAccumulatorParam, Instrumentation
+from loginterpretation.packagedefinition import PackageDefinition
+from loginterpretation.useragentparser import UserAgentParser
+
+@pytest.fixture
+def instrumentation():
+    PackageDefinition.clear_caches()
+    Instrumentation.reset()
+    Instrumentation.enable()
+    yield Instrumentation
+    Instrumentation.disable()
+    Instrumentation.reset()
+
+def test_records_nothing_when_disabled():
+    Instrumentation.reset()
+
+    UserAgentParser.parse("NuGet Command Line/4.4.4 (disabled instrumentation test)")
+    PackageDefinition.from_request_url("https://api.nuget.org/v3-flatcontainer/a/1.0.0/a.1.0.0.nupkg")
+
+    assert Instrumentation.to_dict() == {"counters": {}, "histograms": {}}
+
+def test_counts_the_stage_resolving_a_user_agent(instrumentation):
+    UserAgentParser.parse("NuGet Command Line/4.4.5 (instrumentation test)")
+    UserAgentParser.parse("NuGet Command Line/4.4.5 (instrumentation test)")
+    UserAgentParser.parse("NuGet+Command+Line/4.4.5+(instrumentation+test)")
+    UserAgentParser.parse("Mozilla/5.0 (instrumentation test) Chrome/4.4.5")
+    UserAgentParser.parse("no rule matches this 4.4.5 instrumentation test")
+
+    counters = instrumentation.to_dict()["counters"]
+    assert counters["useragentparser.parse.resolved_by.cache"] == 1
+    assert counters["useragentparser.parse.resolved_by.known_clients"] == 1
+    assert counters["useragentparser.parse.resolved_by.china_cdn"] == 1
+    assert counters["useragentparser.parse.resolved_by.default"] == 1
+    assert counters["useragentparser.parse.resolved_by.unmatched"] == 1
+    assert counters["useragentparser.known_clients.no_match.hits"] == 2
+    assert sum(count for name, count in counters.items() if name.startswith("useragentparser.default.rule_") and name.endswith(".hits")) == 1
+
+@pytest.mark.parametrize("decode_plus_signs,expected", [(False, "known_clients"), (True, "china_cdn")])
+def test_counts_a_plus_sign_outside_the_china_cdn_form_as_known_clients(instrumentation, decode_plus_signs, expected):
+    UserAgentParser.set_plus_sign_decoding(decode_plus_signs)
+    try:
+        parsed = UserAgentParser.parse("GetNuTool/1.10.0.5939+e5f5c45")
+    finally:
+        UserAgentParser.set_plus_sign_decoding(False)
+
+    counters = instrumentation.to_dict()["counters"]
+    assert parsed.family == "GetNuTool"
+    assert counters[f"useragentparser.parse.resolved_by.{expected}"] == 1
+    assert counters.get("useragentparser.parse.resolved_by.china_cdn", 0) == (1 if expected == "china_cdn" else 0)
+
+def test_counts_url_shapes_and_ambiguous_results(instrumentation):
+    PackageDefinition.from_request_url("https://api.nuget.org/v3-flatcontainer/a/1.0.0/a.1.0.0.nupkg")
+    PackageDefinition.from_request_url("https://globalcdn.nuget.org/packages/a.1.0.0.nupkg?packageVersion=1.0.0")
+    PackageDefinition.from_request_url("https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg")
+    PackageDefinition.from_request_url("https://api.nuget.org/v3/index.json")
+    PackageDefinition.from_request_url("https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg")
+
+    counters = instrumentation.to_dict()["counters"]
+    assert counters["packagedefinition.from_request_url.resolved_by.flat_container"] == 1
+    assert counters["packagedefinition.from_request_url.resolved_by.query_string"] == 1
+    assert counters["packagedefinition.from_request_url.resolved_by.file_name"] == 1
+    assert counters["packagedefinition.from_request_url.resolved_by.not_a_package"] == 1
+    assert counters["packagedefinition.from_request_url.dot_positions_tried"] == 4
+    assert counters["packagedefinition.from_request_url.ambiguous"] == 1
+    assert counters["packagedefinition.from_request_url.resolved_by.cache"] == 1
+
+@pytest.mark.parametrize("elapsed_ns,upper_bound", [(0, 1), (1, 2), (1000, 1024), (1024, 2048)])
+def test_observe_uses_power_of_two_buckets(instrumentation, elapsed_ns, upper_bound):
+    instrumentation.observe("stage.time", elapsed_ns)
+
+    assert instrumentation.to_dict()["histograms"] == {"stage.time": {upper_bound: 1}}
+    assert instrumentation.to_flat_dict() == {f"stage.time.le_{upper_bound}ns": 1}
+
+def test_add_to_accumulator_adds_once(instrumentation):
+    class Accumulator:
+        def __init__(self):
+            self.param = CounterAccumulatorParam()
+            self.value = self.param.zero({})
+
+        def add(self, value):
+            self.value = self.param.addInPlace(self.value, value)
+
+    accumulator = Accumulator()
+    instrumentation.increment("stage.calls", 2)
+    instrumentation.add_to_accumulator(accumulator)
+    instrumentation.increment("stage.calls")
+    instrumentation.add_to_accumulator(accumulator)
+    instrumentation.add_to_accumulator(accumulator)
+
+    assert accumulator.value == {"stage.calls": 3}
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
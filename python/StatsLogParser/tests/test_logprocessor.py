@@ -0,0 +1,55 @@
+import csv
+from datetime import date
+import pytest
+
+from loginterpretation.instrumentation import Instrumentation
+from loginterpretation.logprocessor import LogProcessor
+from loginterpretation.useragentclassifier import UserAgentClassifier
+from loginterpretation.useragentparser import UserAgentParser
+from tests.cdnlogs import NUGET_USER_AGENT
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files(tmp_path, log_files, workers):
+    summary = LogProcessor.process_files(log_files, str(tmp_path / "output"), workers)
+
+    assert [result.path for result in summary.files] == log_files
+    assert [result.records for result in summary.files] == [2, 0, 2]
+    assert summary.records == 4
+    assert summary.errors == 1
+    assert dict(summary.downloads.items()) == {
+        ("newtonsoft.json", "13.0.3", "NuGet Command Line", "NuGet", date(2015, 6, 2)): 3,
+        ("tool/nuget.exe", "5.11.6", "curl", "Script", date(2015, 6, 2)): 1}
+
+def test_process_files_keeps_only_the_counts_of_each_file(tmp_path, log_files):
+    summary = LogProcessor.process_files(log_files, str(tmp_path / "output"), 2)
+
+    assert [result.downloads for result in summary.files] == [None, None, None]
+
+def test_initialize_worker_leaves_the_statistics_untouched():
+    parse_info = UserAgentParser.cache_info()
+    classify_info = UserAgentClassifier.cache_info()
+    Instrumentation.reset()
+    Instrumentation.enable()
+    try:
+        LogProcessor.initialize_worker(UserAgentParser.DECODE_PLUS_SIGNS)
+        assert Instrumentation.to_flat_dict() == {}
+    finally:
+        Instrumentation.disable()
+
+    assert UserAgentParser.cache_info() == parse_info
+    assert UserAgentClassifier.cache_info() == classify_info
+
+def test_process_files_writes_one_partition_per_file(tmp_path, log_files):
+    summary = LogProcessor.process_files(log_files, str(tmp_path / "output"), 2)
+
+    with open(summary.files[2].output_path, encoding="utf-8", newline="") as partition:
+        rows = list(csv.reader(partition, delimiter="\t"))
+
+    assert summary.files[2].output_path.endswith("part-00002.tsv")
+    assert rows[0] == list(LogProcessor.OUTPUT_COLUMNS)
+    assert [row[1] for row in rows[1:]] == ["newtonsoft.json", "tool/nuget.exe"]
+    assert rows[1][3] == NUGET_USER_AGENT
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,70 @@
+import threading
+import pytest
+
+from loginterpretation.lrucache import CacheInfo, LRUCache
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.info() == CacheInfo(hits=1, misses=0, evictions=1, maxsize=2, currsize=2)
+
+def test_counts_misses():
+    cache = LRUCache(2)
+    assert cache.get("missing") is None
+    assert cache.info().misses == 1
+
+def test_peek_neither_counts_nor_refreshes():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.peek("a") == 1
+    assert cache.peek("missing") is None
+    cache.put("c", 3)
+
+    assert "a" not in cache
+    assert cache.info() == CacheInfo(hits=0, misses=0, evictions=1, maxsize=2, currsize=2)
+
+def test_resize_evicts_down_to_new_size():
+    cache = LRUCache(3)
+    for key in "abc":
+        cache.put(key, key)
+
+    cache.resize(1)
+
+    assert len(cache) == 1 and "c" in cache
+    assert cache.info().evictions == 2
+
+@pytest.mark.parametrize("maxsize", [0, -1])
+def test_rejects_invalid_size(maxsize):
+    with pytest.raises(ValueError):
+        LRUCache(maxsize)
+
+def test_is_safe_to_share_between_threads():
+    cache = LRUCache(50)
+
+    def worker(offset):
+        for i in range(1000):
+            key = (offset + i) % 100
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    info = cache.info()
+    assert info.hits + info.misses == 8000
+    assert info.currsize == 50
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
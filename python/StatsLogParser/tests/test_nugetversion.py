@@ -0,0 +1,99 @@
+import dataclasses
+import pytest
+
+from loginterpretation.nugetversion import NuGetVersion
+from loginterpretation import semanticversion
+from loginterpretation.semanticversion import SemanticVersion, Version
+
+@pytest.mark.parametrize("value,expected", [
+    ("1.0.0", True),
+    ("1.0.0.1", True),
+    ("1.0.1-beta1.1", True),
+    ("2.4.0-beta.1.build3958", True),
+    ("1.0.0+metadata", True),
+    ("1.0.0.0", False),
+    ("01.0.0", False),
+    ("1.0", False),
+    ("1.0.0+", False),
+    ("1.0.0.0.0", False),
+    ("TransientFaultHandling.ServiceBus.6.0.1304", False)])
+def test_is_normalized_agrees_with_parse(value, expected):
+    parsed = NuGetVersion.try_parse(value)
+    assert NuGetVersion.is_normalized(value) == expected
+    assert (parsed is not None and parsed.to_normalized_string().lower() == value.lower()) == expected
+
+@pytest.mark.parametrize("value", ["1.0.0", "1.0.0.1", "1.0.1-beta1.1", "2.4.0-beta.1.build3958+sha.1234"])
+def test_parse_round_trips_normalized_string(value):
+    assert NuGetVersion.parse(value).to_normalized_string() == value
+
+def test_versions_are_immutable_and_hashable():
+    version = NuGetVersion.parse("1.2.3-beta.1")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        version.major = 2
+
+    assert version.version == Version(1, 2, 3, 0)
+    assert len({version, NuGetVersion.parse("1.2.3-beta.1")}) == 1
+
+def test_versions_share_interned_release_labels():
+    first = NuGetVersion.parse("1.0.0-preview.1")
+    second = NuGetVersion.parse("2.0.0-preview.1")
+
+    assert first.release_labels == ("preview", "1")
+    assert first.release_labels is second.release_labels
+
+def test_interned_release_labels_are_bounded():
+    for index in range(semanticversion._RELEASE_LABELS.maxsize + 10):
+        NuGetVersion.parse(f"1.0.0-preview.{index}")
+
+    assert semanticversion._RELEASE_LABELS.info().currsize == semanticversion._RELEASE_LABELS.maxsize
+
+@pytest.mark.parametrize("lower,higher", [
+    ("1.0.0-beta", "1.0.0"),
+    ("1.0.0-beta.2", "1.0.0-beta.10"),
+    ("1.0.0-beta.2", "1.0.0-beta.x"),
+    ("1.0.0-alpha", "1.0.0-alpha.1"),
+    ("1.0.0-Alpha", "1.0.0-beta"),
+    ("1.0.0", "1.0.0.1"),
+    ("1.9.0", "1.10.0")])
+def test_versions_sort_in_nuget_order(lower, higher):
+    assert NuGetVersion.parse(lower) < NuGetVersion.parse(higher)
+    assert not NuGetVersion.parse(higher) < NuGetVersion.parse(lower)
+
+def test_release_labels_compare_case_insensitively():
+    assert NuGetVersion.parse("1.0.0-BETA").sort_key() == NuGetVersion.parse("1.0.0-beta").sort_key()
+
+@pytest.mark.parametrize("first,second", [
+    ("1.0.0-BETA", "1.0.0-beta"),
+    ("1.0.0+a", "1.0.0+b")])
+def test_equality_is_consistent_with_ordering(first, second):
+    first, second = NuGetVersion.parse(first), NuGetVersion.parse(second)
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert not first < second and not second < first
+    assert first <= second and first >= second
+    assert len({first, second}) == 1
+
+def test_sort_versions():
+    values = ["1.10.0", "1.0.0", "not a version", "1.0.0-rc.10", "1.0.0-rc.2", "1.2.0"]
+
+    assert NuGetVersion.sort_versions(values) == ["not a version", "1.0.0-rc.2", "1.0.0-rc.10", "1.0.0", "1.2.0", "1.10.0"]
+
+def test_rank_versions():
+    assert NuGetVersion.rank_versions(["2.0.0", "1.0.0", "2.0.0+build", "1.0.0-beta"]) == [2, 1, 2, 0]
+
+@pytest.mark.parametrize("values,expected", [
+    (["1.0.0", "1.10.0", "1.9.0", "2.0.0-beta"], "2.0.0-beta"),
+    (["1.0.0", "1.0.0-rc.1"], "1.0.0"),
+    (["latest", None], None),
+    ([], None)])
+def test_latest_version(values, expected):
+    assert NuGetVersion.latest_version(values) == expected
+
+def test_semantic_version_parse():
+    assert SemanticVersion.parse("1.2.3-rc.1") == SemanticVersion(1, 2, 3, 0, ["rc", "1"])
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -1,3 +1,4 @@
+from dataclasses import FrozenInstanceError
 import pytest
 
 from loginterpretation.packagedefinition import PackageDefinition
@@ -38,6 +39,68 @@ def test_from_request_url(expected_package_id, expected_package_version, request
     found =  PackageDefinition.from_request_url(request_url)
     assert found and found[0] == PackageDefinition(expected_package_id, expected_package_version)
 
+def test_from_request_urls_matches_from_request_url():
+    request_urls = [
+        "http://localhost/packages/nuget.core.1.7.0.1540.nupkg",
+        "https://api.nuget.org/v3-flatcontainer/xunit.1/2.4.1/xunit.1.2.4.1.nupkg",
+        "http://localhost/packages/1.2.3.4.5.6.nupkg?packageVersion=4.5.6",
+        "http://localhost/packages/1.2.3.exe",
+        "http://localhost/packages/nuget.core.1.7.0.1540.nupkg",
+        None,
+        ""]
+
+    package_ids, package_versions = PackageDefinition.from_request_urls(request_urls)
+
+    assert len(package_ids) == len(package_versions) == len(request_urls)
+    for request_url, package_id, package_version in zip(request_urls, package_ids, package_versions):
+        found = PackageDefinition.from_request_url(request_url)
+        if found:
+            assert found[0] == PackageDefinition(package_id, package_version)
+        else:
+            assert package_id is None and package_version is None
+
+def test_from_request_urls_matches_from_request_url_with_an_encoded_parameter_name():
+    PackageDefinition.clear_caches()
+    request_urls = [
+        "http://localhost/packages/foo.1.2.3.4.5.nupkg?package%56ersion=3.4.5",
+        "http://localhost/packages/foo.1.2.3.4.5.nupkg"]
+
+    package_ids, package_versions = PackageDefinition.from_request_urls(request_urls)
+    PackageDefinition.clear_caches()
+
+    assert [PackageDefinition(package_id, package_version) for package_id, package_version in zip(package_ids, package_versions)] == \
+        [PackageDefinition.from_request_url(request_url)[0] for request_url in request_urls]
+    assert (package_ids[1], package_versions[1]) == ("foo.1", "2.3.4.5")
+
+def test_from_request_urls_reports_ambiguous_rows():
+    request_urls = [
+        "http://localhost/packages/1.2.3.4.5.6.nupkg",
+        "http://localhost/packages/1.2.3.4.5.6.nupkg?packageVersion=4.5.6",
+        "http://localhost/packages/dnx-mono.1.0.0-beta7.nupkg",
+        None]
+
+    package_ids, package_versions, ambiguous = PackageDefinition.from_request_urls(request_urls, return_ambiguous=True)
+
+    assert package_ids == ["1.2", "1.2.3", "dnx-mono", None]
+    assert ambiguous == [True, False, False, False]
+
+def test_from_request_urls_resolves_a_path_once_per_batch(monkeypatch):
+    PackageDefinition.clear_caches()
+    resolved = []
+    resolve = PackageDefinition._from_request_url
+    monkeypatch.setattr(PackageDefinition, "_from_request_url", staticmethod(
+        lambda request_url, package_id_index=None, parsed=None: resolved.append(request_url) or resolve(request_url, package_id_index, parsed)))
+
+    package_ids, package_versions = PackageDefinition.from_request_urls([
+        "https://globalcdn.nuget.org/packages/nuget.core.1.7.0.1540.nupkg",
+        "https://api.nuget.org/packages/nuget.core.1.7.0.1540.nupkg?cache=1",
+        "https://api.nuget.org/packages/nuget.core.1.7.0.1540.nupkg?packageVersion=1.7.0.1540"])
+    PackageDefinition.clear_caches()
+
+    assert package_ids == ["nuget.core"] * 3
+    assert package_versions == ["1.7.0.1540"] * 3
+    assert len(resolved) == 2
+
 @pytest.mark.parametrize("request_url", [
     "http://localhost/packages/1.nupkg",
     "http://localhost/packages/1.2.nupkg",
@@ -71,6 +134,42 @@ def test_from_nuget_exe_url_returns_none_when_invalid_url(request_url):
     found = PackageDefinition.from_nuget_exe_url(request_url)
     assert not found
 
+def test_from_request_url_caches_resolutions():
+    request_url = "https://api.nuget.org/v3-flatcontainer/cached.package/1.0.0/cached.package.1.0.0.nupkg"
+    before = PackageDefinition.cache_info()
+
+    first = PackageDefinition.from_request_url(request_url)
+    first.clear()
+    second = PackageDefinition.from_request_url(request_url)
+
+    after = PackageDefinition.cache_info()
+    assert second == [PackageDefinition("cached.package", "1.0.0")]
+    assert after.misses == before.misses + 1
+    assert after.hits == before.hits + 1
+
+def test_from_request_url_caches_unresolved_urls_apart_from_misses():
+    request_url = "https://api.nuget.org/packages/.nupkg/index.json"
+
+    assert PackageDefinition.from_request_url(request_url) is None
+    assert PackageDefinition.from_request_url(request_url) is None
+
+def test_from_nuget_exe_url_caches_resolutions():
+    request_url = "/win-x86-commandline/v6.6.6/nuget.exe"
+    before = PackageDefinition.nuget_exe_cache_info()
+
+    first = PackageDefinition.from_nuget_exe_url(request_url)
+    second = PackageDefinition.from_nuget_exe_url(request_url)
+
+    assert first is second
+    assert PackageDefinition.nuget_exe_cache_info().hits == before.hits + 1
+
+def test_package_definitions_are_immutable():
+    package = PackageDefinition("a", "1.0.0")
+
+    with pytest.raises(FrozenInstanceError):
+        package.package_id = "b"
+    assert hash(package) == hash(PackageDefinition(" a ", "1.0.0"))
+
 # To invoke the pytest framework and run all tests
 if __name__ == "__main__":
     pytest.main()
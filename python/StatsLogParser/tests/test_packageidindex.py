@@ -0,0 +1,67 @@
+import pytest
+
+from loginterpretation.packagedefinition import PackageDefinition
+from loginterpretation.packageidindex import PackageIdIndex
+
+PACKAGE_IDS = ["Newtonsoft.Json", "foo.2", "1.2.3", "Ünïcode.Package", " spaced ", ""]
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / "packageids.idx")
+    PackageIdIndex.write(path, PACKAGE_IDS)
+    return path
+
+@pytest.mark.parametrize("package_id,expected", [
+    ("newtonsoft.json", True),
+    ("NEWTONSOFT.JSON", True),
+    ("foo.2", True),
+    ("foo", False),
+    ("1.2.3", True),
+    ("ünïcode.package", True),
+    ("spaced", True),
+    ("", False),
+    (None, False),
+    ("zzz", False)])
+def test_contains(index_path, package_id, expected):
+    with PackageIdIndex.open(index_path) as index:
+        assert (package_id in index) == expected
+    assert (package_id in PackageIdIndex.from_ids(PACKAGE_IDS)) == expected
+
+def test_len_counts_distinct_ids():
+    assert len(PackageIdIndex.from_ids(PACKAGE_IDS + ["newtonsoft.json"])) == 5
+    assert len(PackageIdIndex.from_ids([])) == 0
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.idx"
+    path.write_bytes(b"not an index at all")
+
+    with pytest.raises(ValueError):
+        PackageIdIndex.open(str(path))
+
+@pytest.mark.parametrize("request_url,expected", [
+    ("https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg", [("foo.2", "1.0.1")]),
+    ("https://globalcdn.nuget.org/packages/1.2.3.4.5.6.nupkg", [("1.2.3", "4.5.6")]),
+    ("https://globalcdn.nuget.org/packages/bar.2.1.0.1.nupkg", [("bar", "2.1.0.1"), ("bar.2", "1.0.1")]),
+    ("https://globalcdn.nuget.org/packages/newtonsoft.json.13.0.3.nupkg", [("newtonsoft.json", "13.0.3")])])
+def test_from_request_url_picks_the_known_package_id(request_url, expected):
+    index = PackageIdIndex.from_ids(PACKAGE_IDS)
+
+    packages = PackageDefinition.from_request_url(request_url, index)
+
+    assert [(package.package_id, package.package_version) for package in packages] == expected
+
+def test_from_request_url_prefers_the_longest_known_package_id():
+    index = PackageIdIndex.from_ids(["foo", "foo.2"])
+
+    packages = PackageDefinition.from_request_url("https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg", index)
+
+    assert packages == [PackageDefinition("foo.2", "1.0.1")]
+
+def test_from_request_urls_passes_the_index_on():
+    index = PackageIdIndex.from_ids(PACKAGE_IDS)
+
+    assert PackageDefinition.from_request_urls(["https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg"], index) == (["foo.2"], ["1.0.1"])
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,48 @@
+import pytest
+
+from loginterpretation.requestclassifier import RequestClassifier, RequestKind
+
+@pytest.mark.parametrize("request_url,expected", [
+    ("https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3/newtonsoft.json.13.0.3.nupkg", RequestKind.PACKAGE),
+    ("https://globalcdn.nuget.org/packages/Newtonsoft.Json.13.0.3.NUPKG?packageVersion=13.0.3", RequestKind.PACKAGE),
+    ("https://globalcdn.nuget.org/packages/foo.nu%70kg", RequestKind.OTHER),
+    ("https://globalcdn.nuget.org/packages/foo.nu\tpkg", RequestKind.PACKAGE),
+    ("/win-x86-commandline/v5.11.6/nuget.exe", RequestKind.NUGET_EXE),
+    ("/win-x86-commandline/latest/NuGet.exe", RequestKind.NUGET_EXE),
+    ("https://api.nuget.org/v3/index.json", RequestKind.OTHER),
+    ("https://api.nuget.org/v3-flatcontainer/foo/index.json?x=.nupkg", RequestKind.OTHER),
+    ("", RequestKind.OTHER),
+    (None, RequestKind.OTHER)])
+def test_classify(request_url, expected):
+    assert RequestClassifier.classify(request_url) == expected
+
+@pytest.mark.parametrize("request_url,expected_id,expected_version", [
+    ("https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3/newtonsoft.json.13.0.3.nupkg", "newtonsoft.json", "13.0.3"),
+    ("https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg", "foo", "2.1.0.1"),
+    ("/win-x86-commandline/v5.11.6/nuget.exe", "tool/nuget.exe", "5.11.6"),
+    ("https://globalcdn.nuget.org/packages/foo.nupkg?path=/nuget.exe", None, None),
+    ("https://api.nuget.org/v3/index.json", None, None)])
+def test_resolve(request_url, expected_id, expected_version):
+    package = RequestClassifier.resolve(request_url)
+
+    if expected_id is None:
+        assert package is None
+    else:
+        assert (package.package_id, package.package_version) == (expected_id, expected_version)
+
+def test_batch_forms_match_scalar_forms():
+    request_urls = [
+        "https://api.nuget.org/v3-flatcontainer/a/1.0.0/a.1.0.0.nupkg",
+        "/win-x86-commandline/v5.11.6/nuget.exe",
+        "https://api.nuget.org/v3/index.json",
+        None,
+        "https://api.nuget.org/v3-flatcontainer/a/1.0.0/a.1.0.0.nupkg"]
+
+    assert RequestClassifier.classify_many(request_urls) == [RequestClassifier.classify(url) for url in request_urls]
+    assert RequestClassifier.resolve_many(request_urls) == (
+        ["a", "tool/nuget.exe", None, None, "a"],
+        ["1.0.0", "5.11.6", None, None, "1.0.0"])
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,52 @@
+from ua_parser import user_agent_parser
+import pytest
+
+from loginterpretation.rulematcher import RuleMatcher
+
+def parser(regex, family_replacement=None):
+    return user_agent_parser.UserAgentParser(regex, family_replacement)
+
+@pytest.mark.parametrize("regex,expected_literals", [
+    (r'(NuGet Command Line)/(\d+)\.(\d+)\.?(\d+)?', {"NuGet Command Line/"}),
+    (r'Mozilla.*(PowerShell)/(\d+)\.(\d+)\.?(\d+)?', {"PowerShell/"}),
+    (r'(Paket)/?(\d+)?\.?(\d+)?\.?(\d+)?', {"Paket"}),
+    (r'(Maxthon|MyIE2|Uzbl)', {"Maxthon", "MyIE2", "Uzbl"}),
+    (r'\b(Boto3?|JetS3t)/(\d+)', {"Boto/", "Boto3/", "JetS3t/"}),
+    (r'[Bb]ot(\d+)', {"Bot", "bot"}),
+    (r'(?i)(nuget)/(\d+)', None),
+    (r'(\w+)/(\d+)', None)])
+def test_required_literals(regex, expected_literals):
+    literals = RuleMatcher.required_literals(parser(regex))
+    assert literals == (frozenset(expected_literals) if expected_literals else None)
+
+def test_first_matching_rule_wins():
+    matcher = RuleMatcher([
+        parser(r'(NuGet Command Line)/(\d+)\.(\d+)', 'NuGet Command Line'),
+        parser(r'(\w+)/(\d+)\.(\d+)'),
+        parser(r'(NuGet)/?(\d+)\.(\d+)', 'NuGet')])
+
+    assert matcher.match("NuGet Command Line/1.2 (Windows)")[:3] == (0, 'NuGet Command Line', '1')
+    assert matcher.match("NuGet/3.4")[:3] == (1, 'NuGet', '3')
+    assert matcher.match("no version here") is None
+
+def test_candidates_skip_rules_whose_literals_are_missing():
+    matcher = RuleMatcher([
+        parser(r'(Artifactory)/(\d+)'),
+        parser(r'(Paket)/?(\d+)?'),
+        parser(r'(\w+)/(\d+)')])
+
+    assert matcher.candidates("Paket/1.0") == [1, 2]
+    assert matcher.candidates("Mozilla/5.0") == [2]
+
+def test_finds_overlapping_literals():
+    matcher = RuleMatcher([
+        parser(r'(NuGet Core)'),
+        parser(r'(Core Tools)')])
+
+    assert matcher.candidates("NuGet Core Tools") == [0, 1]
+    assert matcher.candidates("Core Tools") == [1]
+    assert matcher.match("NuGet Core Tools").family == 'NuGet Core'
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,125 @@
+from collections import Counter
+import pytest
+import yaml
+from ua_parser import user_agent_parser
+
+from loginterpretation.ruleprofiler import RuleProfiler
+from loginterpretation.useragentparser import UserAgentParser
+
+def parsers(*patterns):
+    return [user_agent_parser.UserAgentParser(pattern) for pattern in patterns]
+
+@pytest.mark.parametrize("hits,constraints,expected", [
+    ([1, 5, 3], set(), [1, 2, 0]),
+    ([1, 5, 3], {(0, 1)}, [0, 1, 2]),
+    ([5, 1, 3], {(0, 1)}, [0, 2, 1]),
+    ([1, 5, 3], {(0, 1), (0, 2)}, [0, 1, 2]),
+    ([2, 2, 2], set(), [0, 1, 2])])
+def test_order_by_hits(hits, constraints, expected):
+    assert RuleProfiler.order_by_hits(hits, constraints) == expected
+
+def test_constraints_keep_every_pair_not_exclusive():
+    profiler = RuleProfiler(parsers(
+        r"(Paket)/(\d+)",
+        r"(curl)/(\d+)",
+        r"^(Wget)/(\d+)",
+        r"^(curl)/(\d+)",
+        r"^(curl)(?:/| )(\d+)",
+        r"(url/)(\d+)",
+        r"(\w+)/(\d+)"))
+
+    # rules with overlapping literals, and every rule with a rule without literals, keep their order
+    assert profiler.constraints() == {(1, 3), (1, 4), (1, 5), (3, 4), (3, 5), (4, 5), (0, 6), (1, 6), (2, 6), (3, 6), (4, 6), (5, 6)}
+
+def test_constraints_keep_rules_matching_the_same_sample_user_agent():
+    profiler = RuleProfiler(parsers(r"(Paket)/(\d+)", r"(curl)/(\d+)", r"(Wget)/(\d+)"))
+
+    assert profiler.constraints() == set()
+    assert profiler.constraints(["Paket/1 curl/2", "Wget/1"]) == {(0, 1)}
+
+@pytest.mark.parametrize("first,second,expected", [
+    ("curl/", "Paket/", False),
+    ("NuGet VS", "NuGet", True),
+    ("Cake", "keX", True),
+    ("keX", "Cake", False),
+    ("abc", "bc", True)])
+def test_overlap(first, second, expected):
+    assert RuleProfiler._overlap(first, second) == expected
+
+@pytest.mark.parametrize("pattern,expected", [
+    (r"^(Wget)/(\d+)", "Wget/"),
+    (r"\A(?:NuGet (?:VS|xplat))", "NuGet "),
+    (r"(?i)^curl/", "curl/"),
+    (r"(curl)/(\d+)", None),
+    (r"^[Cc]url", "")])
+def test_anchored_prefix(pattern, expected):
+    assert RuleProfiler.anchored_prefix(user_agent_parser.UserAgentParser(pattern)) == expected
+
+def test_reorder_only_swaps_exclusive_rules():
+    profiler = RuleProfiler(parsers(
+        r"^(NuGet Command Line)/(\d+)",
+        r"^(Paket)/(\d+)",
+        r"^(curl)/(\d+)",
+        r"(NuGet)/?(\d+)"))
+    sample = Counter({"curl/7": 10, "NuGet/3": 5, "Paket/1": 2, "NuGet Command Line/6": 1, "unknown": 3})
+
+    result = profiler.reorder(sample)
+
+    # the NuGet rule passes the Paket one but stays behind NuGet Command Line, whose literal contains its own
+    assert result.order == [2, 0, 3, 1]
+    assert result.verified
+    assert [profile.hits for profile in result.profiles] == [1, 2, 10, 5]
+
+def test_reorder_keeps_rules_that_may_both_match_in_order():
+    profiler = RuleProfiler(parsers(r"(Paket)/(\d+)", r"(curl)/(\d+)"))
+
+    result = profiler.reorder(Counter({"curl/7": 10, "Paket/1 curl/2": 1}))
+
+    assert result.order == [0, 1]
+    assert result.verified
+
+def test_known_clients_reorder_is_verified_on_sample():
+    UserAgentParser._ensure_initialized()
+    sample = Counter({
+        "NuGet Command Line/6.8.0 (Microsoft Windows NT 10.0.22621.0)": 5,
+        "NuGet VS VSIX/4.8.1 (Microsoft Windows NT 10.0.17134.0, VS Enterprise/15.0)": 20,
+        "NuGet/3.5.0": 3,
+        "Paket/1.2.3": 1})
+
+    profiler = RuleProfiler(UserAgentParser.KNOWN_CLIENTS_DATA)
+    result = profiler.reorder(sample)
+
+    assert result.verified
+    assert sorted(result.order) == list(range(len(UserAgentParser.KNOWN_CLIENTS_DATA)))
+    assert result.attempts_after <= result.attempts_before
+    # the most frequent client moves ahead of the rules it can't conflict with
+    vsix = next(index for index, parser in enumerate(profiler.parsers) if parser.pattern.startswith("(NuGet[ +]VS[ +]VSIX)"))
+    assert result.order[0] == vsix
+
+def test_known_clients_have_exclusive_pairs():
+    UserAgentParser._ensure_initialized()
+    profiler = RuleProfiler(UserAgentParser.KNOWN_CLIENTS_DATA)
+    patterns = [parser.pattern for parser in profiler.parsers]
+    paket, curl, nuget = (patterns.index(pattern) for pattern in (
+        r"(Paket)/?(\d+)?\.?(\d+)?\.?(\d+)?", r"(curl)/?(\d+)?\.?(\d+)?\.?(\d+)?", r"(NuGet)/?(\d+)\.(\d+)\.?(\d+)?"))
+    command_line = next(index for index, pattern in enumerate(patterns) if pattern.startswith("(NuGet[ +]Command[ +]Line)"))
+
+    constraints = profiler.constraints()
+
+    assert len(constraints) < len(patterns) * (len(patterns) - 1) // 2
+    assert (paket, curl) not in constraints
+    assert (command_line, nuget) in constraints
+
+def test_reorder_yaml_keeps_every_rule_with_its_comment():
+    yaml_content = UserAgentParser._read_known_clients_yaml()
+    rules = yaml.safe_load(yaml_content)["user_agent_parsers"]
+    order = list(reversed(range(len(rules))))
+
+    reordered = RuleProfiler.reorder_yaml(yaml_content, order)
+
+    assert yaml.safe_load(reordered)["user_agent_parsers"] == [rules[index] for index in order]
+    assert "  # GetNuTool\n  - regex: '(GetNuTool)" in reordered
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,90 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from loginterpretation.packageidindex import PackageIdIndex
+from loginterpretation.requestclassifier import RequestClassifier
+from loginterpretation.spark import CLIENT_COLUMNS, SparkUdfs
+from loginterpretation.useragentclassifier import UserAgentClassifier
+
+REQUEST_URLS = [
+    "https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3/newtonsoft.json.13.0.3.nupkg",
+    "https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg",
+    None,
+    "/win-x86-commandline/v5.11.6/nuget.exe",
+    "https://api.nuget.org/v3/index.json",
+    "https://api.nuget.org/v3-flatcontainer/newtonsoft.json/13.0.3/newtonsoft.json.13.0.3.nupkg"]
+
+USER_AGENTS = [
+    "NuGet Command Line/6.7.0 (Microsoft Windows NT 10.0.22621.0)",
+    None,
+    "NuGet VS VSIX/6.7.0 (Microsoft Windows NT 10.0.22621.0, VS Enterprise/17.0)",
+    "",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "NuGet Command Line/6.7.0 (Microsoft Windows NT 10.0.22621.0)"]
+
+def test_resolve_packages_matches_resolve_many():
+    request_urls = pd.Series(REQUEST_URLS, index=range(10, 16))
+    resolved = SparkUdfs.resolve_packages(request_urls)
+
+    package_ids, package_versions = RequestClassifier.resolve_many(REQUEST_URLS)
+    assert list(resolved.columns) == ["package_id", "package_version"]
+    assert list(resolved.index) == list(request_urls.index)
+    assert resolved["package_id"].tolist() == package_ids
+    assert resolved["package_version"].tolist() == package_versions
+
+def test_resolve_packages_with_index():
+    request_urls = pd.Series(["https://globalcdn.nuget.org/packages/foo.2.1.0.1.nupkg"])
+    resolved = SparkUdfs.resolve_packages(request_urls, PackageIdIndex.from_ids(["foo.2"]))
+
+    assert resolved.iloc[0].tolist() == ["foo.2", "1.0.1"]
+
+def test_classify_clients_matches_classify_many():
+    user_agents = pd.Series(USER_AGENTS)
+    classified = SparkUdfs.classify_clients(user_agents)
+
+    assert list(classified.columns) == CLIENT_COLUMNS
+    assert [tuple(row) for row in classified.itertuples(index=False)] == [tuple(client) for client in UserAgentClassifier.classify_many(USER_AGENTS)]
+
+def test_resolve_downloads():
+    resolved = SparkUdfs.resolve_downloads(pd.Series(REQUEST_URLS), pd.Series(USER_AGENTS))
+
+    assert list(resolved.columns) == ["package_id", "package_version"] + CLIENT_COLUMNS
+    assert len(resolved) == len(REQUEST_URLS)
+
+def test_empty_batch():
+    assert len(SparkUdfs.resolve_packages(pd.Series([], dtype=object))) == 0
+    assert len(SparkUdfs.classify_clients(pd.Series([], dtype=object))) == 0
+
+def test_udf_functions_run_with_pandas_only(tmp_path):
+    index_path = str(tmp_path / "packageids.idx")
+    PackageIdIndex.write(index_path, ["foo.2"])
+    request_urls = pd.Series(REQUEST_URLS)
+    user_agents = pd.Series(USER_AGENTS)
+
+    packages = SparkUdfs.package_function(index_path)(request_urls)
+    clients = SparkUdfs.client_function()(user_agents)
+    downloads = SparkUdfs.download_function(index_path)(request_urls, user_agents)
+
+    assert packages.iloc[1].tolist() == ["foo.2", "1.0.1"]
+    assert clients.equals(SparkUdfs.classify_clients(user_agents))
+    assert downloads.equals(pd.concat([packages, clients], axis=1))
+
+def test_udfs_return_struct_columns():
+    pytest.importorskip("pyarrow")
+    pyspark_sql = pytest.importorskip("pyspark.sql")
+
+    spark = pyspark_sql.SparkSession.builder.master("local[1]").getOrCreate()
+    try:
+        logs = spark.createDataFrame(list(zip(REQUEST_URLS, USER_AGENTS)), "request_url string, user_agent string")
+        rows = logs.select(SparkUdfs.download_udf()("request_url", "user_agent").alias("download")).collect()
+    finally:
+        spark.stop()
+
+    assert rows[0].download.package_id == "newtonsoft.json"
+    assert rows[0].download.client_category == UserAgentClassifier.classify(USER_AGENTS[0]).category
+    assert rows[4].download.package_id is None
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
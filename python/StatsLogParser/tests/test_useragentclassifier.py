@@ -0,0 +1,49 @@
+import pytest
+
+from loginterpretation.useragentclassifier import ClientInfo, UserAgentClassifier
+from loginterpretation.useragentparser import UserAgentParser
+
+@pytest.mark.parametrize("user_agent,expected", [
+    ("NuGet Command Line/1.2.3 (Microsoft Windows NT 6.2.9200.0)", ClientInfo("NuGet Command Line", "1", "2", "3", "NuGet")),
+    ("NuGet+VS+VSIX/4.8.1+(Microsoft+Windows+NT+10.0.17134.0,+VS+Enterprise/15.0)", ClientInfo("NuGet VS VSIX", "4", "8", "1", "NuGet")),
+    ("curl/7.21.0 (x86_64-pc-linux-gnu) libcurl/7.21.0", ClientInfo("curl", "7", "21", "0", "Script")),
+    ("Paket/1.2.3 (Microsoft Windows NT 6.2.9200.0)", ClientInfo("Paket", "1", "2", "3", "")),
+    ("", ClientInfo("Other", None, None, None, ""))])
+def test_classify(user_agent, expected):
+    assert UserAgentClassifier.classify(user_agent) == expected
+
+def test_classify_caches_per_user_agent():
+    user_agent = "NuGet Command Line/7.7.7 (classifier cache test)"
+    before = UserAgentClassifier.cache_info()
+
+    first = UserAgentClassifier.classify(user_agent)
+    second = UserAgentClassifier.classify(user_agent)
+
+    after = UserAgentClassifier.cache_info()
+    assert first is second
+    assert after.hits == before.hits + 1
+
+def test_classify_follows_plus_sign_decoding():
+    user_agent = "Mozilla/5.0+(compatible;+MSIE+10.0;+Windows+NT+6.1)"
+
+    before = UserAgentClassifier.classify(user_agent)
+    UserAgentParser.set_plus_sign_decoding(True)
+    try:
+        decoded = UserAgentClassifier.classify(user_agent)
+    finally:
+        UserAgentParser.set_plus_sign_decoding(False)
+    after = UserAgentClassifier.classify(user_agent)
+
+    assert before == after == ClientInfo("Other", None, None, None, "")
+    assert decoded == ClientInfo("IE", "10", "0", None, "Browser")
+
+def test_classify_many_matches_classify():
+    user_agents = ["Paket", "curl/7.0", "Paket", None, "NuGet/3.0.0"]
+
+    classified = UserAgentClassifier.classify_many(user_agents)
+
+    assert classified == [UserAgentClassifier.classify(user_agent or "") for user_agent in user_agents]
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,120 @@
+from datetime import date, datetime, timezone
+import csv
+import pytest
+
+from loginterpretation.cdnlogparser import DownloadRecord
+from loginterpretation.downloadaggregator import DownloadKey
+from loginterpretation.useragentclassifier import ClientInfo, UserAgentClassifier
+from loginterpretation.useragentdictionary import UserAgentDictionary, UserAgentDownloadKey, main
+from loginterpretation.useragentparser import UserAgentParser
+from tests.cdnlogs import EXE_URL, INDEX_URL, NUGET_USER_AGENT, log_line, write_log
+
+NEW_CLIENT_USER_AGENT = "MyNewCI/1.2"
+NEW_CLIENT_RULE = """
+  - regex: '(MyNewCI)/(\\d+)\\.(\\d+)'
+    family_replacement: 'MyNewCI'
+"""
+
+@pytest.fixture
+def dictionary(tmp_path):
+    with UserAgentDictionary(str(tmp_path / "useragents.db")) as dictionary:
+        yield dictionary
+
+@pytest.fixture
+def new_rules():
+    return UserAgentParser._read_known_clients_yaml().replace("user_agent_parsers:\n", "user_agent_parsers:\n" + NEW_CLIENT_RULE, 1)
+
+def test_add_returns_stable_ids(dictionary):
+    ids = dictionary.add([NUGET_USER_AGENT, NEW_CLIENT_USER_AGENT, NUGET_USER_AGENT, None])
+
+    assert ids[0] == ids[2]
+    assert len(set(ids)) == 3
+    assert len(dictionary) == 3
+    assert dictionary.add([NEW_CLIENT_USER_AGENT, "", "curl/7.21.0"])[:2] == [ids[1], ids[3]]
+    assert dictionary.lookup(NUGET_USER_AGENT) == ids[0]
+    assert dictionary.lookup("unknown") is None
+    assert dictionary.get(ids[0]) == UserAgentClassifier.classify(NUGET_USER_AGENT)
+    assert dictionary.rules_version == UserAgentParser.rules_version()
+
+def test_reclassify_with_the_same_rules_changes_nothing(dictionary):
+    dictionary.add([NUGET_USER_AGENT, NEW_CLIENT_USER_AGENT])
+
+    assert dictionary.reclassify() == []
+
+def test_reclassify_with_new_rules(dictionary, new_rules):
+    ids = dictionary.add([NUGET_USER_AGENT, NEW_CLIENT_USER_AGENT])
+
+    remaps = dictionary.reclassify(UserAgentDictionary.known_clients_classifier(new_rules), "new")
+
+    assert [(remap.ua_id, remap.user_agent) for remap in remaps] == [(ids[1], NEW_CLIENT_USER_AGENT)]
+    assert remaps[0].old.family == "Other"
+    assert remaps[0].new == ClientInfo("MyNewCI", "1", "2", None, "")
+    # nothing is stored without apply
+    assert dictionary.get(ids[1]).family == "Other"
+    assert dictionary.rules_version == UserAgentParser.rules_version()
+
+def test_reclassify_apply(dictionary, new_rules):
+    ids = dictionary.add([NUGET_USER_AGENT, NEW_CLIENT_USER_AGENT])
+
+    dictionary.reclassify(UserAgentDictionary.known_clients_classifier(new_rules), "new", apply=True)
+
+    assert dictionary.get(ids[1]).family == "MyNewCI"
+    assert dictionary.rules_version == "new"
+    with pytest.raises(ValueError):
+        dictionary.add(["curl/7.21.0"])
+
+    # going back to the rules in use remaps the entry back
+    remaps = dictionary.reclassify(apply=True)
+    assert [(remap.old.family, remap.new.family) for remap in remaps] == [("MyNewCI", "Other")]
+    assert dictionary.add(["curl/7.21.0"])
+
+def download(user_agent, package_id="Newtonsoft.Json"):
+    return DownloadRecord(datetime(2024, 5, 2, 13, 30, tzinfo=timezone.utc), package_id, "13.0.3", user_agent, None, None, None, None, None, "")
+
+def test_downloads_keyed_by_user_agent_id_follow_a_reclassification(dictionary, new_rules):
+    counts = dictionary.count_downloads([download(NUGET_USER_AGENT), download(NEW_CLIENT_USER_AGENT), download(NEW_CLIENT_USER_AGENT, "other")])
+    ids = dictionary.add([NUGET_USER_AGENT, NEW_CLIENT_USER_AGENT])
+    downloads = dictionary.to_downloads(counts)
+
+    assert counts[UserAgentDownloadKey("newtonsoft.json", "13.0.3", ids[1], date(2024, 5, 2))] == 1
+    assert downloads.get(DownloadKey("newtonsoft.json", "13.0.3", "Other", "", date(2024, 5, 2))) == 1
+
+    remaps = dictionary.reclassify(UserAgentDictionary.known_clients_classifier(new_rules), "new", apply=True)
+    remapped = UserAgentDictionary.remap_downloads(downloads, counts, remaps)
+
+    assert dict(remapped.items()) == dict(dictionary.to_downloads(counts).items()) == {
+        DownloadKey("newtonsoft.json", "13.0.3", "NuGet Command Line", "NuGet", date(2024, 5, 2)): 1,
+        DownloadKey("newtonsoft.json", "13.0.3", "MyNewCI", "", date(2024, 5, 2)): 1,
+        DownloadKey("other", "13.0.3", "MyNewCI", "", date(2024, 5, 2)): 1}
+
+def test_main_adds_the_user_agents_of_downloads(tmp_path):
+    log_path = write_log(tmp_path / "cdn.log", [
+        log_line(1433257489),
+        log_line(1433257490, EXE_URL, NEW_CLIENT_USER_AGENT),
+        log_line(1433257491, INDEX_URL, "curl/7.21.0")])
+    dictionary_path = str(tmp_path / "useragents.db")
+
+    assert main([dictionary_path, "--add-cdn-log", log_path]) == 0
+
+    with UserAgentDictionary(dictionary_path) as dictionary:
+        assert len(dictionary) == 2
+        assert dictionary.lookup(NUGET_USER_AGENT) is not None
+        assert dictionary.lookup(NEW_CLIENT_USER_AGENT) is not None
+
+def test_main_writes_remap(tmp_path, dictionary, new_rules):
+    dictionary.add([NUGET_USER_AGENT, NEW_CLIENT_USER_AGENT])
+    known_clients_path = tmp_path / "knownclients.yaml"
+    known_clients_path.write_text(new_rules, encoding="utf-8")
+    remap_path = tmp_path / "remap.tsv"
+
+    assert main([str(tmp_path / "useragents.db"), "--known-clients", str(known_clients_path), "--remap", str(remap_path)]) == 0
+
+    with open(remap_path, encoding="utf-8", newline="") as remap:
+        rows = list(csv.reader(remap, delimiter="\t"))
+    assert rows[0] == list(UserAgentDictionary.REMAP_COLUMNS)
+    assert [row[1] for row in rows[1:]] == [NEW_CLIENT_USER_AGENT]
+    assert rows[1][7] == "MyNewCI"
+
+# To invoke the pytest framework and run all tests
+if __name__ == "__main__":
+    pytest.main()
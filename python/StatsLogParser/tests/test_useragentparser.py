@@ -1,6 +1,12 @@
+import os
+import subprocess
 import sys
 sys.path.append('..') # This is to add the parent directory to the path so that the module can be imported
-from loginterpretation.useragentparser import UserAgentParser, UserAgent
+from loginterpretation import precompiledrules
+from loginterpretation import rulecompiler
+from loginterpretation.rulecompiler import RuleCompiler
+from loginterpretation.rulematcher import RuleMatcher
+from loginterpretation.useragentparser import ParsedUserAgents, UserAgentParser, UserAgent
 import pytest
 
 
@@ -72,6 +78,144 @@ def test_recognizes_custom_clients(user_agent, expected_client, expected_major,
     parsed = UserAgentParser.parse(user_agent)
     assert parsed == UserAgent(expected_client, expected_major, expected_minor, expected_patch)
 
+@pytest.mark.parametrize("user_agent,expected_client,expected_major,expected_minor,expected_patch", [
+    ("NuGet+VS+VSIX/4.8.1+(Microsoft+Windows+NT+10.0.17134.0,+VS+Enterprise/15.0)", "NuGet VS VSIX", "4", "8", "1"),
+    ("NuGet+Command+Line/4.3.0+(Microsoft+Windows+NT+6.2.9200.0)", "NuGet Command Line", "4", "3", "0"),
+    ("NuGet Command Line/1.2.3 (Microsoft Windows NT 6.2.9200.0)", "NuGet Command Line", "1", "2", "3")])
+def test_recognizes_china_cdn_clients_when_decoding_plus_signs(user_agent, expected_client, expected_major, expected_minor, expected_patch):
+    UserAgentParser.set_plus_sign_decoding(True)
+    try:
+        parsed = UserAgentParser.parse(user_agent)
+    finally:
+        UserAgentParser.set_plus_sign_decoding(False)
+
+    assert parsed == UserAgent(expected_client, expected_major, expected_minor, expected_patch)
+
+def test_known_clients_are_loaded_once_for_both_cdn_forms():
+    UserAgentParser._ensure_initialized()
+    assert len(UserAgentParser.KNOWN_CLIENTS_DATA) == UserAgentParser._read_known_clients_yaml().count("- regex:")
+
+def test_parse_cache_reports_hits_and_misses():
+    user_agent = "NuGet Command Line/9.8.7 (cache test)"
+    before = UserAgentParser.cache_info()
+
+    first = UserAgentParser.parse(user_agent)
+    second = UserAgentParser.parse(user_agent)
+
+    after = UserAgentParser.cache_info()
+    assert first == second
+    assert after.misses == before.misses + 1
+    assert after.hits == before.hits + 1
+
+def test_precompiled_rules_are_in_sync_with_known_clients_yaml():
+    # regenerate with: python -m loginterpretation.rulecompiler
+    with open(os.path.join(os.path.dirname(precompiledrules.__file__), RuleCompiler.MODULE_NAME), encoding="utf-8") as module:
+        assert module.read() == RuleCompiler.render_module()
+
+def test_rule_compiler_writes_the_module_to_the_output(tmp_path):
+    output = tmp_path / "rules.py"
+
+    assert rulecompiler.main(["--output", str(output)]) == 0
+    assert output.read_text(encoding="utf-8") == RuleCompiler.render_module()
+
+@pytest.mark.parametrize("argv", [["--help"], ["--output", "rules.txt"], ["--output", "missing/rules.py"]])
+def test_rule_compiler_writes_nothing_on_help_or_a_bad_output(tmp_path, monkeypatch, argv):
+    monkeypatch.chdir(tmp_path)
+    written = []
+    monkeypatch.setattr(RuleCompiler, "write_module", lambda path=None: written.append(path))
+
+    with pytest.raises(SystemExit):
+        rulecompiler.main(argv)
+    assert written == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_precompiled_rules_match_the_yaml():
+    rules = UserAgentParser._load_known_clients_rules()
+
+    assert precompiledrules.KNOWN_CLIENTS_RULES == rules
+    assert precompiledrules.KNOWN_CLIENTS_LITERALS == [
+        RuleMatcher.required_literals(parser) for parser in UserAgentParser._create_parser_data(rules)]
+
+def test_falls_back_to_yaml_when_precompiled_rules_are_stale(monkeypatch):
+    monkeypatch.setattr(precompiledrules, "KNOWN_CLIENTS_YAML_SHA256", "stale")
+    monkeypatch.setattr(precompiledrules, "KNOWN_CLIENTS_RULES", [])
+    UserAgentParser._ensure_initialized()
+    # restore the matchers built from the precompiled rules after the test
+    for name in ("KNOWN_CLIENTS_DATA", "KNOWN_CLIENTS_MATCHER", "DEFAULT_MATCHER"):
+        monkeypatch.setattr(UserAgentParser, name, getattr(UserAgentParser, name))
+    monkeypatch.setattr(UserAgentParser, "_INITIALIZED", False)
+
+    UserAgentParser._ensure_initialized()
+
+    assert len(UserAgentParser.KNOWN_CLIENTS_DATA) == len(UserAgentParser._load_known_clients_rules())
+    assert UserAgentParser.parse("NuGet Command Line/5.4.3 (fallback test)").family == "NuGet Command Line"
+
+def test_import_defers_loading_the_rules():
+    code = ("import sys; from loginterpretation.useragentparser import UserAgentParser; "
+            "assert not UserAgentParser._INITIALIZED and UserAgentParser.KNOWN_CLIENTS_MATCHER is None; "
+            "assert UserAgentParser.parse('NuGet/3.0.0').family == 'NuGet'; "
+            "assert 'yaml' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+
+BATCH = [
+    "NuGet Command Line/6.8.0 (batch test)",
+    None,
+    "curl/7.21.0",
+    "NuGet Command Line/6.8.0 (batch test)",
+    "",
+    "NuGet Command Line/6.8.0 (batch test)",
+    "curl/7.21.0"]
+
+def test_factorize():
+    codes, uniques, counts = ParsedUserAgents.factorize(BATCH)
+
+    assert list(codes) == [0, 1, 2, 0, 1, 0, 2]
+    assert uniques == ["NuGet Command Line/6.8.0 (batch test)", "", "curl/7.21.0"]
+    assert list(counts) == [3, 2, 2]
+
+def test_parse_batch_matches_parse():
+    parsed = UserAgentParser.parse_batch(BATCH)
+
+    assert len(parsed) == len(BATCH)
+    assert list(parsed) == [UserAgentParser.parse(user_agent or "") for user_agent in BATCH]
+    assert parsed[2].family == "curl"
+    assert parsed.column("major") == [entry.major for entry in parsed]
+
+def test_parse_batch_parses_the_most_frequent_first(monkeypatch):
+    UserAgentParser._PARSE_CACHE.clear()
+    order = []
+    parse = UserAgentParser._parse_uncached
+    monkeypatch.setattr(UserAgentParser, "_parse_uncached", staticmethod(lambda user_agent: order.append(user_agent) or parse(user_agent)))
+
+    UserAgentParser.parse_batch(["a/1.0", "b/1.0", "b/1.0", "c/1.0", "c/1.0", "c/1.0", "b/1.0"])
+
+    assert order == ["b/1.0", "c/1.0", "a/1.0"]
+
+def test_parse_batch_keeps_the_head_in_the_cache():
+    UserAgentParser._PARSE_CACHE.clear()
+    UserAgentParser.set_cache_size(2)
+    try:
+        parsed = UserAgentParser.parse_batch(["tail/1.0", "head/1.0", "head/1.0", "next/1.0", "next/1.0", "other/1.0"])
+
+        # only the head goes through the cache, and counts in its statistics
+        assert UserAgentParser.cache_info().misses == 2
+        assert UserAgentParser.cache_info().hits == 0
+        assert parsed[0] == UserAgentParser._parse_uncached("tail/1.0")
+        assert UserAgentParser._lookup("head/1.0") == parsed[1]
+        assert UserAgentParser._lookup("next/1.0") == parsed[3]
+        assert UserAgentParser._lookup("tail/1.0") is None
+    finally:
+        UserAgentParser.set_cache_size(UserAgentParser._MAX_CACHE_SIZE)
+        UserAgentParser._PARSE_CACHE.clear()
+
+def test_parse_batch_to_numpy():
+    pytest.importorskip("numpy")
+    rows = UserAgentParser.parse_batch(BATCH).to_numpy()
+
+    assert rows.dtype.names == UserAgent._fields
+    assert list(rows["family"]) == [UserAgentParser.parse(user_agent or "").family for user_agent in BATCH]
+    assert len(UserAgentParser.parse_batch([]).to_numpy()) == 0
+
 # To invoke the pytest framework and run all tests
 if __name__ == "__main__":
     pytest.main()